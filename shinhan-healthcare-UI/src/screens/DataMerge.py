@@ -1,5 +1,13 @@
 import pandas as pd
 import json
+import sys
+from pathlib import Path
+
+# 가맹점 단위 조회 저장소 (shinhan_202510-submission/pipeline)
+sys.path.append(str(Path(__file__).resolve().parents[3] / 'shinhan_202510-submission'))
+from pipeline.preprocessing.merchant_store import MerchantPanelStore
+
+RAW_SOURCES = ['./data/big_data_set2_f.csv', './data/big_data_set3_f.csv']
 
 # 1. risk_classification_results.csv 파일 읽기
 risk_data = pd.read_csv('./data/risk_classification_results.csv', encoding='utf-8')
@@ -62,31 +70,23 @@ if not target_row.empty:
         
         # ===== 추가 부분 시작 =====
         
-        # 10. big_data_set2_f.csv 파일 읽기
-        print("\nbig_data_set2_f.csv 파일을 읽는 중...")
-        df2_full = pd.read_csv('./data/big_data_set2_f.csv', encoding='cp949')
-        
-        # 11. ENCODED_MCT가 'D402962627'인 행 추출
-        df2 = df2_full[df2_full['ENCODED_MCT'] == 'D402962627'].copy()
-        print(f"df2 추출된 행 수: {len(df2)}")
-        
-        # 12. big_data_set3_f.csv 파일 읽기
-        print("big_data_set3_f.csv 파일을 읽는 중...")
-        df3_full = pd.read_csv('./data/big_data_set3_f.csv', encoding='cp949')
-        
-        # 13. ENCODED_MCT가 'D402962627'인 행 추출
-        df3 = df3_full[df3_full['ENCODED_MCT'] == 'D402962627'].copy()
-        print(f"df3 추출된 행 수: {len(df3)}")
-        
-        # 14. df2와 df3를 TA_YM 기준으로 병합
-        df_merged = pd.merge(df2, df3, on=['ENCODED_MCT', 'TA_YM'], how='outer')
+        # 10. 가맹점 패널 저장소 준비 (없거나 원본 CSV가 바뀐 경우에만 전체 스캔 후 생성)
+        store = MerchantPanelStore('./data/merchant_panel')
+        if not store.is_current(RAW_SOURCES):
+            print("\n가맹점 패널 저장소를 생성하는 중 (최초 1회)...")
+            df2_full = pd.read_csv(RAW_SOURCES[0], encoding='cp949')
+            df3_full = pd.read_csv(RAW_SOURCES[1], encoding='cp949')
+            store.write(
+                pd.merge(df2_full, df3_full, on=['ENCODED_MCT', 'TA_YM'], how='outer'),
+                sources=RAW_SOURCES
+            )
         
-        # 15. TA_YM 시간순으로 정렬
-        df_merged = df_merged.sort_values('TA_YM').reset_index(drop=True)
+        # 11. ENCODED_MCT가 'D402962627'인 24개월 이력 조회 (df2, df3 outer 병합, TA_YM 순)
+        df_merged = store.get('D402962627')
         print(f"병합된 행 수: {len(df_merged)}")
         print(f"TA_YM 범위: {df_merged['TA_YM'].min()} ~ {df_merged['TA_YM'].max()}")
         
-        # 16. info 카테고리 추가 (시간순 데이터를 리스트로 변환, ENCODED_MCT 제외)
+        # 12. info 카테고리 추가 (시간순 데이터를 리스트로 변환, ENCODED_MCT 제외)
         info_list = []
         for _, row in df_merged.iterrows():
             # NaN 값을 None으로 변환하고 딕셔너리로 변환
@@ -110,7 +110,7 @@ if not target_row.empty:
         
         # ===== 추가 부분 끝 =====
         
-        # 17. My_Store.json에 저장
+        # 13. My_Store.json에 저장
         with open('./data/My_Store.json', 'w', encoding='utf-8') as json_file:
             json.dump(my_store_data, json_file, ensure_ascii=False, indent=4)
         
@@ -1,17 +1,39 @@
 """Feature Engineering Module
 
 This module contains feature engineering classes for creating time series,
-customer behavior, composite features, and interval pattern features.
+customer behavior, composite features, and interval pattern features,
+plus a dense merchant x month panel, incremental monthly ingestion, a
+fused multi-window rolling statistics engine, a feature dependency
+planner that runs only the engine calls a model needs, a
+merchant-sharded parallel executor for its steps, an online engine
+that updates per-merchant feature state one month at a time and lazy
+interaction / ratio feature expressions.
 """
 
 from .time_series import TimeSeriesFeatureEngine
 from .customer import CustomerFeatureEngine
 from .composite import CompositeFeatureEngine
 from .interval_patterns import IntervalPatternFeatureEngine
+from .panel import MerchantPanel
+from .incremental import IncrementalIngestor
+from .rolling import RollingStatsEngine
+from .planner import FeaturePlanner
+from .parallel import ParallelFeatureExecutor
+from .online import OnlineFeatureEngine
+from .expressions import ExpressionSet, interaction_expressions, ratio_expressions
 
 __all__ = [
     'TimeSeriesFeatureEngine',
     'CustomerFeatureEngine',
     'CompositeFeatureEngine',
     'IntervalPatternFeatureEngine',
+    'MerchantPanel',
+    'IncrementalIngestor',
+    'RollingStatsEngine',
+    'FeaturePlanner',
+    'ParallelFeatureExecutor',
+    'OnlineFeatureEngine',
+    'ExpressionSet',
+    'interaction_expressions',
+    'ratio_expressions',
 ]
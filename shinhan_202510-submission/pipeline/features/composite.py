@@ -4,9 +4,113 @@ This module contains the CompositeFeatureEngine class for creating
 composite features by combining multiple indicators.
 """
 
+import json
+import warnings
 import pandas as pd
 import numpy as np
-from typing import List, Optional
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .expressions import ExpressionSet, interaction_expressions, ratio_expressions
+from .frame import append_columns, working_frame
+
+
+def _inverse_volatility(cv: np.ndarray) -> np.ndarray:
+    """Lower volatility is better: 1 / (1 + cv), missing cv counted as 0."""
+    with np.errstate(divide='ignore'):
+        inverse = 1 / (1 + np.where(np.isnan(cv), 0, cv))
+    inverse[np.isinf(inverse)] = np.nan
+    return inverse
+
+
+def _negative_part(trend: np.ndarray) -> np.ndarray:
+    """Declining trend as a positive risk value (missing trend counted as 0)."""
+    negative = -np.where(np.isnan(trend), 0, trend)
+    return np.where(negative < 0, 0, negative)
+
+
+def _positive_part(change: np.ndarray) -> np.ndarray:
+    """Positive rank change = worse rank (missing change counted as 0)."""
+    change = np.where(np.isnan(change), 0, change)
+    return np.where(change < 0, 0, change)
+
+
+def _instability(stability: np.ndarray) -> np.ndarray:
+    """1 - stability (missing stability counted as 0.5)."""
+    return 1 - np.where(np.isnan(stability), 0.5, stability)
+
+
+# Composite index windows (in months)
+COMPOSITE_WINDOWS = [3, 6, 12]
+
+# Index -> components: (name, source column template, transform)
+# Templates use {w} (window), {w6} (window capped at 6), {w12} (window capped at 12)
+COMPOSITE_COMPONENTS: Dict[str, List[Tuple[str, str, Optional[Callable]]]] = {
+    'health_index': [
+        ('sales_trend', 'RC_M1_SAA_trend_{w}m', None),
+        ('loyalty', 'loyalty_score_avg_{w}m', None),
+        ('stability', 'customer_stability_{w}m', None),
+        ('inv_volatility', 'RC_M1_SAA_cv_{w}m', _inverse_volatility),
+    ],
+    'risk_index': [
+        ('volatility', 'RC_M1_SAA_cv_{w}m', None),
+        ('neg_trend', 'RC_M1_SAA_trend_{w}m', _negative_part),
+        ('rank_decline', 'RC_M1_SAA_rank_change_{w6}m', _positive_part),
+        ('instability', 'customer_stability_{w}m', _instability),
+    ],
+    'growth_index': [
+        ('sales_change', 'RC_M1_SAA_change_{w12}m', None),
+        ('customer_change', 'RC_M1_UE_CUS_CN_change_{w12}m', None),
+        ('sales_trend', 'RC_M1_SAA_trend_{w}m', None),
+        ('new_customer_trend', 'customer_new_trend_{w}m', None),
+    ],
+}
+
+# Indices normalized to [-1, 1] by the absolute maximum (sign is kept)
+SYMMETRIC_INDICES = {'growth_index'}
+
+_TRANSFORMS = {
+    (index, name): transform
+    for index, components in COMPOSITE_COMPONENTS.items()
+    for name, _, transform in components
+}
+
+
+def composite_sources(index: str, window: int) -> List[str]:
+    """
+    Source columns of one composite index.
+
+    Args:
+        index: Index name ('health_index', 'risk_index', 'growth_index')
+        window: Window size (in months)
+
+    Returns:
+        List of source column names
+    """
+    return [
+        template.format(w=window, w6=min(window, 6), w12=min(window, 12))
+        for _, template, _ in COMPOSITE_COMPONENTS[index]
+    ]
+
+
+def _available_components(df: pd.DataFrame) -> List[Tuple[str, str, str]]:
+    """(index name, component, source column) of every component present in df."""
+    components = []
+    for index, index_components in COMPOSITE_COMPONENTS.items():
+        for window in COMPOSITE_WINDOWS:
+            for (name, _, _), source in zip(index_components, composite_sources(index, window)):
+                if source in df.columns:
+                    components.append((f"{index}_{window}m", name, source))
+    return components
+
+
+def _component_matrix(df: pd.DataFrame, components: List[Tuple[str, str, str]]) -> np.ndarray:
+    """Component values (rows x components), transforms applied."""
+    values = np.empty((len(df), len(components)))
+    for i, (index_name, name, source) in enumerate(components):
+        column = df[source].to_numpy(dtype='float64', na_value=np.nan)
+        transform = _TRANSFORMS[(index_name.rsplit('_', 1)[0], name)]
+        values[:, i] = transform(column) if transform is not None else column
+    return values
 
 
 class CompositeFeatureEngine:
@@ -19,9 +123,15 @@ class CompositeFeatureEngine:
     - Growth index
     """
 
-    def __init__(self):
-        """Initialize CompositeFeatureEngine."""
-        pass
+    def __init__(self, copy: bool = True):
+        """
+        Initialize CompositeFeatureEngine.
+
+        Args:
+            copy: If False, work on the input frame without copying it
+        """
+        self.copy = copy
+        self.bounds: Optional[Dict[str, List[Dict]]] = None
 
     def create_composite_indicators(
         self,
@@ -35,6 +145,9 @@ class CompositeFeatureEngine:
         - Risk index: combination of volatility, trend, and ranking
         - Growth index: combination of change rates and trends
 
+        Components are normalized with bounds computed on df itself. Use
+        fit() / transform() to normalize with bounds from training data.
+
         Args:
             df: Input DataFrame
 
@@ -43,150 +156,155 @@ class CompositeFeatureEngine:
         """
         print(f"\nCreating composite indicators...")
 
-        df_result = df.copy()
-        features_created = 0
-
-        # Health Index (3, 6, 12 month windows)
-        for window in [3, 6, 12]:
-            health_components = []
-
-            # Sales trend component
-            sales_trend_col = f'RC_M1_SAA_trend_{window}m'
-            if sales_trend_col in df_result.columns:
-                health_components.append(sales_trend_col)
-
-            # Customer loyalty component
-            loyalty_col = f'loyalty_score_avg_{window}m'
-            if loyalty_col in df_result.columns:
-                health_components.append(loyalty_col)
-
-            # Customer stability component
-            stability_col = f'customer_stability_{window}m'
-            if stability_col in df_result.columns:
-                health_components.append(stability_col)
-
-            # Sales volatility component (inverse - lower volatility is better)
-            volatility_col = f'RC_M1_SAA_cv_{window}m'
-            if volatility_col in df_result.columns:
-                # Normalize and invert
-                inv_volatility = 1 / (1 + df_result[volatility_col].fillna(0))
-                # Replace inf values with NaN
-                inv_volatility = inv_volatility.replace([np.inf, -np.inf], np.nan)
-                df_result[f'_inv_volatility_{window}m'] = inv_volatility
-                health_components.append(f'_inv_volatility_{window}m')
-
-            if len(health_components) > 0:
-                # Normalize each component to 0-1 range and take average
-                normalized_components = []
-                for comp in health_components:
-                    min_val = df_result[comp].min()
-                    max_val = df_result[comp].max()
-                    if max_val - min_val > 0:
-                        normalized = (df_result[comp] - min_val) / (max_val - min_val)
-                        normalized_components.append(normalized)
-
-                if len(normalized_components) > 0:
-                    df_result[f'health_index_{window}m'] = sum(normalized_components) / len(normalized_components)
-                    features_created += 1
-
-                    # Clean up temporary columns
-                    if f'_inv_volatility_{window}m' in df_result.columns:
-                        df_result.drop(columns=[f'_inv_volatility_{window}m'], inplace=True)
-
-        # Risk Index (3, 6, 12 month windows)
-        for window in [3, 6, 12]:
-            risk_components = []
-
-            # Sales volatility component (high volatility = high risk)
-            volatility_col = f'RC_M1_SAA_cv_{window}m'
-            if volatility_col in df_result.columns:
-                risk_components.append(volatility_col)
-
-            # Negative trend component (declining sales = high risk)
-            sales_trend_col = f'RC_M1_SAA_trend_{window}m'
-            if sales_trend_col in df_result.columns:
-                # Invert negative trends to positive risk values
-                df_result[f'_neg_trend_{window}m'] = -df_result[sales_trend_col].fillna(0)
-                df_result.loc[df_result[f'_neg_trend_{window}m'] < 0, f'_neg_trend_{window}m'] = 0
-                risk_components.append(f'_neg_trend_{window}m')
-
-            # Ranking decline component (worsening rank = high risk)
-            rank_change_col = f'RC_M1_SAA_rank_change_{min(window, 6)}m'  # Use 6m max
-            if rank_change_col in df_result.columns:
-                # Positive rank change = worse rank = high risk
-                df_result[f'_rank_decline_{window}m'] = df_result[rank_change_col].fillna(0)
-                df_result.loc[df_result[f'_rank_decline_{window}m'] < 0, f'_rank_decline_{window}m'] = 0
-                risk_components.append(f'_rank_decline_{window}m')
-
-            # Customer instability component (low stability = high risk)
-            stability_col = f'customer_stability_{window}m'
-            if stability_col in df_result.columns:
-                # Invert stability to get instability
-                df_result[f'_instability_{window}m'] = 1 - df_result[stability_col].fillna(0.5)
-                risk_components.append(f'_instability_{window}m')
-
-            if len(risk_components) > 0:
-                # Normalize each component to 0-1 range and take average
-                normalized_components = []
-                for comp in risk_components:
-                    min_val = df_result[comp].min()
-                    max_val = df_result[comp].max()
-                    if max_val - min_val > 0:
-                        normalized = (df_result[comp] - min_val) / (max_val - min_val)
-                        normalized_components.append(normalized)
-
-                if len(normalized_components) > 0:
-                    df_result[f'risk_index_{window}m'] = sum(normalized_components) / len(normalized_components)
-                    features_created += 1
-
-                    # Clean up temporary columns
-                    temp_cols = [f'_neg_trend_{window}m', f'_rank_decline_{window}m', f'_instability_{window}m']
-                    for temp_col in temp_cols:
-                        if temp_col in df_result.columns:
-                            df_result.drop(columns=[temp_col], inplace=True)
-
-        # Growth Index (3, 6, 12 month windows)
-        for window in [3, 6, 12]:
-            growth_components = []
-
-            # Sales change component
-            sales_change_col = f'RC_M1_SAA_change_{min(window, 12)}m'  # Use 12m max
-            if sales_change_col in df_result.columns:
-                growth_components.append(sales_change_col)
-
-            # Customer change component
-            customer_change_col = f'RC_M1_UE_CUS_CN_change_{min(window, 12)}m'
-            if customer_change_col in df_result.columns:
-                growth_components.append(customer_change_col)
-
-            # Sales trend component
-            sales_trend_col = f'RC_M1_SAA_trend_{window}m'
-            if sales_trend_col in df_result.columns:
-                growth_components.append(sales_trend_col)
-
-            # New customer trend component
-            new_customer_trend_col = f'customer_new_trend_{window}m'
-            if new_customer_trend_col in df_result.columns:
-                growth_components.append(new_customer_trend_col)
-
-            if len(growth_components) > 0:
-                # Normalize each component to -1 to 1 range and take average
-                normalized_components = []
-                for comp in growth_components:
-                    min_val = df_result[comp].min()
-                    max_val = df_result[comp].max()
-                    if max_val - min_val > 0:
-                        # Normalize to -1 to 1 (preserving negative values)
-                        abs_max = max(abs(min_val), abs(max_val))
-                        if abs_max > 0:
-                            normalized = df_result[comp] / abs_max
-                            normalized_components.append(normalized)
-
-                if len(normalized_components) > 0:
-                    df_result[f'growth_index_{window}m'] = sum(normalized_components) / len(normalized_components)
-                    features_created += 1
-
-        print(f"Created {features_created} composite indicator features")
+        return self._apply_bounds(df, self._compute_bounds(df))
+
+    def fit(self, df: pd.DataFrame) -> 'CompositeFeatureEngine':
+        """
+        Compute and keep the component bounds of every composite index.
+
+        Args:
+            df: Training DataFrame with the component features
+
+        Returns:
+            self
+        """
+        self.bounds = self._compute_bounds(df)
+
+        n_components = sum(len(components) for components in self.bounds.values())
+        print(f"\nFitted composite bounds: {len(self.bounds)} indices, {n_components} components")
+        return self
+
+    def transform(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Create composite indicators with the fitted bounds.
+
+        The bounds are not recomputed, so a single merchant or a single
+        month gets the same index values as in the training frame.
+
+        Args:
+            df: DataFrame with the component features
+
+        Returns:
+            DataFrame with composite indicator features added
+        """
+        if self.bounds is None:
+            raise ValueError("No composite bounds. Call fit() or load() first.")
+
+        print(f"\nCreating composite indicators (fitted bounds)...")
+
+        return self._apply_bounds(df, self.bounds)
+
+    def fit_transform(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        fit() and transform() on the same frame.
+
+        Args:
+            df: Training DataFrame with the component features
+
+        Returns:
+            DataFrame with composite indicator features added
+        """
+        return self.fit(df).transform(df)
+
+    def save(self, filepath: str):
+        """
+        Save the fitted bounds as JSON (next to the model files).
+
+        Args:
+            filepath: Output path (e.g. models/composite_bounds.json)
+        """
+        if self.bounds is None:
+            raise ValueError("No composite bounds. Call fit() first.")
+
+        with open(filepath, 'w', encoding='utf-8') as f:
+            json.dump(self.bounds, f, ensure_ascii=False, indent=2)
+
+        print(f"Saved composite bounds: {filepath}")
+
+    def load(self, filepath: str) -> 'CompositeFeatureEngine':
+        """
+        Load bounds saved with save().
+
+        Args:
+            filepath: Saved path
+
+        Returns:
+            self
+        """
+        with open(filepath, 'r', encoding='utf-8') as f:
+            self.bounds = json.load(f)
+
+        print(f"Loaded composite bounds for {len(self.bounds)} indices: {filepath}")
+        return self
+
+    def _compute_bounds(self, df: pd.DataFrame) -> Dict[str, List[Dict]]:
+        """
+        Component bounds of every composite index found in df.
+
+        All components of all windows are stacked into one matrix and
+        their min / max are computed in one pass. Components without
+        spread (max == min, or all missing) are left out, as they would
+        only add a constant to the index.
+
+        Returns:
+            Dict of index name -> list of {component, source, min, max, abs_max}
+        """
+        components = _available_components(df)
+        if not components:
+            return {}
+
+        values = _component_matrix(df, components)
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', category=RuntimeWarning)  # all-NaN components
+            mins = np.nanmin(values, axis=0)
+            maxs = np.nanmax(values, axis=0)
+
+        bounds = {}
+        for (index_name, component, source), min_val, max_val in zip(components, mins, maxs):
+            if not max_val - min_val > 0:
+                continue
+            bounds.setdefault(index_name, []).append({
+                'component': component,
+                'source': source,
+                'min': float(min_val),
+                'max': float(max_val),
+                'abs_max': float(max(abs(min_val), abs(max_val))),
+            })
+        return bounds
+
+    def _apply_bounds(self, df: pd.DataFrame, bounds: Dict[str, List[Dict]]) -> pd.DataFrame:
+        """Normalize the components with bounds and average them per index."""
+        df_result = working_frame(df, self.copy)
+
+        components = [
+            (index_name, bound['component'], bound['source'])
+            for index_name, index_bounds in bounds.items()
+            for bound in index_bounds
+        ]
+        missing = sorted({source for _, _, source in components if source not in df_result.columns})
+        if missing:
+            raise KeyError(f"Composite component columns not found: {missing}")
+
+        # Normalize all components of all indices in one block:
+        # min-max to [0, 1], or divided by abs max to [-1, 1] for symmetric indices
+        values = _component_matrix(df_result, components)
+        flat = [bound for index_bounds in bounds.values() for bound in index_bounds]
+        symmetric = np.array([index_name.rsplit('_', 1)[0] in SYMMETRIC_INDICES for index_name, _, _ in components])
+        offset = np.where(symmetric, 0.0, [bound['min'] for bound in flat])
+        scale = np.where(symmetric, [bound['abs_max'] for bound in flat],
+                         [bound['max'] - bound['min'] for bound in flat])
+        normalized = (values - offset) / scale
+
+        new_columns = {}
+        start = 0
+        for index_name, index_bounds in bounds.items():
+            block = normalized[:, start:start + len(index_bounds)]
+            start += len(index_bounds)
+            new_columns[index_name] = pd.Series(block.sum(axis=1) / len(index_bounds), index=df_result.index)
+
+        df_result = append_columns(df_result, new_columns)
+
+        print(f"Created {len(new_columns)} composite indicator features")
 
         return df_result
 
@@ -198,6 +316,10 @@ class CompositeFeatureEngine:
         """
         Create interaction features by multiplying pairs of features.
 
+        All pairs are materialized as float columns; for wide exploratory
+        sets use interaction_expressions() and evaluate only the selected
+        features (see expressions.py).
+
         Args:
             df: Input DataFrame
             feature_pairs: List of tuples containing feature pairs to interact
@@ -208,20 +330,7 @@ class CompositeFeatureEngine:
         print(f"\nCreating interaction features...")
         print(f"Feature pairs: {len(feature_pairs)}")
 
-        df_result = df.copy()
-        features_created = 0
-
-        for feat1, feat2 in feature_pairs:
-            if feat1 in df_result.columns and feat2 in df_result.columns:
-                interaction_col_name = f"{feat1}_X_{feat2}"
-                df_result[interaction_col_name] = df_result[feat1] * df_result[feat2]
-                features_created += 1
-            else:
-                print(f"Warning: One or both features not found: {feat1}, {feat2}")
-
-        print(f"Created {features_created} interaction features")
-
-        return df_result
+        return self._add_expressions(df, interaction_expressions(feature_pairs), 'interaction')
 
     def create_ratio_features(
         self,
@@ -232,6 +341,10 @@ class CompositeFeatureEngine:
         """
         Create ratio features by dividing numerator by denominator.
 
+        Every numerator x denominator pair is materialized; for wide
+        exploratory sets use ratio_expressions() and evaluate only the
+        selected features (see expressions.py).
+
         Args:
             df: Input DataFrame
             numerator_cols: List of numerator columns
@@ -244,21 +357,19 @@ class CompositeFeatureEngine:
         print(f"Numerators: {len(numerator_cols)}")
         print(f"Denominators: {len(denominator_cols)}")
 
-        df_result = df.copy()
-        features_created = 0
-
-        for num_col in numerator_cols:
-            for den_col in denominator_cols:
-                if num_col in df_result.columns and den_col in df_result.columns:
-                    ratio_col_name = f"{num_col}_div_{den_col}"
-                    ratio_values = df_result[num_col] / df_result[den_col].replace(0, np.nan)
-                    # Replace inf values with NaN
-                    ratio_values = ratio_values.replace([np.inf, -np.inf], np.nan)
-                    df_result[ratio_col_name] = ratio_values
-                    features_created += 1
-                else:
-                    print(f"Warning: One or both features not found: {num_col}, {den_col}")
-
-        print(f"Created {features_created} ratio features")
+        return self._add_expressions(df, ratio_expressions(numerator_cols, denominator_cols), 'ratio')
+
+    def _add_expressions(self, df: pd.DataFrame, expressions: ExpressionSet, kind: str) -> pd.DataFrame:
+        """Evaluate expressions and add them to the working frame."""
+        df_result = working_frame(df, self.copy)
+
+        expressions, skipped = expressions.available(df_result)
+        for expr in skipped:
+            print(f"Warning: One or both features not found: {expr.left}, {expr.right}")
+
+        new_columns = {expr.name: expr.evaluate(df_result) for expr in expressions}
+        df_result = append_columns(df_result, new_columns)
+
+        print(f"Created {len(new_columns)} {kind} features")
 
         return df_result
@@ -8,6 +8,9 @@ import pandas as pd
 import numpy as np
 from typing import List, Optional
 
+from .frame import append_columns, sort_panel
+from .rolling import RollingStatsEngine
+
 
 class CustomerFeatureEngine:
     """
@@ -19,16 +22,19 @@ class CustomerFeatureEngine:
     - Retention metrics
     """
 
-    def __init__(self, merchant_col: str = 'ENCODED_MCT', date_col: str = 'TA_YM'):
+    def __init__(self, merchant_col: str = 'ENCODED_MCT', date_col: str = 'TA_YM', copy: bool = True):
         """
         Initialize CustomerFeatureEngine.
 
         Args:
             merchant_col: Column name for merchant ID
             date_col: Column name for date (YYYYMM format)
+            copy: If False, work on the input frame without copying it
+                (already sorted frames are not re-sorted; see frame.py)
         """
         self.merchant_col = merchant_col
         self.date_col = date_col
+        self.copy = copy
 
     def create_customer_behavior_features(
         self,
@@ -54,10 +60,8 @@ class CustomerFeatureEngine:
         print(f"\nCreating customer behavior features...")
         print(f"Windows: {windows}")
 
-        df_result = df.copy()
-
         # Sort by merchant and date
-        df_result = df_result.sort_values([self.merchant_col, self.date_col])
+        df_result = sort_panel(df, self.merchant_col, self.date_col, self.copy)
 
         # Check if required columns exist
         reu_col = 'MCT_UE_CLN_REU_RAT'
@@ -67,44 +71,21 @@ class CustomerFeatureEngine:
             print(f"Warning: Required columns not found, skipping customer behavior features")
             return df_result
 
-        features_created = 0
-
+        spec = {}
         for window in windows:
             # Average returning customer ratio
-            df_result[f'customer_reu_avg_{window}m'] = df_result.groupby(self.merchant_col)[reu_col].transform(
-                lambda x: x.rolling(window=window, min_periods=1).mean()
-            )
-            features_created += 1
-
+            spec[f'customer_reu_avg_{window}m'] = (reu_col, 'mean', window)
             # Average new customer ratio
-            df_result[f'customer_new_avg_{window}m'] = df_result.groupby(self.merchant_col)[new_col].transform(
-                lambda x: x.rolling(window=window, min_periods=1).mean()
-            )
-            features_created += 1
-
+            spec[f'customer_new_avg_{window}m'] = (new_col, 'mean', window)
             # Standard deviation of returning customer ratio (stability)
-            df_result[f'customer_reu_std_{window}m'] = df_result.groupby(self.merchant_col)[reu_col].transform(
-                lambda x: x.rolling(window=window, min_periods=1).std()
-            )
-            features_created += 1
-
+            spec[f'customer_reu_std_{window}m'] = (reu_col, 'std', window)
             # Trend in new customer acquisition
-            def calculate_trend(series):
-                """Calculate linear trend (slope) for a series."""
-                if len(series) < 2 or series.isna().all():
-                    return np.nan
-                x = np.arange(len(series))
-                y = series.values
-                mask = ~np.isnan(y)
-                if mask.sum() < 2:
-                    return np.nan
-                trend = np.polyfit(x[mask], y[mask], 1)[0]
-                return trend
-
-            df_result[f'customer_new_trend_{window}m'] = df_result.groupby(self.merchant_col)[new_col].transform(
-                lambda x: x.rolling(window=window, min_periods=2).apply(calculate_trend, raw=False)
-            )
-            features_created += 1
+            spec[f'customer_new_trend_{window}m'] = (new_col, 'slope', window)
+
+        # All windows in one pass over the sorted frame
+        stats = RollingStatsEngine(self.merchant_col, self.date_col).compute(df_result, spec)
+        df_result = append_columns(df_result, {name: stats[name].to_numpy() for name in spec})
+        features_created = len(spec)
 
         print(f"Created {features_created} customer behavior features")
 
@@ -133,10 +114,8 @@ class CustomerFeatureEngine:
         print(f"\nCreating loyalty indicators...")
         print(f"Windows: {windows}")
 
-        df_result = df.copy()
-
         # Sort by merchant and date
-        df_result = df_result.sort_values([self.merchant_col, self.date_col])
+        df_result = sort_panel(df, self.merchant_col, self.date_col, self.copy)
 
         # Check if required columns exist
         reu_col = 'MCT_UE_CLN_REU_RAT'
@@ -147,56 +126,44 @@ class CustomerFeatureEngine:
             return df_result
 
         features_created = 0
+        new_columns = {}
 
         # Instant loyalty score (returning / new ratio)
         loyalty_score = df_result[reu_col] / df_result[new_col].replace(0, np.nan)
         # Replace inf values with NaN (occurs when dividing by 0 or very small values)
         loyalty_score = loyalty_score.replace([np.inf, -np.inf], np.nan)
-        df_result['loyalty_score'] = loyalty_score
+        new_columns['loyalty_score'] = loyalty_score
         features_created += 1
 
+        spec = {}
+        for window in windows:
+            spec[f'loyalty_score_avg_{window}m'] = ('loyalty_score', 'mean', window)
+            spec[f'loyalty_trend_{window}m'] = ('loyalty_score', 'slope', window)
+            spec[f'reu_cv_{window}m'] = (reu_col, 'cv', window)
+
+        # All windows in one pass over the sorted frame (loyalty_score is not in the frame yet)
+        inputs = df_result[[self.merchant_col, self.date_col, reu_col]].assign(loyalty_score=loyalty_score)
+        stats = RollingStatsEngine(self.merchant_col, self.date_col).compute(inputs, spec)
+
         for window in windows:
             # Average loyalty score
-            df_result[f'loyalty_score_avg_{window}m'] = df_result.groupby(self.merchant_col)['loyalty_score'].transform(
-                lambda x: x.rolling(window=window, min_periods=1).mean()
-            )
+            new_columns[f'loyalty_score_avg_{window}m'] = stats[f'loyalty_score_avg_{window}m']
             features_created += 1
 
             # Loyalty trend
-            def calculate_trend(series):
-                """Calculate linear trend (slope) for a series."""
-                if len(series) < 2 or series.isna().all():
-                    return np.nan
-                x = np.arange(len(series))
-                y = series.values
-                mask = ~np.isnan(y)
-                if mask.sum() < 2:
-                    return np.nan
-                trend = np.polyfit(x[mask], y[mask], 1)[0]
-                return trend
-
-            df_result[f'loyalty_trend_{window}m'] = df_result.groupby(self.merchant_col)['loyalty_score'].transform(
-                lambda x: x.rolling(window=window, min_periods=2).apply(calculate_trend, raw=False)
-            )
+            new_columns[f'loyalty_trend_{window}m'] = stats[f'loyalty_trend_{window}m']
             features_created += 1
 
             # Customer stability index (inverse of coefficient of variation)
-            # Higher stability = lower CV
-            rolling_mean = df_result.groupby(self.merchant_col)[reu_col].transform(
-                lambda x: x.rolling(window=window, min_periods=1).mean()
-            )
-            rolling_std = df_result.groupby(self.merchant_col)[reu_col].transform(
-                lambda x: x.rolling(window=window, min_periods=1).std()
-            )
-            cv = rolling_std / rolling_mean.replace(0, np.nan)
-            # Replace inf values with NaN
-            cv = cv.replace([np.inf, -np.inf], np.nan)
-            stability = 1 / (1 + cv)
+            # Higher stability = lower CV (CV is NaN where the rolling mean is 0)
+            stability = 1 / (1 + stats[f'reu_cv_{window}m'])
             # Replace any remaining inf values
             stability = stability.replace([np.inf, -np.inf], np.nan)
-            df_result[f'customer_stability_{window}m'] = stability
+            new_columns[f'customer_stability_{window}m'] = stability
             features_created += 1
 
+        df_result = append_columns(df_result, new_columns)
+
         print(f"Created {features_created} loyalty indicator features")
 
         return df_result
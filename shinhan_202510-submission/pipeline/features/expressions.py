@@ -0,0 +1,282 @@
+"""Lazy Feature Expressions
+
+This module contains lazy interaction (a * b) and ratio (a / b) features.
+
+An expression only holds its name and input column names, so a wide
+exploratory set (e.g. every numerator x denominator pair) costs nothing
+until it is evaluated. ExpressionSet evaluates expressions in batches of
+columns, in float32 by default, and only for the features that are
+actually needed:
+- select(): keep the expressions a model uses
+- from_names(): rebuild expressions from feature names ('{a}_X_{b}', '{a}_div_{b}')
+- iter_batches(): DataFrames of batch_size expression columns at a time
+- to_matrix(): write base columns and expressions straight into one
+  preallocated training matrix
+
+Example:
+    expressions = ratio_expressions(numerator_cols, denominator_cols)
+    expressions = expressions.select(selected_features)
+    X = expressions.to_matrix(df, base_columns=feature_cols)
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+
+class FeatureExpression:
+    """
+    One lazy binary feature.
+
+    Attributes:
+        name: Output feature name
+        op: 'mul' (interaction) or 'div' (ratio)
+        left: Left input column
+        right: Right input column
+    """
+
+    SEPARATORS = {'mul': '_X_', 'div': '_div_'}
+
+    def __init__(self, op: str, left: str, right: str):
+        if op not in self.SEPARATORS:
+            raise ValueError(f"Unknown expression op: {op}")
+        self.op = op
+        self.left = left
+        self.right = right
+        self.name = f"{left}{self.SEPARATORS[op]}{right}"
+
+    def __repr__(self) -> str:
+        return f"FeatureExpression({self.name})"
+
+    @property
+    def inputs(self) -> Tuple[str, str]:
+        return self.left, self.right
+
+    def evaluate(self, df: pd.DataFrame) -> pd.Series:
+        """
+        Evaluate on a DataFrame (dtype follows the input columns).
+
+        Ratios are NaN where the denominator is 0 or the result is infinite.
+
+        Args:
+            df: DataFrame with both input columns
+
+        Returns:
+            Series aligned with df
+        """
+        left = df[self.left]
+        right = df[self.right]
+        if self.op == 'mul':
+            return left * right
+        values = left / right.replace(0, np.nan)
+        return values.replace([np.inf, -np.inf], np.nan)
+
+
+def parse_expression(name: str, columns: Optional[Sequence[str]] = None) -> Optional[FeatureExpression]:
+    """
+    Rebuild an expression from its feature name.
+
+    Args:
+        name: Feature name ('{a}_X_{b}' or '{a}_div_{b}')
+        columns: Known input columns; if given, a name is only parsed when
+            both inputs are in it (resolves names with several separators)
+
+    Returns:
+        FeatureExpression, or None if the name is not an expression
+    """
+    for op, separator in FeatureExpression.SEPARATORS.items():
+        parts = name.split(separator)
+        for i in range(1, len(parts)):
+            left, right = separator.join(parts[:i]), separator.join(parts[i:])
+            if not left or not right:
+                continue
+            if columns is None:
+                if len(parts) == 2:
+                    return FeatureExpression(op, left, right)
+            elif left in columns and right in columns:
+                return FeatureExpression(op, left, right)
+    return None
+
+
+class ExpressionSet:
+    """
+    Ordered set of lazy feature expressions.
+
+    Attributes:
+        expressions: Dict of feature name -> FeatureExpression
+    """
+
+    def __init__(self, expressions: Sequence[FeatureExpression] = ()):
+        self.expressions: Dict[str, FeatureExpression] = {expr.name: expr for expr in expressions}
+
+    def __len__(self) -> int:
+        return len(self.expressions)
+
+    def __iter__(self) -> Iterator[FeatureExpression]:
+        return iter(self.expressions.values())
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.expressions
+
+    def __repr__(self) -> str:
+        return f"ExpressionSet({len(self)} expressions)"
+
+    @property
+    def names(self) -> List[str]:
+        return list(self.expressions)
+
+    @property
+    def inputs(self) -> List[str]:
+        """Input columns used by the expressions (in first-use order)."""
+        return list(dict.fromkeys(col for expr in self for col in expr.inputs))
+
+    @classmethod
+    def from_names(cls, names: Sequence[str], columns: Optional[Sequence[str]] = None) -> 'ExpressionSet':
+        """
+        Expressions for the feature names that are expressions.
+
+        Args:
+            names: Feature names (e.g. a model's selected features)
+            columns: Known input columns (see parse_expression)
+
+        Returns:
+            ExpressionSet (other names are ignored)
+        """
+        parsed = (parse_expression(name, columns) for name in names)
+        return cls([expr for expr in parsed if expr is not None])
+
+    def select(self, names: Sequence[str]) -> 'ExpressionSet':
+        """
+        Keep only the named expressions (in the order of names).
+
+        Args:
+            names: Feature names; names that are not in the set are ignored
+
+        Returns:
+            ExpressionSet
+        """
+        return ExpressionSet([self.expressions[name] for name in names if name in self.expressions])
+
+    def available(self, df: pd.DataFrame) -> Tuple['ExpressionSet', List[FeatureExpression]]:
+        """
+        Split into expressions whose inputs are in df and the others.
+
+        Returns:
+            (ExpressionSet of evaluable expressions, list of skipped expressions)
+        """
+        evaluable, skipped = [], []
+        for expr in self:
+            (evaluable if all(col in df.columns for col in expr.inputs) else skipped).append(expr)
+        return ExpressionSet(evaluable), skipped
+
+    def iter_batches(
+        self,
+        df: pd.DataFrame,
+        batch_size: int = 64,
+        dtype: Optional[np.dtype] = np.float32
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Evaluate batch_size expressions at a time.
+
+        Args:
+            df: Input DataFrame
+            batch_size: Expression columns per batch
+            dtype: Output dtype (None keeps the computed dtype)
+
+        Yields:
+            DataFrame of expression columns (same index as df)
+        """
+        self._check_inputs(df)
+        expressions = list(self)
+        for start in range(0, len(expressions), batch_size):
+            batch = {}
+            for expr in expressions[start:start + batch_size]:
+                values = expr.evaluate(df)
+                batch[expr.name] = values if dtype is None else values.astype(dtype)
+            yield pd.DataFrame(batch, index=df.index)
+
+    def evaluate(self, df: pd.DataFrame, dtype: Optional[np.dtype] = np.float32) -> pd.DataFrame:
+        """
+        Evaluate all expressions into one DataFrame.
+
+        Args:
+            df: Input DataFrame
+            dtype: Output dtype (None keeps the computed dtype)
+
+        Returns:
+            DataFrame of expression columns (same index as df)
+        """
+        if len(self) == 0:
+            return pd.DataFrame(index=df.index)
+        return pd.concat(list(self.iter_batches(df, dtype=dtype)), axis=1)
+
+    def to_matrix(
+        self,
+        df: pd.DataFrame,
+        base_columns: Sequence[str] = (),
+        dtype: np.dtype = np.float32,
+        out: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """
+        Write base columns and expressions into one training matrix.
+
+        Each column is computed and written into its slot directly, so
+        peak memory is the matrix plus one column.
+
+        Args:
+            df: Input DataFrame
+            base_columns: Columns copied into the first slots as they are
+            dtype: Matrix dtype (if out is None)
+            out: Preallocated matrix (n_rows x len(base_columns) + len(self))
+
+        Returns:
+            Matrix with columns base_columns + self.names
+        """
+        self._check_inputs(df)
+        shape = (len(df), len(base_columns) + len(self))
+        if out is None:
+            out = np.empty(shape, dtype=dtype)
+        elif out.shape != shape:
+            raise ValueError(f"Output matrix shape {out.shape} does not match {shape}")
+
+        for i, col in enumerate(base_columns):
+            out[:, i] = df[col].to_numpy(dtype='float64', na_value=np.nan)
+        for i, expr in enumerate(self, start=len(base_columns)):
+            out[:, i] = expr.evaluate(df).to_numpy(dtype='float64', na_value=np.nan)
+        return out
+
+    def _check_inputs(self, df: pd.DataFrame):
+        missing = [col for col in self.inputs if col not in df.columns]
+        if missing:
+            raise KeyError(f"Expression input columns not found: {missing}")
+
+
+def interaction_expressions(feature_pairs: Sequence[Tuple[str, str]]) -> ExpressionSet:
+    """
+    Lazy interaction features ('{a}_X_{b}' = a * b).
+
+    Args:
+        feature_pairs: List of (a, b) column pairs
+
+    Returns:
+        ExpressionSet
+    """
+    return ExpressionSet([FeatureExpression('mul', a, b) for a, b in feature_pairs])
+
+
+def ratio_expressions(numerator_cols: Sequence[str], denominator_cols: Sequence[str]) -> ExpressionSet:
+    """
+    Lazy ratio features ('{a}_div_{b}' = a / b) for every numerator x denominator.
+
+    Args:
+        numerator_cols: Numerator columns
+        denominator_cols: Denominator columns
+
+    Returns:
+        ExpressionSet
+    """
+    return ExpressionSet([
+        FeatureExpression('div', num_col, den_col)
+        for num_col in numerator_cols
+        for den_col in denominator_cols
+    ])
@@ -0,0 +1,144 @@
+"""Working Frame Helpers
+
+This module contains the helpers the feature engines use to prepare
+their working frame and to add feature columns.
+
+- sort_panel: sort by merchant and date (skipped in copy-free mode when
+  the frame is already sorted)
+- append_columns: add all new columns of a step with one concat instead
+  of one df[col] = ... assignment per column
+- float_codes: nullable integer columns (Int8 interval codes) as float64,
+  applied by sort_panel / working_frame so the engines always compute
+  with NaN semantics (the engine output holds these columns as float64)
+
+In copy-free mode (engines created with copy=False) the returned frame
+shares the input's column data instead of copying it, so a chain of
+engine calls holds about one frame's worth of data plus the new
+columns. The input frame itself is never modified.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict
+
+
+def is_panel_sorted(df: pd.DataFrame, merchant_col: str, date_col: str) -> bool:
+    """
+    Check whether rows are sorted by merchant and date.
+
+    Args:
+        df: Long DataFrame
+        merchant_col: Column name for merchant ID
+        date_col: Column name for date
+
+    Returns:
+        True if sort_values([merchant_col, date_col]) would keep the row order
+    """
+    if len(df) < 2:
+        return True
+    keys = pd.MultiIndex.from_arrays([df[merchant_col], df[date_col]])
+    return bool(keys.is_monotonic_increasing) and not np.any(keys.codes[0] < 0)
+
+
+def sort_panel(
+    df: pd.DataFrame,
+    merchant_col: str,
+    date_col: str,
+    copy: bool = True
+) -> pd.DataFrame:
+    """
+    Prepare the working frame sorted by merchant and date.
+
+    Args:
+        df: Long DataFrame
+        merchant_col: Column name for merchant ID
+        date_col: Column name for date
+        copy: If False, an already sorted frame is returned as is (no copy)
+
+    Returns:
+        Sorted DataFrame
+    """
+    if not copy and is_panel_sorted(df, merchant_col, date_col):
+        return float_codes(df)
+    return float_codes(df.sort_values([merchant_col, date_col]))
+
+
+def working_frame(df: pd.DataFrame, copy: bool = True) -> pd.DataFrame:
+    """
+    Prepare the working frame without sorting.
+
+    Args:
+        df: DataFrame
+        copy: If False, the frame is returned as is (no copy)
+
+    Returns:
+        DataFrame
+    """
+    return float_codes(df.copy() if copy else df)
+
+
+def float_codes(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Replace nullable integer columns (e.g. Int8 interval codes) with float64.
+
+    The engines rely on NaN semantics (a comparison with a missing value
+    is False, diff/shift give NaN); pandas nullable dtypes propagate <NA>
+    instead, so they are converted once when the working frame is prepared.
+
+    Args:
+        df: Working frame
+
+    Returns:
+        DataFrame (the same object if there is nothing to convert; otherwise
+        a shallow copy, so the caller's frame is not modified)
+    """
+    nullable = [
+        col for col, dtype in df.dtypes.items()
+        if isinstance(dtype, pd.api.extensions.ExtensionDtype) and dtype.kind in 'iu'
+    ]
+    if not nullable:
+        return df
+    df = df.copy(deep=False)
+    for col in nullable:
+        df[col] = df[col].to_numpy(dtype='float64', na_value=np.nan)
+    return df
+
+
+def append_columns(df: pd.DataFrame, new_columns: Dict[str, object]) -> pd.DataFrame:
+    """
+    Add a batch of columns with a single concat.
+
+    Columns that already exist are replaced in place (on a shallow copy,
+    so the caller's frame is not modified); new columns are appended in
+    dict order, as one assignment per column would have done.
+
+    Args:
+        df: Working frame
+        new_columns: Column name -> Series (aligned with df, same row order)
+            or array of len(df)
+
+    Returns:
+        DataFrame with the columns added
+    """
+    if not new_columns:
+        return df
+
+    existing = [name for name in new_columns if name in df.columns]
+    if existing:
+        df = df.copy(deep=False)
+        for name in existing:
+            df[name] = _values(new_columns[name])
+
+    added = {name: _values(values) for name, values in new_columns.items() if name not in existing}
+    if not added:
+        return df
+
+    block = pd.DataFrame(added, index=df.index)
+    return pd.concat([df, block], axis=1, copy=False)
+
+
+def _values(values):
+    """Column values without their index (rows are already in frame order)."""
+    if isinstance(values, pd.Series):
+        return values.array
+    return values
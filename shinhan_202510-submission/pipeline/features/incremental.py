@@ -0,0 +1,193 @@
+"""Incremental Monthly Ingestion
+
+This module contains the IncrementalIngestor class for appending a new
+TA_YM slice to a persisted merchant-month panel and computing features
+only for the rows of that month.
+
+All per-merchant features in this package are backward-looking (lags,
+rolling windows, cumulative extrema, streaks), so appending a later month
+never changes the features of earlier rows. Only the new month's rows
+need to be computed, using the affected merchants' history as context.
+
+Panel and feature rows are stored as one file per month, so ingesting a
+month writes one new file and never rewrites history.
+"""
+
+import pandas as pd
+from pathlib import Path
+from typing import Callable, List, Optional
+
+from ..preprocessing.data_loader import DataLoader
+from ..preprocessing.feature_encoder import FeatureEncoder
+from ..preprocessing.schema import INTERVAL_COLUMNS
+from ..preprocessing.storage import FRAME_SUFFIX, read_frame, write_frame
+from .interval_patterns import IntervalPatternFeatureEngine
+
+
+class IncrementalIngestor:
+    """
+    Incremental monthly ingestion class.
+
+    Keeps two month-partitioned stores:
+    - panel: merged and preprocessed merchant-month rows
+    - features: output of feature_fn for each month
+    """
+
+    def __init__(
+        self,
+        store_dir: Path,
+        feature_fn: Optional[Callable[[pd.DataFrame], pd.DataFrame]] = None,
+        preprocess_fn: Optional[Callable[[pd.DataFrame], pd.DataFrame]] = None,
+        loader: Optional[DataLoader] = None,
+        context_months: Optional[int] = None,
+        merchant_col: str = 'ENCODED_MCT',
+        date_col: str = 'TA_YM'
+    ):
+        """
+        Initialize IncrementalIngestor.
+
+        Args:
+            store_dir: Directory holding the panel/ and features/ month files
+            feature_fn: Function that adds feature columns to a panel frame
+                (default: IntervalPatternFeatureEngine.create_all_interval_features)
+            preprocess_fn: Function applied to newly merged rows before they are
+                appended (default: encode the six-level interval columns)
+            loader: DataLoader used for merging and loading Dataset 1
+            context_months: Number of prior months read as context for the new
+                month. None reads the full history of the affected merchants,
+                which is required for identical cumulative features
+                (worst_ever, best_ever, months_since_best, streak counters).
+                12 is enough when feature_fn only uses windows/lags up to 12 months.
+            merchant_col: Column name for merchant ID
+            date_col: Column name for date (YYYYMM format)
+        """
+        self.store_dir = Path(store_dir)
+        self.panel_dir = self.store_dir / 'panel'
+        self.feature_dir = self.store_dir / 'features'
+        self.feature_fn = feature_fn or IntervalPatternFeatureEngine(merchant_col, date_col).create_all_interval_features
+        self.preprocess_fn = preprocess_fn or _encode_intervals
+        self.loader = loader or DataLoader()
+        self.context_months = context_months
+        self.merchant_col = merchant_col
+        self.date_col = date_col
+
+    def months(self) -> List[int]:
+        """
+        List the months currently stored in the panel.
+
+        Returns:
+            Sorted list of YYYYMM months
+        """
+        if not self.panel_dir.exists():
+            return []
+        return sorted(int(path.stem.split('=')[1]) for path in self.panel_dir.glob(f"ym=*{FRAME_SUFFIX}"))
+
+    def build(self, df_merged: pd.DataFrame) -> pd.DataFrame:
+        """
+        Full rebuild: preprocess and persist a merged panel, then compute features for all months.
+
+        Args:
+            df_merged: Merged panel from DataLoader.merge_datasets (all months)
+
+        Returns:
+            DataFrame with features for all rows
+        """
+        print(f"\nBuilding incremental store from {len(df_merged):,} rows...")
+
+        df_panel = self.preprocess_fn(df_merged)
+        df_features = self.feature_fn(df_panel)
+
+        for month, df_month in df_panel.groupby(self.date_col):
+            write_frame(df_month, self._month_path(self.panel_dir, month))
+        for month, df_month in df_features.groupby(self.date_col):
+            write_frame(df_month, self._month_path(self.feature_dir, month))
+
+        print(f"Stored {df_panel[self.date_col].nunique()} months in: {self.store_dir}")
+
+        return df_features
+
+    def ingest(
+        self,
+        df2_new: pd.DataFrame,
+        df3_new: pd.DataFrame,
+        df1: Optional[pd.DataFrame] = None
+    ) -> pd.DataFrame:
+        """
+        Append one new month and compute its features.
+
+        Args:
+            df2_new: Dataset 2 rows of the new month only
+            df3_new: Dataset 3 rows of the new month only
+            df1: Dataset 1 (merchant info, loaded if None)
+
+        Returns:
+            DataFrame with feature rows of the new month
+        """
+        new_months = pd.unique(pd.concat([df2_new[self.date_col], df3_new[self.date_col]]))
+        if len(new_months) != 1:
+            raise ValueError(f"Expected rows of exactly one {self.date_col}, got: {sorted(new_months)}")
+        new_month = int(new_months[0])
+
+        stored_months = self.months()
+        if stored_months and new_month <= stored_months[-1]:
+            raise ValueError(
+                f"{self.date_col}={new_month} is not after the last stored month ({stored_months[-1]})"
+            )
+
+        print("\n" + "="*60)
+        print(f"INCREMENTAL INGEST: {self.date_col}={new_month}")
+        print("="*60)
+
+        if df1 is None:
+            df1 = self.loader.load_dataset1()
+
+        df_new = self.loader.merge_datasets(df1, df2_new, df3_new)
+        df_new = self.preprocess_fn(df_new)
+
+        # Context: history of the merchants present in the new month
+        context_months = stored_months
+        if self.context_months is not None:
+            context_months = stored_months[-self.context_months:]
+        merchants = set(df_new[self.merchant_col])
+        history = [
+            df_month[df_month[self.merchant_col].isin(merchants)]
+            for df_month in (read_frame(self._month_path(self.panel_dir, m)) for m in context_months)
+        ]
+        df_context = pd.concat(history + [df_new], ignore_index=True)
+
+        print(f"\nContext: {len(context_months)} months, {len(merchants):,} merchants, {len(df_context):,} rows")
+
+        df_features = self.feature_fn(df_context)
+        df_features = df_features[df_features[self.date_col] == new_month]
+
+        write_frame(df_new, self._month_path(self.panel_dir, new_month))
+        write_frame(df_features, self._month_path(self.feature_dir, new_month))
+
+        print(f"Appended {len(df_features):,} feature rows for {self.date_col}={new_month}")
+
+        return df_features
+
+    def load_features(self, months: Optional[List[int]] = None) -> pd.DataFrame:
+        """
+        Load stored feature rows.
+
+        Args:
+            months: Months to load (None loads all)
+
+        Returns:
+            DataFrame with stored feature rows
+        """
+        months = months if months is not None else self.months()
+        frames = [read_frame(self._month_path(self.feature_dir, m)) for m in months]
+        return pd.concat(frames, ignore_index=True)
+
+    def _month_path(self, root: Path, month: int) -> Path:
+        """Return the file path of one month partition."""
+        return root / f"ym={int(month)}{FRAME_SUFFIX}"
+
+
+def _encode_intervals(df: pd.DataFrame) -> pd.DataFrame:
+    """Default preprocessing: encode the six-level interval columns present in df."""
+    columns = [col for col in INTERVAL_COLUMNS if col in df.columns and df[col].dtype == 'object']
+    df_encoded, _ = FeatureEncoder().encode_all_interval_columns(df, columns=columns)
+    return df_encoded
@@ -18,6 +18,9 @@ import pandas as pd
 import numpy as np
 from typing import List, Optional
 
+from .frame import append_columns, sort_panel, working_frame
+from .streaks import counts_since_reset, first_in_group, streak_lengths
+
 
 class IntervalPatternFeatureEngine:
     """
@@ -31,16 +34,19 @@ class IntervalPatternFeatureEngine:
     - Cross-metric interval analysis
     """
 
-    def __init__(self, merchant_col: str = 'ENCODED_MCT', date_col: str = 'TA_YM'):
+    def __init__(self, merchant_col: str = 'ENCODED_MCT', date_col: str = 'TA_YM', copy: bool = True):
         """
         Initialize IntervalPatternFeatureEngine.
 
         Args:
             merchant_col: Column name for merchant ID
             date_col: Column name for date (YYYYMM format)
+            copy: If False, work on the input frame without copying it
+                (already sorted frames are not re-sorted; see frame.py)
         """
         self.merchant_col = merchant_col
         self.date_col = date_col
+        self.copy = copy
 
     def create_interval_decline_features(
         self,
@@ -69,10 +75,10 @@ class IntervalPatternFeatureEngine:
         print(f"Columns: {len(interval_columns)}")
         print(f"Windows: {windows}")
 
-        df_result = df.copy()
-
         # Sort by merchant and date
-        df_result = df_result.sort_values([self.merchant_col, self.date_col])
+        df_result = sort_panel(df, self.merchant_col, self.date_col, self.copy)
+        grouped = df_result.groupby(self.merchant_col, observed=True)
+        new_columns = {}
 
         features_created = 0
 
@@ -83,25 +89,25 @@ class IntervalPatternFeatureEngine:
 
             # 1. Month-over-month interval change (positive = decline, negative = improvement)
             interval_change_col = f"{col}_interval_change"
-            df_result[interval_change_col] = df_result.groupby(self.merchant_col)[col].diff()
+            new_columns[interval_change_col] = grouped[col].diff()
             features_created += 1
 
             # 2. Decline flag (interval increased = worse)
             decline_flag_col = f"{col}_is_declining"
-            df_result[decline_flag_col] = (df_result[interval_change_col] > 0).astype(int)
+            new_columns[decline_flag_col] = (new_columns[interval_change_col] > 0).astype(int)
             features_created += 1
 
             # 3. Consecutive decline count
             consecutive_decline_col = f"{col}_consecutive_declines"
-            df_result[consecutive_decline_col] = df_result.groupby(self.merchant_col)[decline_flag_col].apply(
-                lambda x: x * (x.groupby((x != x.shift()).cumsum()).cumcount() + 1)
-            ).reset_index(level=0, drop=True)
+            new_columns[consecutive_decline_col] = streak_lengths(new_columns[decline_flag_col], df_result[self.merchant_col])
             features_created += 1
 
             # 4. Decline count within windows
             for window in windows:
                 decline_count_col = f"{col}_decline_count_{window}m"
-                df_result[decline_count_col] = df_result.groupby(self.merchant_col)[decline_flag_col].transform(
+                new_columns[decline_count_col] = new_columns[decline_flag_col].groupby(
+                    df_result[self.merchant_col], observed=True
+                ).transform(
                     lambda x: x.rolling(window=window, min_periods=1).sum()
                 )
                 features_created += 1
@@ -109,16 +115,18 @@ class IntervalPatternFeatureEngine:
             # 5. Total interval decline from N months ago
             for window in [3, 6, 12]:
                 total_decline_col = f"{col}_total_decline_{window}m"
-                df_result[total_decline_col] = df_result.groupby(self.merchant_col)[col].diff(periods=window)
+                new_columns[total_decline_col] = grouped[col].diff(periods=window)
                 features_created += 1
 
             # 6. Decline speed (average interval decline per month)
             for window in [3, 6]:
                 decline_speed_col = f"{col}_decline_speed_{window}m"
-                total_decline = df_result.groupby(self.merchant_col)[col].diff(periods=window)
-                df_result[decline_speed_col] = total_decline / window
+                total_decline = grouped[col].diff(periods=window)
+                new_columns[decline_speed_col] = total_decline / window
                 features_created += 1
 
+        df_result = append_columns(df_result, new_columns)
+
         print(f"Created {features_created} interval decline features")
 
         return df_result
@@ -147,10 +155,10 @@ class IntervalPatternFeatureEngine:
         print(f"\nCreating historical worst features...")
         print(f"Columns: {len(interval_columns)}")
 
-        df_result = df.copy()
-
         # Sort by merchant and date
-        df_result = df_result.sort_values([self.merchant_col, self.date_col])
+        df_result = sort_panel(df, self.merchant_col, self.date_col, self.copy)
+        grouped = df_result.groupby(self.merchant_col, observed=True)
+        new_columns = {}
 
         features_created = 0
 
@@ -161,47 +169,37 @@ class IntervalPatternFeatureEngine:
 
             # 1. Worst interval ever (maximum value = worst performance)
             worst_ever_col = f"{col}_worst_ever"
-            df_result[worst_ever_col] = df_result.groupby(self.merchant_col)[col].cummax()
+            new_columns[worst_ever_col] = grouped[col].cummax()
             features_created += 1
 
             # 2. Best interval ever (minimum value = best performance)
             best_ever_col = f"{col}_best_ever"
-            df_result[best_ever_col] = df_result.groupby(self.merchant_col)[col].cummin()
+            new_columns[best_ever_col] = grouped[col].cummin()
             features_created += 1
 
             # 3. Is at worst now (boolean)
             at_worst_col = f"{col}_at_worst_now"
-            df_result[at_worst_col] = (df_result[col] == df_result[worst_ever_col]).astype(int)
+            new_columns[at_worst_col] = (df_result[col] == new_columns[worst_ever_col]).astype(int)
             features_created += 1
 
             # 4. Distance from best
             distance_from_best_col = f"{col}_distance_from_best"
-            df_result[distance_from_best_col] = df_result[col] - df_result[best_ever_col]
+            new_columns[distance_from_best_col] = df_result[col] - new_columns[best_ever_col]
             features_created += 1
 
             # 5. Months since best performance
-            def months_since_best(group):
-                """Calculate months since best interval."""
-                result = pd.Series(index=group.index, dtype=float)
-                best_val = group[best_ever_col].iloc[0]
-                months_counter = 0
-
-                for idx in group.index:
-                    current_val = group.loc[idx, col]
-                    if current_val == best_val:
-                        months_counter = 0
-                    else:
-                        months_counter += 1
-                    result.loc[idx] = months_counter
-
-                return result
-
+            # Counter resets when the value equals the merchant's first best_ever value
+            # (its first observation) and increases by 1 every other month
+            best_val = first_in_group(new_columns[best_ever_col], df_result[self.merchant_col])
             months_since_best_col = f"{col}_months_since_best"
-            df_result[months_since_best_col] = df_result.groupby(self.merchant_col).apply(
-                months_since_best
-            ).reset_index(level=0, drop=True)
+            new_columns[months_since_best_col] = counts_since_reset(
+                df_result[col].to_numpy(dtype='float64', na_value=np.nan) == best_val,
+                df_result[self.merchant_col]
+            )
             features_created += 1
 
+        df_result = append_columns(df_result, new_columns)
+
         print(f"Created {features_created} historical worst features")
 
         return df_result
@@ -230,10 +228,10 @@ class IntervalPatternFeatureEngine:
         print(f"\nCreating recovery indicators...")
         print(f"Columns: {len(interval_columns)}")
 
-        df_result = df.copy()
-
         # Sort by merchant and date
-        df_result = df_result.sort_values([self.merchant_col, self.date_col])
+        df_result = sort_panel(df, self.merchant_col, self.date_col, self.copy)
+        grouped = df_result.groupby(self.merchant_col, observed=True)
+        new_columns = {}
 
         features_created = 0
 
@@ -246,30 +244,28 @@ class IntervalPatternFeatureEngine:
 
             # 1. Recovery flag (negative change = improvement)
             recovery_flag_col = f"{col}_is_recovering"
-            df_result[recovery_flag_col] = (df_result[interval_change_col] < 0).astype(int)
+            new_columns[recovery_flag_col] = (df_result[interval_change_col] < 0).astype(int)
             features_created += 1
 
             # 2. Consecutive recovery count
             consecutive_recovery_col = f"{col}_consecutive_recovery"
-            df_result[consecutive_recovery_col] = df_result.groupby(self.merchant_col)[recovery_flag_col].apply(
-                lambda x: x * (x.groupby((x != x.shift()).cumsum()).cumcount() + 1)
-            ).reset_index(level=0, drop=True)
+            new_columns[consecutive_recovery_col] = streak_lengths(new_columns[recovery_flag_col], df_result[self.merchant_col])
             features_created += 1
 
             # 3. Recovery after decline pattern (decline -> improvement)
             decline_flag_col = f"{col}_is_declining"
             if decline_flag_col in df_result.columns:
                 recovery_after_decline_col = f"{col}_recovery_after_decline"
-                prev_decline = df_result.groupby(self.merchant_col)[decline_flag_col].shift(1)
-                df_result[recovery_after_decline_col] = (
-                    (prev_decline == 1) & (df_result[recovery_flag_col] == 1)
+                prev_decline = grouped[decline_flag_col].shift(1)
+                new_columns[recovery_after_decline_col] = (
+                    (prev_decline == 1) & (new_columns[recovery_flag_col] == 1)
                 ).astype(int)
                 features_created += 1
 
             # 4. Interval volatility (frequent ups and downs = instability)
             for window in [3, 6]:
                 volatility_col = f"{col}_interval_volatility_{window}m"
-                df_result[volatility_col] = df_result.groupby(self.merchant_col)[interval_change_col].transform(
+                new_columns[volatility_col] = grouped[interval_change_col].transform(
                     lambda x: x.rolling(window=window, min_periods=1).std()
                 )
                 features_created += 1
@@ -279,22 +275,19 @@ class IntervalPatternFeatureEngine:
                 direction_change_col = f"{col}_direction_changes_{window}m"
                 # Calculate sign change (direction reversal)
                 current_change = df_result[interval_change_col]
-                prev_change = df_result.groupby(self.merchant_col)[interval_change_col].shift(1)
+                prev_change = grouped[interval_change_col].shift(1)
                 sign_change = (current_change * prev_change < 0).astype(int)
 
-                # Store as temporary column to use in rolling
-                temp_col = f"_temp_sign_change_{col}"
-                df_result[temp_col] = sign_change
-
                 # Calculate rolling sum
-                df_result[direction_change_col] = df_result.groupby(self.merchant_col)[temp_col].transform(
+                new_columns[direction_change_col] = sign_change.groupby(
+                    df_result[self.merchant_col], observed=True
+                ).transform(
                     lambda x: x.rolling(window=window, min_periods=1).sum()
                 )
-
-                # Drop temporary column
-                df_result.drop(columns=[temp_col], inplace=True)
                 features_created += 1
 
+        df_result = append_columns(df_result, new_columns)
+
         print(f"Created {features_created} recovery indicator features")
 
         return df_result
@@ -324,7 +317,8 @@ class IntervalPatternFeatureEngine:
         print(f"Primary: {primary_col}")
         print(f"Secondary: {secondary_cols}")
 
-        df_result = df.copy()
+        df_result = working_frame(df, self.copy)
+        new_columns = {}
 
         features_created = 0
 
@@ -343,7 +337,7 @@ class IntervalPatternFeatureEngine:
 
             # 1. Divergence: primary declining but secondary stable/improving
             divergence_col = f"divergence_{primary_col}_vs_{sec_col}"
-            df_result[divergence_col] = (
+            new_columns[divergence_col] = (
                 (df_result[primary_change_col] > 0) &  # Sales declining
                 (df_result[sec_change_col] <= 0)        # Customer stable/improving
             ).astype(int)
@@ -351,7 +345,7 @@ class IntervalPatternFeatureEngine:
 
             # 2. Aligned decline (both declining = critical)
             aligned_decline_col = f"aligned_decline_{primary_col}_{sec_col}"
-            df_result[aligned_decline_col] = (
+            new_columns[aligned_decline_col] = (
                 (df_result[primary_change_col] > 0) &
                 (df_result[sec_change_col] > 0)
             ).astype(int)
@@ -359,11 +353,13 @@ class IntervalPatternFeatureEngine:
 
             # 3. Divergence magnitude
             divergence_magnitude_col = f"divergence_magnitude_{primary_col}_{sec_col}"
-            df_result[divergence_magnitude_col] = (
+            new_columns[divergence_magnitude_col] = (
                 df_result[primary_change_col] - df_result[sec_change_col]
             )
             features_created += 1
 
+        df_result = append_columns(df_result, new_columns)
+
         print(f"Created {features_created} cross-metric interval features")
 
         return df_result
@@ -0,0 +1,427 @@
+"""Online Per-Merchant Feature State
+
+This module contains the OnlineFeatureEngine class, which keeps a small
+state per merchant and computes the features of a new month from that
+state alone, without reading the merchant's history.
+
+All features covered here only look back a fixed number of rows or keep
+a running aggregate, so the state per merchant is:
+- the last `depth` values of every tracked column (newest first)
+- running worst/best (cummax/cummin) and the first observed value
+- decline / recovery streak counters and the months-since-best counter
+
+update() produces the same values as
+- IntervalPatternFeatureEngine.create_all_interval_features (interval columns)
+- TimeSeriesFeatureEngine lag / moving average / std / cv features (columns)
+computed on the full history, for the rows of the new month.
+
+Example:
+    online = OnlineFeatureEngine(columns=['RC_M1_SAA'])
+    online.fit(df_history)
+    online.save('store/online_state.parquet')
+    ...
+    online = OnlineFeatureEngine(columns=['RC_M1_SAA']).load('store/online_state.parquet')
+    df_month_features = online.update(df_new_month)
+"""
+
+import contextlib
+import io
+from pathlib import Path
+from typing import Dict, List, Sequence
+
+import numpy as np
+import pandas as pd
+
+from ..preprocessing.storage import read_frame, write_frame
+from .frame import float_codes
+from .interval_patterns import IntervalPatternFeatureEngine
+from .planner import INTERVAL_COLUMNS
+
+
+# Fixed windows used by the interval pattern engine
+TOTAL_DECLINE_WINDOWS = [3, 6, 12]
+DECLINE_SPEED_WINDOWS = [3, 6]
+RECOVERY_WINDOWS = [3, 6]
+
+# Per-merchant counters kept for each interval column
+COUNTERS = ['worst', 'best', 'first', 'decline_streak', 'recovery_streak', 'since_best']
+
+
+class OnlineFeatureEngine:
+    """
+    Stateful monthly feature engine.
+
+    Attributes:
+        interval_columns: Columns that get interval pattern features
+        columns: Columns that get lag / moving average / volatility features
+        depth: Number of past values kept per merchant and column
+    """
+
+    def __init__(
+        self,
+        interval_columns: Sequence[str] = INTERVAL_COLUMNS,
+        columns: Sequence[str] = (),
+        lags: List[int] = [1, 3, 6, 12],
+        windows: List[int] = [3, 6, 12],
+        decline_windows: List[int] = [3, 6, 12],
+        merchant_col: str = 'ENCODED_MCT',
+        date_col: str = 'TA_YM'
+    ):
+        """
+        Initialize OnlineFeatureEngine.
+
+        Args:
+            interval_columns: Encoded interval columns (interval pattern features)
+            columns: Columns for lag / moving average / std / cv features
+            lags: Lag periods (in months)
+            windows: Moving average / volatility windows (in months)
+            decline_windows: Decline count windows (in months)
+            merchant_col: Column name for merchant ID
+            date_col: Column name for date (YYYYMM format)
+        """
+        self.interval_columns = list(interval_columns)
+        self.columns = list(columns)
+        self.lags = list(lags)
+        self.windows = list(windows)
+        self.decline_windows = list(decline_windows)
+        self.merchant_col = merchant_col
+        self.date_col = date_col
+
+        # Values needed: current row plus the rows each feature looks back on
+        # (a change k rows back needs the value k + 1 rows back)
+        lookback = [0]
+        if self.interval_columns:
+            lookback += [w for w in self.decline_windows]
+            lookback += TOTAL_DECLINE_WINDOWS + DECLINE_SPEED_WINDOWS
+            lookback += [w + 1 for w in RECOVERY_WINDOWS]
+        if self.columns:
+            lookback += self.lags + [w - 1 for w in self.windows]
+        self.depth = max(lookback) + 1
+
+        self.tracked_columns = list(dict.fromkeys(self.interval_columns + self.columns))
+        self.reset()
+
+    def reset(self) -> None:
+        """Clear all merchant state."""
+        self.merchants = pd.Index([], name=self.merchant_col)
+        self.last_month = np.zeros(0, dtype=np.int64)
+        self.values = {col: np.empty((0, self.depth)) for col in self.tracked_columns}
+        self.counters = {
+            col: {name: np.empty(0) for name in COUNTERS}
+            for col in self.interval_columns
+        }
+
+    def fit(self, df: pd.DataFrame) -> 'OnlineFeatureEngine':
+        """
+        Build the state from a full history (replayed month by month).
+
+        Args:
+            df: Long DataFrame with all months (interval columns encoded)
+
+        Returns:
+            self
+        """
+        print(f"\nBuilding online feature state from {len(df):,} rows...")
+
+        self.reset()
+        for _, df_month in df.groupby(self.date_col, sort=True):
+            self._advance(df_month)
+
+        print(f"State: {len(self.merchants):,} merchants, depth {self.depth}")
+
+        return self
+
+    def update(self, df_month: pd.DataFrame) -> pd.DataFrame:
+        """
+        Add one month to the state and compute its features.
+
+        Args:
+            df_month: Rows of one new month (at most one row per merchant)
+
+        Returns:
+            df_month with the feature columns added
+        """
+        print(f"\nUpdating online features: {len(df_month):,} rows")
+
+        df_result = self._advance(df_month)
+
+        print(f"Created {df_result.shape[1] - df_month.shape[1]} online features")
+
+        return df_result
+
+    def _advance(self, df_month: pd.DataFrame) -> pd.DataFrame:
+        """Update the state with one month and return the month's features."""
+        months = pd.unique(df_month[self.date_col])
+        if len(months) != 1:
+            raise ValueError(f"Expected rows of exactly one {self.date_col}, got: {sorted(months)}")
+        month = int(months[0])
+
+        merchant_ids = df_month[self.merchant_col]
+        if merchant_ids.isna().any():
+            raise ValueError(f"Rows without {self.merchant_col} cannot be tracked")
+        if merchant_ids.duplicated().any():
+            raise ValueError(f"Duplicate {self.merchant_col} rows in {self.date_col}={month}")
+
+        rows = self._state_rows(merchant_ids)
+        stale = self.last_month[rows] >= month
+        if stale.any():
+            raise ValueError(
+                f"{self.date_col}={month} is not after the last month of {int(stale.sum())} merchants"
+            )
+        is_new = self.last_month[rows] == 0
+
+        new_columns = {}
+        history = {}
+        dtypes = {}
+        for col in self.tracked_columns:
+            if col not in df_month.columns:
+                raise KeyError(f"Column '{col}' not found")
+            dtypes[col] = _batch_dtypes(df_month[col].dtype)
+            current = df_month[col].to_numpy(dtype='float64', na_value=np.nan)
+            # history[col][:, k] = value k rows back (NaN before the first row)
+            history[col] = np.column_stack([current, self.values[col][rows, :-1]])
+
+        for col in self.interval_columns:
+            new_columns.update(self._decline_features(col, history[col], rows, dtypes[col]))
+        for col in self.interval_columns:
+            new_columns.update(self._worst_features(col, history[col], rows, is_new, dtypes[col]))
+        for col in self.interval_columns:
+            new_columns.update(self._recovery_features(col, history[col], rows))
+
+        # Commit the new month to the state
+        for col in self.tracked_columns:
+            self.values[col][rows] = history[col]
+        self.last_month[rows] = month
+
+        df_result = df_month.assign(**new_columns)
+
+        # Cross-metric features only use the row's own interval changes
+        if len(self.interval_columns) > 1:
+            with contextlib.redirect_stdout(io.StringIO()):
+                df_result = IntervalPatternFeatureEngine(self.merchant_col, self.date_col, copy=False) \
+                    .create_cross_metric_interval_features(
+                        df_result,
+                        primary_col=self.interval_columns[0],
+                        secondary_cols=self.interval_columns[1:]
+                    )
+
+        if self.columns:
+            df_result = df_result.assign(**self._time_series_features(history, dtypes))
+
+        return df_result
+
+    def _state_rows(self, merchant_ids: pd.Series) -> np.ndarray:
+        """State row of each merchant, adding empty state for new merchants."""
+        rows = self.merchants.get_indexer(merchant_ids)
+        unseen = rows < 0
+        if unseen.any():
+            n_new = int(unseen.sum())
+            self.merchants = self.merchants.append(pd.Index(merchant_ids[unseen].to_numpy(), name=self.merchant_col))
+            self.last_month = np.concatenate([self.last_month, np.zeros(n_new, dtype=np.int64)])
+            for col in self.tracked_columns:
+                self.values[col] = np.vstack([self.values[col], np.full((n_new, self.depth), np.nan)])
+            for col in self.interval_columns:
+                for name, array in self.counters[col].items():
+                    start = np.nan if name in ('worst', 'best', 'first') else 0.0
+                    self.counters[col][name] = np.concatenate([array, np.full(n_new, start)])
+            rows = self.merchants.get_indexer(merchant_ids)
+        return rows
+
+    def _decline_features(self, col: str, h: np.ndarray, rows: np.ndarray, dtypes: Dict[str, np.dtype]) -> Dict[str, np.ndarray]:
+        """Features of IntervalPatternFeatureEngine.create_interval_decline_features."""
+        change = _changes(h)
+        is_declining = change[:, 0] > 0
+
+        streak = np.where(is_declining, self.counters[col]['decline_streak'][rows] + 1, 0)
+        self.counters[col]['decline_streak'][rows] = streak
+
+        features = {
+            f"{col}_interval_change": _cast(change[:, 0], dtypes['change']),
+            f"{col}_is_declining": is_declining.astype(int),
+            f"{col}_consecutive_declines": streak.astype(np.int64),
+        }
+        for window in self.decline_windows:
+            features[f"{col}_decline_count_{window}m"] = (change[:, :window] > 0).sum(axis=1).astype('float64')
+        for window in TOTAL_DECLINE_WINDOWS:
+            features[f"{col}_total_decline_{window}m"] = _cast(h[:, 0] - h[:, window], dtypes['change'])
+        for window in DECLINE_SPEED_WINDOWS:
+            features[f"{col}_decline_speed_{window}m"] = _cast((h[:, 0] - h[:, window]) / window, dtypes['change'])
+        return features
+
+    def _worst_features(
+        self,
+        col: str,
+        h: np.ndarray,
+        rows: np.ndarray,
+        is_new: np.ndarray,
+        dtypes: Dict[str, np.dtype]
+    ) -> Dict[str, np.ndarray]:
+        """Features of IntervalPatternFeatureEngine.create_historical_worst_features."""
+        counters = self.counters[col]
+        current = h[:, 0]
+        observed = ~np.isnan(current)
+
+        # cummax / cummin skip missing values (the running extremum is kept)
+        with np.errstate(invalid='ignore'):
+            worst = np.fmax(counters['worst'][rows], current)
+            best = np.fmin(counters['best'][rows], current)
+        counters['worst'][rows] = worst
+        counters['best'][rows] = best
+
+        first = np.where(is_new, current, counters['first'][rows])
+        counters['first'][rows] = first
+        since_best = np.where(current == first, 0.0, counters['since_best'][rows] + 1)
+        counters['since_best'][rows] = since_best
+
+        worst_ever = np.where(observed, worst, np.nan)
+        best_ever = np.where(observed, best, np.nan)
+        return {
+            f"{col}_worst_ever": _cast(worst_ever, dtypes['extreme']),
+            f"{col}_best_ever": _cast(best_ever, dtypes['extreme']),
+            f"{col}_at_worst_now": (current == worst_ever).astype(int),
+            f"{col}_distance_from_best": _cast(current - best_ever, dtypes['extreme']),
+            f"{col}_months_since_best": since_best,
+        }
+
+    def _recovery_features(self, col: str, h: np.ndarray, rows: np.ndarray) -> Dict[str, np.ndarray]:
+        """Features of IntervalPatternFeatureEngine.create_recovery_indicators."""
+        change = _changes(h)
+        is_recovering = change[:, 0] < 0
+
+        streak = np.where(is_recovering, self.counters[col]['recovery_streak'][rows] + 1, 0)
+        self.counters[col]['recovery_streak'][rows] = streak
+
+        features = {
+            f"{col}_is_recovering": is_recovering.astype(int),
+            f"{col}_consecutive_recovery": streak.astype(np.int64),
+            f"{col}_recovery_after_decline": ((change[:, 1] > 0) & is_recovering).astype(int),
+        }
+        for window in RECOVERY_WINDOWS:
+            features[f"{col}_interval_volatility_{window}m"] = _window_std(change[:, :window])
+        for window in RECOVERY_WINDOWS:
+            with np.errstate(invalid='ignore'):
+                sign_change = change[:, :window] * change[:, 1:window + 1] < 0
+            features[f"{col}_direction_changes_{window}m"] = sign_change.sum(axis=1).astype('float64')
+        return features
+
+    def _time_series_features(
+        self,
+        history: Dict[str, np.ndarray],
+        dtypes: Dict[str, Dict[str, np.dtype]]
+    ) -> Dict[str, np.ndarray]:
+        """Lag, moving average, std and cv features of TimeSeriesFeatureEngine."""
+        features = {}
+        for col in self.columns:
+            for lag in self.lags:
+                features[f"{col}_lag_{lag}m"] = _cast(history[col][:, lag], dtypes[col]['lag'])
+        for col in self.columns:
+            for window in self.windows:
+                features[f"{col}_ma_{window}m"] = _window_mean(history[col][:, :window])
+        for col in self.columns:
+            for window in self.windows:
+                mean = _window_mean(history[col][:, :window])
+                std = _window_std(history[col][:, :window])
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    cv = std / np.where(mean == 0, np.nan, mean)
+                cv[np.isinf(cv)] = np.nan
+                features[f"{col}_std_{window}m"] = std
+                features[f"{col}_cv_{window}m"] = cv
+        return features
+
+    def state_frame(self) -> pd.DataFrame:
+        """
+        Merchant state as a flat DataFrame (one row per merchant).
+
+        Returns:
+            DataFrame with merchant ID, last month, past values and counters
+        """
+        columns = {self.merchant_col: self.merchants.to_numpy(), 'last_month': self.last_month}
+        for col in self.tracked_columns:
+            for k in range(self.depth):
+                columns[f"{col}__value_{k}"] = self.values[col][:, k]
+        for col in self.interval_columns:
+            for name in COUNTERS:
+                columns[f"{col}__{name}"] = self.counters[col][name]
+        return pd.DataFrame(columns)
+
+    def save(self, path: Path) -> Path:
+        """
+        Persist the merchant state.
+
+        Args:
+            path: Output file path (.parquet or .pkl)
+
+        Returns:
+            Saved file path
+        """
+        path = write_frame(self.state_frame(), Path(path))
+        print(f"Saved online state ({len(self.merchants):,} merchants) to: {path}")
+        return path
+
+    def load(self, path: Path) -> 'OnlineFeatureEngine':
+        """
+        Load merchant state saved with the same configuration.
+
+        Args:
+            path: State file path
+
+        Returns:
+            self
+        """
+        state = read_frame(Path(path))
+        expected = self.state_frame().columns
+        missing = [col for col in expected if col not in state.columns]
+        if missing:
+            raise ValueError(f"State file does not match this configuration, missing: {missing[:5]}")
+
+        self.merchants = pd.Index(state[self.merchant_col].to_numpy(), name=self.merchant_col)
+        self.last_month = state['last_month'].to_numpy(dtype=np.int64)
+        for col in self.tracked_columns:
+            self.values[col] = state[[f"{col}__value_{k}" for k in range(self.depth)]].to_numpy(dtype='float64')
+        for col in self.interval_columns:
+            for name in COUNTERS:
+                self.counters[col][name] = state[f"{col}__{name}"].to_numpy(dtype='float64')
+
+        print(f"Loaded online state ({len(self.merchants):,} merchants) from: {path}")
+
+        return self
+
+
+def _batch_dtypes(dtype) -> Dict[str, np.dtype]:
+    """dtypes the batch engines produce from a source column of this dtype."""
+    # The batch engines see nullable integer codes as float64 (float_codes)
+    sample = float_codes(pd.DataFrame({'sample': pd.Series([1, 2], dtype=dtype)}))['sample']
+    return {
+        'change': sample.diff().dtype,
+        'extreme': sample.cummax().dtype,
+        'lag': sample.shift(1).dtype,
+    }
+
+
+def _cast(values: np.ndarray, dtype: np.dtype) -> np.ndarray:
+    """Cast float64 results to the batch dtype (kept as float if NaN cannot be held)."""
+    if not np.issubdtype(dtype, np.floating) and np.isnan(values).any():
+        return values
+    return values.astype(dtype)
+
+
+def _changes(h: np.ndarray) -> np.ndarray:
+    """Month-over-month changes: change[:, k] = value k rows back - value k + 1 rows back."""
+    return h[:, :-1] - h[:, 1:]
+
+
+def _window_mean(values: np.ndarray) -> np.ndarray:
+    """Row-wise mean of the observed values (NaN if none, like rolling min_periods=1)."""
+    count = (~np.isnan(values)).sum(axis=1)
+    total = np.nansum(values, axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(count > 0, total / count, np.nan)
+
+
+def _window_std(values: np.ndarray) -> np.ndarray:
+    """Row-wise sample std (ddof=1) of the observed values (NaN below 2 values)."""
+    count = (~np.isnan(values)).sum(axis=1)
+    mean = _window_mean(values)
+    squares = np.nansum((values - mean[:, None]) ** 2, axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(count > 1, np.sqrt(squares / (count - 1)), np.nan)
@@ -0,0 +1,288 @@
+"""Merchant x Month Panel
+
+This module contains the MerchantPanel class, a dense
+(n_merchants, n_months, n_columns) NumPy representation of the merged
+merchant-month frame.
+
+The month axis is a full calendar grid from the first to the last TA_YM,
+so months missing for a merchant are explicit NaN cells (tracked by the
+`present` mask) instead of absent rows. Per-merchant time-series
+operations become axis-1 array operations without sorting or groupby.
+
+Note: on the calendar grid a shift of k is always k calendar months,
+whereas groupby().shift(k) on the long frame shifts by k rows. The two
+agree whenever a merchant has no gaps in its history.
+"""
+
+import json
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import List, Optional
+
+
+class MerchantPanel:
+    """
+    Dense merchant x month x column panel.
+
+    Attributes:
+        values: Array of shape (n_merchants, n_months, n_columns)
+        present: Boolean array of shape (n_merchants, n_months), True where
+            the long frame had a row
+        merchants: Merchant IDs (sorted), one per axis-0 entry
+        months: YYYYMM months (consecutive calendar months), one per axis-1 entry
+        columns: Column names, one per axis-2 entry
+    """
+
+    def __init__(
+        self,
+        values: np.ndarray,
+        present: np.ndarray,
+        merchants: np.ndarray,
+        months: np.ndarray,
+        columns: List[str],
+        merchant_col: str = 'ENCODED_MCT',
+        date_col: str = 'TA_YM'
+    ):
+        """
+        Initialize MerchantPanel.
+
+        Args:
+            values: Array of shape (n_merchants, n_months, n_columns)
+            present: Boolean array of shape (n_merchants, n_months)
+            merchants: Merchant IDs
+            months: YYYYMM months
+            columns: Column names
+            merchant_col: Column name for merchant ID
+            date_col: Column name for date (YYYYMM format)
+        """
+        if values.shape != (len(merchants), len(months), len(columns)):
+            raise ValueError(
+                f"values shape {values.shape} does not match "
+                f"({len(merchants)}, {len(months)}, {len(columns)})"
+            )
+        if present.shape != values.shape[:2]:
+            raise ValueError(f"present shape {present.shape} does not match {values.shape[:2]}")
+
+        self.values = values
+        self.present = present
+        self.merchants = np.asarray(merchants)
+        self.months = np.asarray(months)
+        self.columns = list(columns)
+        self.merchant_col = merchant_col
+        self.date_col = date_col
+        self._column_index = {col: i for i, col in enumerate(self.columns)}
+
+    @classmethod
+    def from_frame(
+        cls,
+        df: pd.DataFrame,
+        columns: Optional[List[str]] = None,
+        dtype: str = 'float64',
+        merchant_col: str = 'ENCODED_MCT',
+        date_col: str = 'TA_YM'
+    ) -> 'MerchantPanel':
+        """
+        Pivot a long merchant-month frame into a dense panel.
+
+        Args:
+            df: Long DataFrame with one row per (merchant, month)
+            columns: Numeric columns to include (default: all numeric columns
+                except the date column)
+            dtype: Value dtype of the panel (missing cells are NaN)
+            merchant_col: Column name for merchant ID
+            date_col: Column name for date (YYYYMM format)
+
+        Returns:
+            MerchantPanel instance
+        """
+        if columns is None:
+            columns = [
+                col for col in df.select_dtypes(include=[np.number, 'bool']).columns
+                if col != date_col
+            ]
+
+        # Rows without a merchant ID have no panel slot (factorize would give them code -1)
+        if df[merchant_col].isna().any():
+            raise ValueError(f"Rows without {merchant_col} cannot be placed in the panel")
+
+        merchant_codes, merchants = pd.factorize(df[merchant_col], sort=True)
+        merchants = np.asarray(merchants)
+
+        ym = df[date_col].to_numpy(dtype='int64')
+        month_ordinal = (ym // 100) * 12 + (ym % 100 - 1)
+        first, last = month_ordinal.min(), month_ordinal.max()
+        grid = np.arange(first, last + 1)
+        months = (grid // 12) * 100 + grid % 12 + 1
+        month_codes = month_ordinal - first
+
+        n_merchants, n_months = len(merchants), len(months)
+
+        flat_index = merchant_codes * n_months + month_codes
+        if len(np.unique(flat_index)) != len(flat_index):
+            raise ValueError(f"Duplicate ({merchant_col}, {date_col}) rows in input frame")
+
+        values = np.full((n_merchants * n_months, len(columns)), np.nan, dtype=dtype)
+        values[flat_index] = df[columns].to_numpy(dtype=dtype, na_value=np.nan)
+
+        present = np.zeros(n_merchants * n_months, dtype=bool)
+        present[flat_index] = True
+
+        print(f"Panel: {n_merchants:,} merchants x {n_months} months x {len(columns)} columns "
+              f"({present.mean():.1%} cells present)")
+
+        return cls(
+            values.reshape(n_merchants, n_months, len(columns)),
+            present.reshape(n_merchants, n_months),
+            merchants,
+            months,
+            columns,
+            merchant_col,
+            date_col
+        )
+
+    @property
+    def shape(self):
+        """Shape of the value array (n_merchants, n_months, n_columns)."""
+        return self.values.shape
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        Get one column as a (n_merchants, n_months) view.
+
+        Args:
+            name: Column name
+
+        Returns:
+            2-D view into the panel values
+        """
+        return self.values[:, :, self._column_index[name]]
+
+    def shift(self, name: str, periods: int = 1) -> np.ndarray:
+        """
+        Shift one column along the month axis (calendar-month lag).
+
+        Args:
+            name: Column name
+            periods: Number of months to shift (positive = values from the past)
+
+        Returns:
+            (n_merchants, n_months) array with NaN where no source month exists
+        """
+        values = self.column(name)
+        shifted = np.full(values.shape, np.nan, dtype=values.dtype)
+        if periods > 0:
+            shifted[:, periods:] = values[:, :-periods]
+        elif periods < 0:
+            shifted[:, :periods] = values[:, -periods:]
+        else:
+            shifted[:] = values
+        return shifted
+
+    def add_columns(self, new_values: dict) -> 'MerchantPanel':
+        """
+        Return a new panel with additional columns.
+
+        Args:
+            new_values: Dict of column name -> (n_merchants, n_months) array
+
+        Returns:
+            New MerchantPanel (values are copied into one contiguous array)
+        """
+        names = list(new_values)
+        stacked = np.stack([np.asarray(new_values[name], dtype=self.values.dtype) for name in names], axis=2)
+        return MerchantPanel(
+            np.concatenate([self.values, stacked], axis=2),
+            self.present,
+            self.merchants,
+            self.months,
+            self.columns + names,
+            self.merchant_col,
+            self.date_col
+        )
+
+    def to_long(
+        self,
+        columns: Optional[List[str]] = None,
+        include_missing: bool = False
+    ) -> pd.DataFrame:
+        """
+        Convert the panel back to a long frame sorted by merchant and date.
+
+        Args:
+            columns: Columns to include (default: all)
+            include_missing: Also emit rows for months absent from the input
+
+        Returns:
+            Long DataFrame with merchant, date and value columns
+        """
+        columns = self.columns if columns is None else columns
+        col_index = [self._column_index[col] for col in columns]
+
+        if include_missing:
+            merchant_idx, month_idx = np.indices(self.present.shape).reshape(2, -1)
+        else:
+            merchant_idx, month_idx = np.nonzero(self.present)
+
+        data = self.values[merchant_idx, month_idx][:, col_index]
+
+        df_long = pd.DataFrame(data, columns=columns)
+        df_long.insert(0, self.date_col, self.months[month_idx])
+        df_long.insert(0, self.merchant_col, self.merchants[merchant_idx])
+
+        return df_long
+
+    def save(self, path: Path) -> Path:
+        """
+        Save the panel to a directory (values.npy, present.npy, meta.json).
+
+        Args:
+            path: Output directory
+
+        Returns:
+            Output directory path
+        """
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+
+        np.save(path / 'values.npy', np.ascontiguousarray(self.values))
+        np.save(path / 'present.npy', self.present)
+        meta = {
+            'merchants': [str(m) for m in self.merchants],
+            'months': [int(m) for m in self.months],
+            'columns': self.columns,
+            'merchant_col': self.merchant_col,
+            'date_col': self.date_col,
+        }
+        with open(path / 'meta.json', 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False)
+
+        print(f"Saved panel {self.shape} to: {path}")
+
+        return path
+
+    @classmethod
+    def load(cls, path: Path, mmap_mode: Optional[str] = 'r') -> 'MerchantPanel':
+        """
+        Load a panel saved with save().
+
+        Args:
+            path: Panel directory
+            mmap_mode: np.load memory-map mode ('r', 'r+', 'c') or None to read into memory
+
+        Returns:
+            MerchantPanel instance (values backed by the file when memory-mapped)
+        """
+        path = Path(path)
+        with open(path / 'meta.json', 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+
+        return cls(
+            np.load(path / 'values.npy', mmap_mode=mmap_mode),
+            np.load(path / 'present.npy'),
+            np.array(meta['merchants'], dtype=object),
+            np.array(meta['months'], dtype='int64'),
+            meta['columns'],
+            meta['merchant_col'],
+            meta['date_col']
+        )
@@ -0,0 +1,203 @@
+"""Merchant-Sharded Parallel Feature Execution
+
+This module contains the ParallelFeatureExecutor class, which runs the
+feature engine steps of a plan in a process pool, one shard of
+merchants per task.
+
+Most engine steps only look at the rows of one merchant (lags, rolling
+windows, trends, interval declines, ...), so the panel is split into
+shards of whole merchants with about the same number of rows, the steps
+run on every shard in parallel and the new columns are put back in the
+row order of the working frame. Steps that compare merchants with each
+other (monthly rankings, composite indices normalized over the whole
+frame) run on the full frame in the parent process.
+
+Where the 'fork' start method is available, workers inherit the working
+frame from the parent and receive only the row positions of their shard;
+otherwise each shard frame is pickled to its worker.
+
+Example:
+    planner = FeaturePlanner()
+    plan = planner.plan_for_model('models/xgboost_selected_interval_info.json')
+    executor = ParallelFeatureExecutor(n_workers=8)
+    df_features = executor.run(df_encoded, plan)[plan.features]
+"""
+
+import contextlib
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from .frame import append_columns, sort_panel
+from .planner import STEPS, FeaturePlan, FeaturePlanner
+
+
+# Steps that need rows of other merchants (cross-sectional)
+GLOBAL_STEPS = {'ranking', 'composite'}
+
+# Working frame inherited by forked workers (set while a pool is running)
+_SHARED_FRAME = None
+
+
+def shard_merchants(merchant_ids: pd.Series, n_shards: int) -> List[np.ndarray]:
+    """
+    Split rows into shards of whole merchants with balanced row counts.
+
+    Merchants are assigned largest first to the shard with the fewest
+    rows so far. Rows without a merchant ID go to the smallest shard.
+
+    Args:
+        merchant_ids: Merchant ID per row
+        n_shards: Number of shards
+
+    Returns:
+        List of row position arrays (ascending, non-empty shards only)
+    """
+    codes, uniques = pd.factorize(merchant_ids)
+    sizes = np.bincount(codes[codes >= 0], minlength=len(uniques))
+
+    shard_of_merchant = np.zeros(len(uniques), dtype=np.int64)
+    loads = np.zeros(max(n_shards, 1), dtype=np.int64)
+    for merchant in np.argsort(-sizes, kind='stable'):
+        shard = int(np.argmin(loads))
+        shard_of_merchant[merchant] = shard
+        loads[shard] += sizes[merchant]
+
+    shard_of_row = np.where(codes >= 0, shard_of_merchant[codes], int(np.argmin(loads)))
+    shards = [np.flatnonzero(shard_of_row == shard) for shard in range(len(loads))]
+    return [positions for positions in shards if len(positions) > 0]
+
+
+def _run_steps(df: pd.DataFrame, steps: Sequence[tuple], merchant_col: str, date_col: str) -> pd.DataFrame:
+    """Run plan steps on a frame with copy-free engines."""
+    engines = FeaturePlanner(merchant_col, date_col).engines(copy=False)
+    for step, kwargs in steps:
+        engine, method, _ = STEPS[step]
+        df = getattr(engines[engine], method)(df, **kwargs)
+    return df
+
+
+def _run_shard(task: tuple) -> pd.DataFrame:
+    """
+    Worker: run steps on one shard and return only the new columns.
+
+    Args:
+        task: (row positions, shard frame or None for the inherited frame,
+            steps, merchant_col, date_col)
+
+    Returns:
+        DataFrame of new columns indexed by row position
+    """
+    positions, shard, steps, merchant_col, date_col = task
+    if shard is None:
+        shard = _SHARED_FRAME.take(positions)
+    shard = shard.set_axis(positions)
+
+    # Keep worker output quiet; the parent reports progress
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        result = _run_steps(shard, steps, merchant_col, date_col)
+
+    new_cols = [col for col in result.columns if col not in shard.columns]
+    return result[new_cols]
+
+
+class ParallelFeatureExecutor:
+    """
+    Runs feature plan steps in a process pool, sharded by merchant.
+
+    Attributes:
+        n_workers: Number of worker processes
+        shards_per_worker: Shards per worker (more shards = better balance)
+    """
+
+    def __init__(
+        self,
+        merchant_col: str = 'ENCODED_MCT',
+        date_col: str = 'TA_YM',
+        n_workers: Optional[int] = None,
+        shards_per_worker: int = 2
+    ):
+        """
+        Initialize ParallelFeatureExecutor.
+
+        Args:
+            merchant_col: Column name for merchant ID
+            date_col: Column name for date (YYYYMM format)
+            n_workers: Number of worker processes (default: CPU count)
+            shards_per_worker: Shards per worker
+        """
+        self.merchant_col = merchant_col
+        self.date_col = date_col
+        self.n_workers = n_workers or os.cpu_count() or 1
+        self.shards_per_worker = shards_per_worker
+
+    def run(self, df: pd.DataFrame, plan: Union[FeaturePlan, Sequence[tuple]]) -> pd.DataFrame:
+        """
+        Execute plan steps in parallel.
+
+        Consecutive merchant-local steps are run together on each shard;
+        steps in GLOBAL_STEPS run on the full frame in between.
+
+        Args:
+            df: Input DataFrame (interval columns already encoded)
+            plan: FeaturePlan, or list of (step name, keyword arguments)
+
+        Returns:
+            DataFrame sorted by merchant and date with the new columns
+            added (same values as FeaturePlan.run)
+        """
+        steps = plan.steps if isinstance(plan, FeaturePlan) else list(plan)
+        unknown = [step for step, _ in steps if step not in STEPS]
+        if unknown:
+            raise ValueError(f"Unknown steps: {unknown}")
+
+        print(f"Running {len(steps)} feature steps with {self.n_workers} workers...")
+
+        df_result = sort_panel(df, self.merchant_col, self.date_col, copy=False)
+
+        # Group consecutive merchant-local steps into one parallel stage
+        stages = []
+        for step, kwargs in steps:
+            is_local = step not in GLOBAL_STEPS
+            if is_local and stages and stages[-1][0]:
+                stages[-1][1].append((step, kwargs))
+            else:
+                stages.append((is_local, [(step, kwargs)]))
+
+        for is_local, stage_steps in stages:
+            if is_local and self.n_workers > 1:
+                df_result = self._run_sharded(df_result, stage_steps)
+            else:
+                df_result = _run_steps(df_result, stage_steps, self.merchant_col, self.date_col)
+
+        return df_result
+
+    def _run_sharded(self, df: pd.DataFrame, steps: List[tuple]) -> pd.DataFrame:
+        """Run merchant-local steps on all shards and add their columns to df."""
+        global _SHARED_FRAME
+
+        shards = shard_merchants(df[self.merchant_col], self.n_workers * self.shards_per_worker)
+        if len(shards) < 2:
+            return _run_steps(df, steps, self.merchant_col, self.date_col)
+
+        use_fork = 'fork' in multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context('fork' if use_fork else None)
+        tasks = [
+            (positions, None if use_fork else df.take(positions), steps, self.merchant_col, self.date_col)
+            for positions in shards
+        ]
+
+        _SHARED_FRAME = df if use_fork else None
+        try:
+            with ProcessPoolExecutor(max_workers=min(self.n_workers, len(shards)), mp_context=context) as pool:
+                blocks = list(pool.map(_run_shard, tasks))
+        finally:
+            _SHARED_FRAME = None
+
+        new_columns = pd.concat(blocks).sort_index()
+        print(f"  {len(steps)} steps on {len(shards)} shards: {new_columns.shape[1]} new columns")
+        return append_columns(df, {col: new_columns[col].to_numpy() for col in new_columns.columns})
@@ -0,0 +1,360 @@
+"""Feature Dependency Planner
+
+This module contains the FeaturePlanner class, which computes only the
+features a model consumes instead of running every feature engine.
+
+Every feature name template is registered as a FeatureRule: a regex for
+the name, the engine step (engine method) that produces it, the step
+arguments it needs (columns, windows, ...) and its input features.
+Given a model's feature list, the planner resolves each feature and its
+inputs recursively, merges the arguments of features produced by the
+same step (e.g. all decline counts of all columns become one
+create_interval_decline_features call) and orders the steps as a DAG.
+
+Example:
+    planner = FeaturePlanner()
+    plan = planner.plan_for_model('models/xgboost_selected_interval_info.json')
+    print(plan)
+    df_features = plan.run(df_encoded)[plan.features]
+"""
+
+import json
+import re
+from graphlib import TopologicalSorter
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Union
+
+import pandas as pd
+
+from .time_series import TimeSeriesFeatureEngine
+from .customer import CustomerFeatureEngine
+from .composite import CompositeFeatureEngine, composite_sources
+from .interval_patterns import IntervalPatternFeatureEngine
+from .frame import sort_panel
+
+
+# Default interval columns (used to split cross-metric feature names)
+INTERVAL_COLUMNS = ['RC_M1_SAA', 'RC_M1_TO_UE_CT', 'RC_M1_UE_CUS_CN', 'RC_M1_AV_NP_AT']
+
+# Customer ratio columns used by the customer engine
+CUSTOMER_COLUMNS = ['MCT_UE_CLN_REU_RAT', 'MCT_UE_CLN_NEW_RAT']
+
+# step name -> (engine, method, list arguments)
+# List arguments are collected from all features planned on the step
+STEPS = {
+    'interval_decline': ('interval', 'create_interval_decline_features', ['interval_columns', 'windows']),
+    'historical_worst': ('interval', 'create_historical_worst_features', ['interval_columns']),
+    'recovery': ('interval', 'create_recovery_indicators', ['interval_columns']),
+    'cross_metric': ('interval', 'create_cross_metric_interval_features', ['secondary_cols']),
+    'lag': ('time_series', 'create_lag_features', ['columns', 'lags']),
+    'moving_average': ('time_series', 'create_moving_averages', ['columns', 'windows']),
+    'change_rate': ('time_series', 'create_change_rates', ['columns', 'periods']),
+    'trend': ('time_series', 'create_trend_indicators', ['columns', 'windows']),
+    'volatility': ('time_series', 'create_volatility_indicators', ['columns', 'windows']),
+    'ranking': ('time_series', 'create_ranking_indicators', ['columns']),
+    'ranking_change': ('time_series', 'create_ranking_change', ['columns', 'periods']),
+    'customer_behavior': ('customer', 'create_customer_behavior_features', ['windows']),
+    'loyalty': ('customer', 'create_loyalty_indicators', ['windows']),
+    'composite': ('composite', 'create_composite_indicators', []),
+}
+
+
+class FeatureRule:
+    """
+    Registry entry for one feature name template.
+
+    Attributes:
+        pattern: Compiled regex matching the full feature name
+        step: Name of the step (engine method) that produces the feature
+        params: Step argument -> regex group; the group value is added to
+            that list argument (digits are converted to int)
+        key: Step arguments taken as a single value from a regex group;
+            features with different key values run as separate calls
+        inputs: Input feature templates ('{group}' placeholders) or a
+            function of the regex groups returning the input names
+    """
+
+    def __init__(
+        self,
+        pattern: str,
+        step: str,
+        params: Optional[Dict[str, str]] = None,
+        inputs: Union[Sequence[str], Callable[[Dict[str, str]], List[str]]] = (),
+        key: Optional[Dict[str, str]] = None
+    ):
+        self.pattern = re.compile(pattern)
+        self.step = step
+        self.params = params or {}
+        self.key = key or {}
+        self.inputs = inputs
+
+    def match(self, feature: str) -> Optional[Dict[str, str]]:
+        """Return the regex groups if the rule produces this feature name."""
+        found = self.pattern.fullmatch(feature)
+        return found.groupdict() if found else None
+
+    def input_names(self, groups: Dict[str, str]) -> List[str]:
+        """Input feature names for a matched feature."""
+        if callable(self.inputs):
+            return self.inputs(groups)
+        return [template.format(**groups) for template in self.inputs]
+
+
+def _composite_inputs(groups: Dict[str, str]) -> List[str]:
+    """Components of the composite indices (see CompositeFeatureEngine)."""
+    return composite_sources(f"{groups['index']}_index", int(groups['window']))
+
+
+def default_rules(interval_columns: Sequence[str] = INTERVAL_COLUMNS) -> List[FeatureRule]:
+    """
+    Feature rules for all feature engines (first matching rule wins).
+
+    Args:
+        interval_columns: Interval columns that may appear in cross-metric
+            feature names (needed to split '{primary}_{secondary}')
+
+    Returns:
+        List of FeatureRule
+    """
+    cols = '|'.join(re.escape(col) for col in sorted(interval_columns, key=len, reverse=True))
+    reu, new = CUSTOMER_COLUMNS
+    cross = dict(params={'secondary_cols': 'secondary'}, key={'primary_col': 'primary'},
+                 inputs=['{primary}_interval_change', '{secondary}_interval_change'])
+    decline = dict(params={'interval_columns': 'col'}, inputs=['{col}'])
+    recovery = dict(params={'interval_columns': 'col'}, inputs=['{col}_interval_change'])
+
+    return [
+        # Interval patterns: cross-metric
+        FeatureRule(rf'divergence_(?P<primary>{cols})_vs_(?P<secondary>{cols})', 'cross_metric', **cross),
+        FeatureRule(rf'aligned_decline_(?P<primary>{cols})_(?P<secondary>{cols})', 'cross_metric', **cross),
+        FeatureRule(rf'divergence_magnitude_(?P<primary>{cols})_(?P<secondary>{cols})', 'cross_metric', **cross),
+
+        # Interval patterns: decline
+        FeatureRule(r'(?P<col>.+)_interval_change', 'interval_decline', **decline),
+        FeatureRule(r'(?P<col>.+)_is_declining', 'interval_decline', **decline),
+        FeatureRule(r'(?P<col>.+)_consecutive_declines', 'interval_decline', **decline),
+        FeatureRule(r'(?P<col>.+)_decline_count_(?P<window>\d+)m', 'interval_decline',
+                    params={'interval_columns': 'col', 'windows': 'window'}, inputs=['{col}']),
+        FeatureRule(r'(?P<col>.+)_total_decline_(3|6|12)m', 'interval_decline', **decline),
+        FeatureRule(r'(?P<col>.+)_decline_speed_(3|6)m', 'interval_decline', **decline),
+
+        # Interval patterns: historical worst
+        FeatureRule(r'(?P<col>.+)_(worst_ever|best_ever|at_worst_now|distance_from_best|months_since_best)',
+                    'historical_worst', **decline),
+
+        # Interval patterns: recovery
+        FeatureRule(r'(?P<col>.+)_(is_recovering|consecutive_recovery)', 'recovery', **recovery),
+        FeatureRule(r'(?P<col>.+)_(interval_volatility|direction_changes)_(3|6)m', 'recovery', **recovery),
+        FeatureRule(r'(?P<col>.+)_recovery_after_decline', 'recovery', params={'interval_columns': 'col'},
+                    inputs=['{col}_interval_change', '{col}_is_declining']),
+
+        # Customer behavior / loyalty (before the generic time-series suffixes)
+        FeatureRule(r'customer_(reu_avg|new_avg|reu_std|new_trend)_(?P<window>\d+)m', 'customer_behavior',
+                    params={'windows': 'window'}, inputs=[reu, new]),
+        FeatureRule(r'loyalty_score', 'loyalty', inputs=[reu, new]),
+        FeatureRule(r'(loyalty_score_avg|loyalty_trend|customer_stability)_(?P<window>\d+)m', 'loyalty',
+                    params={'windows': 'window'}, inputs=[reu, new]),
+
+        # Composite indices
+        FeatureRule(r'(?P<index>health|risk|growth)_index_(?P<window>3|6|12)m', 'composite',
+                    inputs=_composite_inputs),
+
+        # Time series
+        FeatureRule(r'(?P<col>.+)_rank_change_(?P<period>\d+)m', 'ranking_change',
+                    params={'columns': 'col', 'periods': 'period'}, inputs=['{col}_rank']),
+        FeatureRule(r'(?P<col>.+)_rank(_pct)?', 'ranking', params={'columns': 'col'}, inputs=['{col}']),
+        FeatureRule(r'(?P<col>.+)_lag_(?P<lag>\d+)m', 'lag',
+                    params={'columns': 'col', 'lags': 'lag'}, inputs=['{col}']),
+        FeatureRule(r'(?P<col>.+)_ma_(?P<window>\d+)m', 'moving_average',
+                    params={'columns': 'col', 'windows': 'window'}, inputs=['{col}']),
+        FeatureRule(r'(?P<col>.+)_change_(?P<period>\d+)m', 'change_rate',
+                    params={'columns': 'col', 'periods': 'period'}, inputs=['{col}']),
+        FeatureRule(r'(?P<col>.+)_trend_(?P<window>\d+)m', 'trend',
+                    params={'columns': 'col', 'windows': 'window'}, inputs=['{col}']),
+        FeatureRule(r'(?P<col>.+)_(std|cv)_(?P<window>\d+)m', 'volatility',
+                    params={'columns': 'col', 'windows': 'window'}, inputs=['{col}']),
+    ]
+
+
+class FeaturePlan:
+    """
+    Ordered engine calls that produce a set of features.
+
+    Attributes:
+        features: Requested feature names
+        steps: List of (step name, keyword arguments) in execution order
+        sources: Input columns the plan reads from the frame
+    """
+
+    def __init__(self, features: List[str], steps: List[tuple], sources: List[str], planner: 'FeaturePlanner'):
+        self.features = features
+        self.steps = steps
+        self.sources = sources
+        self.planner = planner
+
+    def __repr__(self) -> str:
+        lines = [f"FeaturePlan: {len(self.features)} features, {len(self.steps)} steps"]
+        for i, (step, kwargs) in enumerate(self.steps, 1):
+            args = ', '.join(f"{name}={value}" for name, value in kwargs.items())
+            lines.append(f"  {i}. {STEPS[step][1]}({args})")
+        lines.append(f"  sources: {self.sources}")
+        return '\n'.join(lines)
+
+    def run(self, df: pd.DataFrame, copy: bool = False) -> pd.DataFrame:
+        """
+        Execute the plan.
+
+        By default the frame is sorted once up front and the engines run
+        in copy-free mode, so each step adds its columns to the same
+        working frame instead of copying every column it already holds.
+        The input frame is not modified either way.
+
+        Args:
+            df: Input DataFrame (must contain the source columns, with
+                interval columns already encoded)
+            copy: If True, every step works on its own copy (as a chain of
+                default engine calls does)
+
+        Returns:
+            DataFrame with the planned features added (plus any other
+            columns the engine calls produce alongside them)
+        """
+        missing = [col for col in self.sources if col not in df.columns]
+        if missing:
+            raise KeyError(f"Source columns not found: {missing}")
+
+        engines = self.planner.engines(copy=copy)
+        df_result = df if copy else sort_panel(df, self.planner.merchant_col, self.planner.date_col, copy=False)
+        for step, kwargs in self.steps:
+            engine, method, _ = STEPS[step]
+            df_result = getattr(engines[engine], method)(df_result, **kwargs)
+
+        not_created = [feature for feature in self.features if feature not in df_result.columns]
+        if not_created:
+            print(f"Warning: {len(not_created)} planned features were not created: {not_created}")
+
+        return df_result
+
+
+class FeaturePlanner:
+    """
+    Plans the minimal set of engine calls for a feature list.
+
+    Attributes:
+        rules: Ordered feature rules (first match wins)
+    """
+
+    def __init__(
+        self,
+        merchant_col: str = 'ENCODED_MCT',
+        date_col: str = 'TA_YM',
+        rules: Optional[List[FeatureRule]] = None
+    ):
+        """
+        Initialize FeaturePlanner.
+
+        Args:
+            merchant_col: Column name for merchant ID
+            date_col: Column name for date (YYYYMM format)
+            rules: Feature rules (default: default_rules())
+        """
+        self.merchant_col = merchant_col
+        self.date_col = date_col
+        self.rules = rules if rules is not None else default_rules()
+
+    def engines(self, copy: bool = True) -> Dict[str, object]:
+        """Engine instances by STEPS engine name (copy: see frame.py)."""
+        return {
+            'time_series': TimeSeriesFeatureEngine(self.merchant_col, self.date_col, copy=copy),
+            'customer': CustomerFeatureEngine(self.merchant_col, self.date_col, copy=copy),
+            'composite': CompositeFeatureEngine(copy=copy),
+            'interval': IntervalPatternFeatureEngine(self.merchant_col, self.date_col, copy=copy),
+        }
+
+    def find_rule(self, feature: str):
+        """
+        Find the rule producing a feature.
+
+        Args:
+            feature: Feature name
+
+        Returns:
+            (FeatureRule, regex groups), or (None, None) for source columns
+        """
+        for rule in self.rules:
+            groups = rule.match(feature)
+            if groups is not None:
+                return rule, groups
+        return None, None
+
+    def plan(self, features: List[str], available: Sequence[str] = ()) -> FeaturePlan:
+        """
+        Build the execution plan for a feature list.
+
+        Args:
+            features: Feature names to produce
+            available: Columns already in the frame (not recomputed)
+
+        Returns:
+            FeaturePlan
+        """
+        available = set(available)
+        step_args = {}                 # node -> {argument: values}
+        graph = TopologicalSorter()
+        producer = {}                  # feature -> node (None = source column)
+        sources = []
+
+        def resolve(feature: str):
+            if feature in producer:
+                return producer[feature]
+
+            rule, groups = (None, None) if feature in available else self.find_rule(feature)
+            if rule is None:
+                producer[feature] = None
+                if feature not in sources:
+                    sources.append(feature)
+                return None
+
+            node = (rule.step,) + tuple((arg, groups[group]) for arg, group in rule.key.items())
+            producer[feature] = node
+            args = step_args.setdefault(node, {arg: [] for arg in STEPS[rule.step][2]})
+            for arg, group in rule.params.items():
+                value = groups[group]
+                value = int(value) if value.isdigit() else value
+                if value not in args[arg]:
+                    args[arg].append(value)
+
+            graph.add(node)
+            for name in rule.input_names(groups):
+                input_node = resolve(name)
+                if input_node is not None and input_node != node:
+                    graph.add(node, input_node)
+            return node
+
+        for feature in features:
+            resolve(feature)
+
+        steps = []
+        for node in graph.static_order():
+            kwargs = dict(node[1:])
+            for arg, values in step_args[node].items():
+                kwargs[arg] = sorted(values) if all(isinstance(v, int) for v in values) else values
+            steps.append((node[0], kwargs))
+
+        return FeaturePlan(list(features), steps, sources, self)
+
+    def plan_for_model(self, info_path: Path, available: Sequence[str] = ()) -> FeaturePlan:
+        """
+        Build the execution plan for a saved model's feature list.
+
+        Args:
+            info_path: Model info JSON with a 'features' list
+                (e.g. models/xgboost_selected_interval_info.json)
+            available: Columns already in the frame (not recomputed)
+
+        Returns:
+            FeaturePlan
+        """
+        with open(info_path, 'r', encoding='utf-8') as f:
+            info = json.load(f)
+        return self.plan(info['features'], available)
@@ -0,0 +1,273 @@
+"""Vectorized Rolling Kernels
+
+This module contains rolling-window kernels that operate on a whole
+long frame at once (all merchants in one pass) instead of calling a
+Python function per window through rolling().apply().
+
+rolling_slope computes the least-squares slope of each trailing window
+from rolling sums of x, y, xy and x^2:
+
+    slope = (n * Sxy - Sx * Sy) / (n * Sxx - Sx^2)
+
+where x is the row position within the merchant and only non-NaN y
+values contribute to n and the sums. This is the same slope as
+np.polyfit(x[mask], y[mask], 1)[0] on every window.
+
+RollingStatsEngine computes a whole spec of columns x windows x stats
+(mean, std, sum, min, max, slope, cv) with one sort and one grouping.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional, Tuple
+
+from .frame import append_columns, sort_panel
+
+
+def rolling_slope(
+    values: pd.Series,
+    groups: pd.Series,
+    window: int,
+    min_periods: int = 2
+) -> pd.Series:
+    """
+    NaN-aware rolling linear-regression slope per group.
+
+    Equivalent to
+        values.groupby(groups).transform(
+            lambda s: s.rolling(window, min_periods=min_periods).apply(polyfit_slope)
+        )
+    where polyfit_slope fits only the non-NaN values of each window.
+
+    Windows are trailing row windows within each group, in the current row
+    order (sort by merchant and date beforehand, as the feature engines do).
+
+    Args:
+        values: Values to fit
+        groups: Group key per row (e.g. merchant ID); rows with a missing key get NaN
+        window: Window size (rows)
+        min_periods: Minimum number of non-NaN values in a window (at least 2)
+
+    Returns:
+        Series of slopes aligned with values.index
+    """
+    y = values.to_numpy(dtype='float64', na_value=np.nan)
+    codes, _ = pd.factorize(groups)
+    slope = _slope_kernel(y, codes, window, min_periods)
+
+    return pd.Series(slope, index=values.index, name=values.name)
+
+
+def _slope_kernel(y: np.ndarray, codes: np.ndarray, window: int, min_periods: int) -> np.ndarray:
+    """Rolling slope of y per group code (-1 = no group) in the current row order."""
+    valid = ~np.isnan(y)
+
+    # x = position within the group; y centered on the group mean
+    # (the slope does not change when y is shifted, and centering keeps the sums small)
+    x = pd.Series(codes).groupby(codes).cumcount().to_numpy(dtype='float64')
+    y_mean = pd.Series(y).groupby(codes).transform('mean').to_numpy()
+    y = np.where(valid, y - y_mean, 0.0)
+    x = np.where(valid, x, 0.0)
+
+    sums = pd.DataFrame({
+        'n': valid.astype('float64'),
+        'x': x,
+        'y': y,
+        'xy': x * y,
+        'xx': x * x,
+    })
+
+    # Trailing window sums = cumulative sum minus cumulative sum `window` rows earlier
+    cumulative = sums.groupby(codes).cumsum()
+    lagged = cumulative.groupby(codes).shift(window).fillna(0.0)
+    windowed = (cumulative - lagged).to_numpy()
+    n, sx, sy, sxy, sxx = windowed.T
+
+    numerator = n * sxy - sx * sy
+    denominator = n * sxx - sx * sx
+
+    enough = (n >= max(min_periods, 2)) & (codes >= 0)
+    slope = np.full(len(y), np.nan)
+    np.divide(numerator, denominator, out=slope, where=enough & (denominator > 0))
+    return slope
+
+
+class RollingStatsEngine:
+    """
+    Multi-column, multi-window rolling statistics in one pass.
+
+    A spec maps each output column to (source column, stat, window). The
+    frame is sorted and grouped by merchant once; every window then runs
+    one grouped rolling call per stat over all columns that need it, and
+    derived stats reuse shared results (cv is computed from the same
+    rolling mean and std that the mean / std outputs use).
+
+    Supported stats:
+    - mean, std, sum, min, max: pandas rolling kernels (min_periods)
+    - slope: least-squares slope (rolling_slope, slope_min_periods)
+    - cv: std / mean (NaN where the mean is 0)
+
+    Example:
+        engine = RollingStatsEngine()
+        spec = engine.build_spec(['RC_M1_SAA'], [3, 6], ['mean', 'std', 'cv'], names={'mean': 'ma'})
+        df_result = engine.transform(df, spec)
+    """
+
+    STATS = ('mean', 'std', 'sum', 'min', 'max', 'slope', 'cv')
+
+    def __init__(
+        self,
+        merchant_col: str = 'ENCODED_MCT',
+        date_col: str = 'TA_YM',
+        min_periods: int = 1,
+        slope_min_periods: int = 2,
+        copy: bool = True
+    ):
+        """
+        Initialize RollingStatsEngine.
+
+        Args:
+            merchant_col: Column name for merchant ID
+            date_col: Column name for date (YYYYMM format)
+            min_periods: Minimum observations per window for mean/std/sum/min/max/cv
+            slope_min_periods: Minimum non-NaN observations per window for slope
+            copy: If False, transform works on the input frame without copying
+                it (see frame.py)
+        """
+        self.merchant_col = merchant_col
+        self.date_col = date_col
+        self.min_periods = min_periods
+        self.slope_min_periods = slope_min_periods
+        self.copy = copy
+
+    @staticmethod
+    def build_spec(
+        columns: List[str],
+        windows: List[int],
+        stats: List[str],
+        names: Optional[Dict[str, str]] = None
+    ) -> Dict[str, Tuple[str, str, int]]:
+        """
+        Build a spec for every column x window x stat.
+
+        Output columns are named '{col}_{label}_{window}m', where label is the
+        stat name unless overridden in names (e.g. {'mean': 'ma'}).
+
+        Args:
+            columns: Source columns
+            windows: Window sizes (in months)
+            stats: Stats to compute
+            names: Optional stat -> label overrides
+
+        Returns:
+            Dict of output column -> (source column, stat, window)
+        """
+        names = names or {}
+        return {
+            f"{col}_{names.get(stat, stat)}_{window}m": (col, stat, window)
+            for col in columns
+            for window in windows
+            for stat in stats
+        }
+
+    def compute(self, df: pd.DataFrame, spec: Dict[str, Tuple[str, str, int]]) -> pd.DataFrame:
+        """
+        Compute all outputs of a spec.
+
+        Rolling windows run over each merchant's rows in date order, whatever
+        the row order of df.
+
+        Args:
+            df: Input DataFrame
+            spec: Dict of output column -> (source column, stat, window)
+
+        Returns:
+            DataFrame of the output columns, aligned with df.index
+            (outputs whose source column is missing are skipped)
+        """
+        unknown = sorted({stat for _, stat, _ in spec.values()} - set(self.STATS))
+        if unknown:
+            raise ValueError(f"Unknown rolling stats: {unknown} (supported: {list(self.STATS)})")
+
+        missing = []
+        for col, _, _ in spec.values():
+            if col not in df.columns and col not in missing:
+                print(f"Warning: Column '{col}' not found, skipping...")
+                missing.append(col)
+        spec = {name: item for name, item in spec.items() if item[0] not in missing}
+
+        # Sort once (merchant, date) and group once
+        codes, _ = pd.factorize(df[self.merchant_col], sort=True)
+        order = np.lexsort((df[self.date_col].to_numpy(), codes))
+        is_sorted = bool(np.all(order[1:] > order[:-1]))
+        if not is_sorted:
+            codes = codes[order]
+
+        columns = list(dict.fromkeys(col for col, _, _ in spec.values()))
+        values = pd.DataFrame({
+            col: df[col].to_numpy(dtype='float64', na_value=np.nan) if is_sorted
+            else df[col].to_numpy(dtype='float64', na_value=np.nan)[order]
+            for col in columns
+        })
+        grouped = values.groupby(codes, sort=False)
+
+        # Kernel calls needed per window: stat -> columns (cv needs mean and std)
+        needed = {}
+        for col, stat, window in spec.values():
+            for kernel in (('mean', 'std') if stat == 'cv' else (stat,)):
+                needed.setdefault(window, {}).setdefault(kernel, [])
+                if col not in needed[window][kernel]:
+                    needed[window][kernel].append(col)
+
+        results = {}
+        for window, kernels in needed.items():
+            for kernel, cols in kernels.items():
+                if kernel == 'slope':
+                    for col in cols:
+                        results[(col, kernel, window)] = _slope_kernel(
+                            values[col].to_numpy(), codes, window, self.slope_min_periods
+                        )
+                    continue
+
+                rolled = getattr(grouped[cols].rolling(window=window, min_periods=self.min_periods), kernel)()
+                positions = rolled.index.get_level_values(-1)
+                for col in cols:
+                    out = np.empty(len(values))
+                    out[positions] = rolled[col].to_numpy()
+                    results[(col, kernel, window)] = out
+
+        outputs = {}
+        no_group = codes < 0
+        for name, (col, stat, window) in spec.items():
+            if stat == 'cv':
+                mean = results[(col, 'mean', window)]
+                std = results[(col, 'std', window)]
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    result = std / np.where(mean == 0, np.nan, mean)
+                result[np.isinf(result)] = np.nan
+            else:
+                result = results[(col, stat, window)].copy()
+            result[no_group] = np.nan
+
+            if not is_sorted:
+                unsorted = np.empty_like(result)
+                unsorted[order] = result
+                result = unsorted
+            outputs[name] = result
+
+        return pd.DataFrame(outputs, index=df.index)
+
+    def transform(self, df: pd.DataFrame, spec: Dict[str, Tuple[str, str, int]]) -> pd.DataFrame:
+        """
+        Sort by merchant and date and add all outputs of a spec.
+
+        Args:
+            df: Input DataFrame
+            spec: Dict of output column -> (source column, stat, window)
+
+        Returns:
+            Sorted DataFrame with the output columns added
+        """
+        df_result = sort_panel(df, self.merchant_col, self.date_col, self.copy)
+        stats = self.compute(df_result, spec)
+        return append_columns(df_result, {name: stats[name].to_numpy() for name in stats.columns})
@@ -0,0 +1,96 @@
+"""Vectorized Event Counters
+
+This module contains per-merchant counters over event flags that
+operate on a whole long frame at once (all merchants in one pass)
+instead of looping over rows or running a groupby().apply() per
+merchant.
+
+The counters follow the current row order within each group, so the
+frame should be sorted by merchant and date beforehand (as the feature
+engines do). Rows with a missing group key get NaN.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def counts_since_reset(reset, groups) -> np.ndarray:
+    """
+    Count rows since the last reset event within each group.
+
+    The counter starts at 0 before the first row of a group, is set to 0
+    on rows where reset is True and increases by 1 on every other row:
+
+        reset:   F  T  F  F  T  F
+        counts:  1  0  1  2  0  1
+
+    Args:
+        reset: Boolean flag per row (reset events)
+        groups: Group key per row (e.g. merchant ID)
+
+    Returns:
+        float64 array of counts (NaN where the group key is missing)
+    """
+    reset = np.asarray(reset, dtype=bool)
+    codes, _ = pd.factorize(groups)
+    position = pd.Series(codes).groupby(codes).cumcount().to_numpy()
+
+    # Position of the latest reset at or before each row (NaN if none yet)
+    last_reset = pd.Series(np.where(reset, position, np.nan)).groupby(codes).ffill().to_numpy()
+    counts = np.where(np.isnan(last_reset), position + 1, position - last_reset)
+
+    return np.where(codes >= 0, counts, np.nan)
+
+
+def streak_lengths(flag, groups) -> np.ndarray:
+    """
+    Run-length of the current streak of True flags within each group.
+
+    0 on rows where flag is False, otherwise the number of consecutive
+    True rows ending at this row (a streak never crosses a group boundary):
+
+        flag:     F  T  T  F  T  T  T
+        streaks:  0  1  2  0  1  2  3
+
+    This is counts_since_reset with the False rows as reset events.
+
+    Args:
+        flag: Boolean (or 0/1) flag per row
+        groups: Group key per row (e.g. merchant ID)
+
+    Returns:
+        int64 array of streak lengths (float64 with NaN where the group key is missing)
+    """
+    streaks = counts_since_reset(~np.asarray(flag, dtype=bool), groups)
+    if np.isnan(streaks).any():
+        return streaks
+    return streaks.astype(np.int64)
+
+
+def first_in_group(values, groups) -> np.ndarray:
+    """
+    Broadcast the value of each group's first row to all rows of the group.
+
+    Unlike groupby().transform('first'), a missing first value is kept
+    (NaN) rather than skipped.
+
+    Args:
+        values: Values per row
+        groups: Group key per row
+
+    Returns:
+        float64 array (NaN where the group key is missing)
+    """
+    values = pd.Series(values).to_numpy(dtype='float64', na_value=np.nan)
+    codes, uniques = pd.factorize(groups)
+    valid = codes >= 0
+
+    # Row of the first occurrence of each group code
+    rows = np.flatnonzero(valid)
+    group_codes, first_index = np.unique(codes[valid], return_index=True)
+    first_row = np.zeros(len(uniques), dtype=np.int64)
+    first_row[group_codes] = rows[first_index]
+
+    first = np.full(len(codes), np.nan)
+    first[valid] = values[first_row[codes[valid]]]
+    return first
@@ -9,6 +9,9 @@ import pandas as pd
 import numpy as np
 from typing import List, Optional, Dict
 
+from .frame import append_columns, sort_panel, working_frame
+from .rolling import RollingStatsEngine
+
 
 class TimeSeriesFeatureEngine:
     """
@@ -23,16 +26,19 @@ class TimeSeriesFeatureEngine:
     - Ranking indicators
     """
 
-    def __init__(self, merchant_col: str = 'ENCODED_MCT', date_col: str = 'TA_YM'):
+    def __init__(self, merchant_col: str = 'ENCODED_MCT', date_col: str = 'TA_YM', copy: bool = True):
         """
         Initialize TimeSeriesFeatureEngine.
 
         Args:
             merchant_col: Column name for merchant ID
             date_col: Column name for date (YYYYMM format)
+            copy: If False, work on the input frame without copying it
+                (already sorted frames are not re-sorted; see frame.py)
         """
         self.merchant_col = merchant_col
         self.date_col = date_col
+        self.copy = copy
 
     def create_lag_features(
         self,
@@ -55,10 +61,10 @@ class TimeSeriesFeatureEngine:
         print(f"Columns: {len(columns)}")
         print(f"Lags: {lags}")
 
-        df_result = df.copy()
-
         # Sort by merchant and date
-        df_result = df_result.sort_values([self.merchant_col, self.date_col])
+        df_result = sort_panel(df, self.merchant_col, self.date_col, self.copy)
+        grouped = df_result.groupby(self.merchant_col, observed=True)
+        new_columns = {}
 
         for col in columns:
             if col not in df_result.columns:
@@ -67,7 +73,9 @@ class TimeSeriesFeatureEngine:
 
             for lag in lags:
                 lag_col_name = f"{col}_lag_{lag}m"
-                df_result[lag_col_name] = df_result.groupby(self.merchant_col)[col].shift(lag)
+                new_columns[lag_col_name] = grouped[col].shift(lag)
+
+        df_result = append_columns(df_result, new_columns)
 
         print(f"Created {len(columns) * len(lags)} lag features")
 
@@ -94,21 +102,10 @@ class TimeSeriesFeatureEngine:
         print(f"Columns: {len(columns)}")
         print(f"Windows: {windows}")
 
-        df_result = df.copy()
-
-        # Sort by merchant and date
-        df_result = df_result.sort_values([self.merchant_col, self.date_col])
-
-        for col in columns:
-            if col not in df_result.columns:
-                print(f"Warning: Column '{col}' not found, skipping...")
-                continue
-
-            for window in windows:
-                ma_col_name = f"{col}_ma_{window}m"
-                df_result[ma_col_name] = df_result.groupby(self.merchant_col)[col].transform(
-                    lambda x: x.rolling(window=window, min_periods=1).mean()
-                )
+        # Sorted by merchant and date, all columns x windows in one pass
+        engine = RollingStatsEngine(self.merchant_col, self.date_col, copy=self.copy)
+        spec = engine.build_spec(columns, windows, ['mean'], names={'mean': 'ma'})
+        df_result = engine.transform(df, spec)
 
         print(f"Created {len(columns) * len(windows)} moving average features")
 
@@ -135,10 +132,10 @@ class TimeSeriesFeatureEngine:
         print(f"Columns: {len(columns)}")
         print(f"Periods: {periods}")
 
-        df_result = df.copy()
-
         # Sort by merchant and date
-        df_result = df_result.sort_values([self.merchant_col, self.date_col])
+        df_result = sort_panel(df, self.merchant_col, self.date_col, self.copy)
+        grouped = df_result.groupby(self.merchant_col, observed=True)
+        new_columns = {}
 
         for col in columns:
             if col not in df_result.columns:
@@ -147,10 +144,12 @@ class TimeSeriesFeatureEngine:
 
             for period in periods:
                 change_col_name = f"{col}_change_{period}m"
-                change_values = df_result.groupby(self.merchant_col)[col].pct_change(periods=period) * 100
+                change_values = grouped[col].pct_change(periods=period) * 100
                 # Replace inf values with NaN (occurs when dividing by 0)
                 change_values = change_values.replace([np.inf, -np.inf], np.nan)
-                df_result[change_col_name] = change_values
+                new_columns[change_col_name] = change_values
+
+        df_result = append_columns(df_result, new_columns)
 
         print(f"Created {len(columns) * len(periods)} change rate features")
 
@@ -177,33 +176,10 @@ class TimeSeriesFeatureEngine:
         print(f"Columns: {len(columns)}")
         print(f"Windows: {windows}")
 
-        df_result = df.copy()
-
-        # Sort by merchant and date
-        df_result = df_result.sort_values([self.merchant_col, self.date_col])
-
-        def calculate_trend(series):
-            """Calculate linear trend (slope) for a series."""
-            if len(series) < 2 or series.isna().all():
-                return np.nan
-            x = np.arange(len(series))
-            y = series.values
-            mask = ~np.isnan(y)
-            if mask.sum() < 2:
-                return np.nan
-            trend = np.polyfit(x[mask], y[mask], 1)[0]
-            return trend
-
-        for col in columns:
-            if col not in df_result.columns:
-                print(f"Warning: Column '{col}' not found, skipping...")
-                continue
-
-            for window in windows:
-                trend_col_name = f"{col}_trend_{window}m"
-                df_result[trend_col_name] = df_result.groupby(self.merchant_col)[col].transform(
-                    lambda x: x.rolling(window=window, min_periods=2).apply(calculate_trend, raw=False)
-                )
+        # Sorted by merchant and date, all columns x windows in one pass
+        engine = RollingStatsEngine(self.merchant_col, self.date_col, slope_min_periods=2, copy=self.copy)
+        spec = engine.build_spec(columns, windows, ['slope'], names={'slope': 'trend'})
+        df_result = engine.transform(df, spec)
 
         print(f"Created {len(columns) * len(windows)} trend indicator features")
 
@@ -230,33 +206,11 @@ class TimeSeriesFeatureEngine:
         print(f"Columns: {len(columns)}")
         print(f"Windows: {windows}")
 
-        df_result = df.copy()
-
-        # Sort by merchant and date
-        df_result = df_result.sort_values([self.merchant_col, self.date_col])
-
-        for col in columns:
-            if col not in df_result.columns:
-                print(f"Warning: Column '{col}' not found, skipping...")
-                continue
-
-            for window in windows:
-                # Standard deviation
-                std_col_name = f"{col}_std_{window}m"
-                df_result[std_col_name] = df_result.groupby(self.merchant_col)[col].transform(
-                    lambda x: x.rolling(window=window, min_periods=1).std()
-                )
-
-                # Coefficient of variation (CV = std / mean)
-                cv_col_name = f"{col}_cv_{window}m"
-                rolling_mean = df_result.groupby(self.merchant_col)[col].transform(
-                    lambda x: x.rolling(window=window, min_periods=1).mean()
-                )
-                rolling_std = df_result[std_col_name]
-                # Replace 0 and very small values with NaN to avoid inf
-                cv_values = rolling_std / rolling_mean.replace(0, np.nan)
-                cv_values = cv_values.replace([np.inf, -np.inf], np.nan)
-                df_result[cv_col_name] = cv_values
+        # Standard deviation and coefficient of variation (CV = std / mean, NaN where mean is 0)
+        # CV reuses the rolling std / mean of the same pass
+        engine = RollingStatsEngine(self.merchant_col, self.date_col, copy=self.copy)
+        spec = engine.build_spec(columns, windows, ['std', 'cv'])
+        df_result = engine.transform(df, spec)
 
         print(f"Created {len(columns) * len(windows) * 2} volatility indicator features")
 
@@ -280,7 +234,9 @@ class TimeSeriesFeatureEngine:
         print(f"\nCreating ranking indicators...")
         print(f"Columns: {len(columns)}")
 
-        df_result = df.copy()
+        df_result = working_frame(df, self.copy)
+        grouped = df_result.groupby(self.date_col)
+        new_columns = {}
 
         for col in columns:
             if col not in df_result.columns:
@@ -289,11 +245,13 @@ class TimeSeriesFeatureEngine:
 
             # Rank (higher value = better rank = lower number)
             rank_col_name = f"{col}_rank"
-            df_result[rank_col_name] = df_result.groupby(self.date_col)[col].rank(ascending=False, method='min')
+            new_columns[rank_col_name] = grouped[col].rank(ascending=False, method='min')
 
             # Percentile rank (0-100)
             rank_pct_col_name = f"{col}_rank_pct"
-            df_result[rank_pct_col_name] = df_result.groupby(self.date_col)[col].rank(pct=True) * 100
+            new_columns[rank_pct_col_name] = grouped[col].rank(pct=True) * 100
+
+        df_result = append_columns(df_result, new_columns)
 
         print(f"Created {len(columns) * 2} ranking features")
 
@@ -320,10 +278,10 @@ class TimeSeriesFeatureEngine:
         print(f"Columns: {len(columns)}")
         print(f"Periods: {periods}")
 
-        df_result = df.copy()
-
         # Sort by merchant and date
-        df_result = df_result.sort_values([self.merchant_col, self.date_col])
+        df_result = sort_panel(df, self.merchant_col, self.date_col, self.copy)
+        grouped = df_result.groupby(self.merchant_col, observed=True)
+        new_columns = {}
 
         for col in columns:
             rank_col = f"{col}_rank"
@@ -336,7 +294,9 @@ class TimeSeriesFeatureEngine:
                 rank_change_col_name = f"{col}_rank_change_{period}m"
                 # Negative change = rank improved (went down in number)
                 # Positive change = rank worsened (went up in number)
-                df_result[rank_change_col_name] = df_result.groupby(self.merchant_col)[rank_col].diff(periods=period)
+                new_columns[rank_change_col_name] = grouped[rank_col].diff(periods=period)
+
+        df_result = append_columns(df_result, new_columns)
 
         print(f"Created {len(columns) * len(periods)} ranking change features")
 
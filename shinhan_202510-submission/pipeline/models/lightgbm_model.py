@@ -6,7 +6,7 @@ This module contains a wrapper class for LightGBM models.
 import lightgbm as lgb
 import numpy as np
 import pandas as pd
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 
 
 class LightGBMModel:
@@ -23,6 +23,7 @@ class LightGBMModel:
         """
         self.params = params
         self.model = None
+        self.feature_names = None
 
     def train(
         self,
@@ -30,19 +31,24 @@ class LightGBMModel:
         y_train: pd.Series,
         X_val: Optional[pd.DataFrame] = None,
         y_val: Optional[pd.Series] = None,
-        verbose: bool = True
+        verbose: bool = True,
+        feature_names: Optional[List[str]] = None
     ):
         """
         Train LightGBM model.
 
         Args:
-            X_train: Training features
+            X_train: Training features (DataFrame or scipy sparse matrix,
+                e.g. MissingMask.to_sparse() stacked with other sparse features)
             y_train: Training target
             X_val: Validation features (optional)
             y_val: Validation target (optional)
             verbose: Whether to print training progress
+            feature_names: Feature names for sparse/array inputs
+                (default: DataFrame column names)
         """
         self.model = lgb.LGBMClassifier(**self.params)
+        self.feature_names = list(feature_names) if feature_names is not None else None
 
         eval_set = [(X_train, y_train)]
         if X_val is not None and y_val is not None:
@@ -54,7 +60,8 @@ class LightGBMModel:
             X_train,
             y_train,
             eval_set=eval_set,
-            callbacks=callbacks
+            callbacks=callbacks,
+            feature_name=self.feature_names if self.feature_names is not None else 'auto'
         )
 
     def predict(self, X: pd.DataFrame) -> np.ndarray:
@@ -96,7 +103,7 @@ class LightGBMModel:
             raise ValueError("Model not trained yet")
 
         importance_df = pd.DataFrame({
-            'feature': self.model.feature_name_,
+            'feature': self.feature_names or self.model.feature_name_,
             'importance': self.model.feature_importances_
         }).sort_values('importance', ascending=False)
 
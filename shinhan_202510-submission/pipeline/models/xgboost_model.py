@@ -6,7 +6,7 @@ This module contains a wrapper class for XGBoost models.
 import xgboost as xgb
 import numpy as np
 import pandas as pd
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 
 
 class XGBoostModel:
@@ -23,6 +23,7 @@ class XGBoostModel:
         """
         self.params = params
         self.model = None
+        self.feature_names = None
 
     def train(
         self,
@@ -30,19 +31,27 @@ class XGBoostModel:
         y_train: pd.Series,
         X_val: Optional[pd.DataFrame] = None,
         y_val: Optional[pd.Series] = None,
-        verbose: bool = True
+        verbose: bool = True,
+        feature_names: Optional[List[str]] = None
     ):
         """
         Train XGBoost model.
 
         Args:
-            X_train: Training features
+            X_train: Training features (DataFrame or scipy sparse matrix,
+                e.g. MissingMask.to_sparse() stacked with other sparse features)
             y_train: Training target
             X_val: Validation features (optional)
             y_val: Validation target (optional)
             verbose: Whether to print training progress
+            feature_names: Feature names for sparse/array inputs
+                (default: DataFrame column names)
         """
         self.model = xgb.XGBClassifier(**self.params)
+        self.feature_names = list(feature_names) if feature_names is not None else None
+        if (self.feature_names is not None and isinstance(X_train, pd.DataFrame)
+                and self.feature_names != list(X_train.columns)):
+            raise ValueError("feature_names do not match the DataFrame columns")
 
         eval_set = [(X_train, y_train)]
         if X_val is not None and y_val is not None:
@@ -55,6 +64,10 @@ class XGBoostModel:
             verbose=verbose
         )
 
+        # Sparse/array inputs carry no names: name the booster's features
+        if self.feature_names is not None:
+            self.model.get_booster().feature_names = self.feature_names
+
     def predict(self, X: pd.DataFrame) -> np.ndarray:
         """
         Predict class labels.
@@ -67,7 +80,7 @@ class XGBoostModel:
         """
         if self.model is None:
             raise ValueError("Model not trained yet")
-        return self.model.predict(X)
+        return self.model.predict(X, validate_features=isinstance(X, pd.DataFrame))
 
     def predict_proba(self, X: pd.DataFrame) -> np.ndarray:
         """
@@ -81,7 +94,7 @@ class XGBoostModel:
         """
         if self.model is None:
             raise ValueError("Model not trained yet")
-        return self.model.predict_proba(X)
+        return self.model.predict_proba(X, validate_features=isinstance(X, pd.DataFrame))
 
     def get_feature_importance(self) -> pd.DataFrame:
         """
@@ -5,6 +5,11 @@ Preprocessing Module
 - data_loader: 데이터 로드 및 병합
 - missing_handler: 결측값 처리
 - feature_encoder: 구간 인코딩 및 타겟 변수 생성
+- storage: 컬럼 포맷(Parquet) 캐시 저장/로드
+- schema: 병합 데이터 컬럼 타입 선언 (typed 로드)
+- merchant_store: 가맹점 단위 random access 패널 저장소
+- missing_mask: bit-packed 결측 플래그
+- column_schema: 컬럼 역할/dtype/구간 라벨 레지스트리
 """
 
 from .data_loader import DataLoader, load_and_merge_data
@@ -14,6 +19,10 @@ from .feature_encoder import (
     DateEncoder,
     encode_features_and_targets
 )
+from .schema import apply_typed_schema
+from .merchant_store import MerchantPanelStore
+from .missing_mask import MissingMask
+from .column_schema import ColumnSchemaRegistry
 
 __all__ = [
     'DataLoader',
@@ -22,5 +31,9 @@ __all__ = [
     'process_missing_values',
     'FeatureEncoder',
     'DateEncoder',
-    'encode_features_and_targets'
+    'encode_features_and_targets',
+    'apply_typed_schema',
+    'MerchantPanelStore',
+    'MissingMask',
+    'ColumnSchemaRegistry'
 ]
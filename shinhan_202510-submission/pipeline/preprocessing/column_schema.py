@@ -0,0 +1,290 @@
+"""
+Column Schema Module
+
+컬럼 메타데이터 레지스트리
+- preprocessing_metadata.json / feature_name_mapping.json 에서 1회 생성 후 JSON으로 저장
+- 컬럼별 역할(배달/매출/고객/비율/범주/날짜/ID/기타), dtype, 구간 변수 여부 및 구간 라벨
+- 원본 파일이 바뀌면 재생성하고 버전 증가
+
+identify_column_types / identify_interval_columns 가 매 실행마다
+컬럼명 문자열 검사나 데이터 스캔을 하지 않고 바로 조회하도록 사용
+"""
+
+import json
+import pandas as pd
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .data_loader import DATASET1_DTYPES, DATASET2_DTYPES, DATASET3_DTYPES
+from .schema import INTERVAL_LABELS
+from .storage import file_fingerprint
+
+
+# 레지스트리 파일 형식 버전 (필드 구성이 바뀌면 증가)
+SCHEMA_FORMAT_VERSION = 1
+
+# 컬럼 역할 (MissingValueHandler.identify_column_types 분류와 동일)
+COLUMN_ROLES = ['delivery', 'sales', 'customer', 'ratio', 'category', 'date', 'id', 'other']
+
+# 프로젝트 루트 (pipeline/preprocessing/column_schema.py 기준)
+_PROCESSED_DIR = Path(__file__).parent.parent.parent / "data" / "processed"
+
+DEFAULT_SCHEMA_PATH = _PROCESSED_DIR / "column_schema.json"
+DEFAULT_METADATA_PATH = _PROCESSED_DIR / "preprocessing_metadata.json"
+DEFAULT_MAPPING_PATH = _PROCESSED_DIR / "feature_name_mapping.json"
+
+# 원본 CSV dtype (구간 변수는 원본에서 문자열)
+RAW_DTYPES = {**DATASET1_DTYPES, **DATASET2_DTYPES, **DATASET3_DTYPES}
+
+
+def classify_column(col: str, dtype) -> str:
+    """
+    컬럼명 규칙으로 역할 분류 (레지스트리에 없는 컬럼용)
+
+    Args:
+        col: 컬럼명
+        dtype: 컬럼 dtype (이름 규칙에 해당하지 않을 때 범주형/기타 구분에 사용)
+
+    Returns:
+        COLUMN_ROLES 중 하나
+    """
+    col_lower = col.lower()
+
+    # 배달 관련
+    if 'dlv' in col_lower or 'delivery' in col_lower or '배달' in col_lower:
+        return 'delivery'
+    # 매출 관련
+    if 'saa' in col_lower or 'sales' in col_lower or '매출' in col_lower:
+        return 'sales'
+    # 고객 관련
+    if 'cus' in col_lower or 'customer' in col_lower or '고객' in col_lower:
+        return 'customer'
+    # 비율/순위
+    if 'rat' in col_lower or 'pce' in col_lower or 'ratio' in col_lower or 'rank' in col_lower:
+        return 'ratio'
+    # 날짜
+    if 'ym' in col_lower or 'date' in col_lower or '_d' in col_lower:
+        return 'date'
+    # ID
+    if 'mct' in col_lower or 'id' in col_lower or 'encoded' in col_lower:
+        return 'id'
+    # 범주형 (object 타입)
+    if dtype == 'object':
+        return 'category'
+    # 기타
+    return 'other'
+
+
+class ColumnSchemaRegistry:
+    """컬럼 역할 / dtype / 구간 라벨 레지스트리"""
+
+    def __init__(
+        self,
+        columns: Dict[str, Dict],
+        version: int = 1,
+        sources: Optional[Dict[str, str]] = None
+    ):
+        """
+        Args:
+            columns: {컬럼명: {'role', 'dtype', 'raw_dtype', 'interval', 'vocabulary', 'description'}}
+            version: 레지스트리 버전 (원본 메타데이터가 바뀌어 재생성될 때마다 증가)
+            sources: {원본 파일명: fingerprint}
+        """
+        self.columns = columns
+        self.version = version
+        self.sources = sources or {}
+
+    @classmethod
+    def from_metadata(
+        cls,
+        metadata_path: Path = DEFAULT_METADATA_PATH,
+        mapping_path: Optional[Path] = DEFAULT_MAPPING_PATH,
+        version: int = 1
+    ) -> 'ColumnSchemaRegistry':
+        """
+        전처리 메타데이터 / 피처명 매핑으로 레지스트리 생성
+
+        Args:
+            metadata_path: preprocessing_metadata.json 경로 (컬럼, dtype, 구간 변수)
+            mapping_path: feature_name_mapping.json 경로 (컬럼 설명, 파생 변수명)
+            version: 부여할 버전
+
+        Returns:
+            ColumnSchemaRegistry 인스턴스
+        """
+        with open(metadata_path, 'r', encoding='utf-8') as f:
+            metadata = json.load(f)
+
+        descriptions = {}
+        sources = {Path(metadata_path).name: file_fingerprint(metadata_path)}
+        if mapping_path is not None and Path(mapping_path).exists():
+            with open(mapping_path, 'r', encoding='utf-8') as f:
+                mapping = json.load(f)
+            # suffix 설명은 컬럼이 아니므로 제외
+            for group, names in mapping.items():
+                if 'suffix' in group:
+                    continue
+                descriptions.update(names)
+            sources[Path(mapping_path).name] = file_fingerprint(mapping_path)
+
+        interval_columns = set(metadata.get('interval_columns', []))
+        dtypes = dict(metadata.get('dtypes', {}))
+
+        # 메타데이터 컬럼 + 매핑에만 있는 파생 변수 (숫자형)
+        names = list(metadata.get('columns', dtypes))
+        names += [name for name in descriptions if name not in dtypes and name not in names]
+
+        columns = {}
+        for col in names:
+            dtype = dtypes.get(col, 'float64')
+            raw_dtype = RAW_DTYPES.get(col)
+            is_interval = col in interval_columns
+            vocabulary = None
+            if is_interval and col in INTERVAL_LABELS:
+                labels = INTERVAL_LABELS[col]
+                vocabulary = [labels[code] for code in sorted(labels)]
+
+            columns[col] = {
+                # 구간 변수는 원본(문자열) 기준으로 분류
+                'role': classify_column(col, raw_dtype or dtype),
+                'dtype': dtype,
+                'raw_dtype': raw_dtype,
+                'interval': is_interval,
+                'vocabulary': vocabulary,
+                'description': descriptions.get(col),
+            }
+
+        return cls(columns, version, sources)
+
+    @classmethod
+    def load(cls, path: Path = DEFAULT_SCHEMA_PATH) -> 'ColumnSchemaRegistry':
+        """
+        저장된 레지스트리 로드
+
+        Args:
+            path: column_schema.json 경로
+
+        Returns:
+            ColumnSchemaRegistry 인스턴스
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+
+        if state.get('format_version') != SCHEMA_FORMAT_VERSION:
+            raise ValueError(
+                f"Unsupported column schema format: {state.get('format_version')} "
+                f"(expected {SCHEMA_FORMAT_VERSION})"
+            )
+
+        return cls(state['columns'], state['version'], state['sources'])
+
+    @classmethod
+    def get_or_build(
+        cls,
+        path: Path = DEFAULT_SCHEMA_PATH,
+        metadata_path: Path = DEFAULT_METADATA_PATH,
+        mapping_path: Optional[Path] = DEFAULT_MAPPING_PATH
+    ) -> 'ColumnSchemaRegistry':
+        """
+        저장된 레지스트리를 로드하고, 없거나 원본 메타데이터가 바뀌었으면 재생성 후 저장
+
+        Args:
+            path: column_schema.json 경로
+            metadata_path: preprocessing_metadata.json 경로
+            mapping_path: feature_name_mapping.json 경로
+
+        Returns:
+            ColumnSchemaRegistry 인스턴스
+        """
+        path = Path(path)
+        previous = cls.load(path) if path.exists() else None
+
+        if previous is not None:
+            current = {Path(metadata_path).name: file_fingerprint(metadata_path)}
+            if mapping_path is not None and Path(mapping_path).exists():
+                current[Path(mapping_path).name] = file_fingerprint(mapping_path)
+            if current == previous.sources:
+                return previous
+
+        version = previous.version + 1 if previous is not None else 1
+        registry = cls.from_metadata(metadata_path, mapping_path, version)
+        registry.save(path)
+        return registry
+
+    def save(self, path: Path = DEFAULT_SCHEMA_PATH) -> Path:
+        """
+        레지스트리를 JSON으로 저장
+
+        Args:
+            path: 저장 경로
+
+        Returns:
+            저장 경로
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        state = {
+            'format_version': SCHEMA_FORMAT_VERSION,
+            'version': self.version,
+            'sources': self.sources,
+            'columns': self.columns,
+        }
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False, indent=2)
+
+        print(f"Saved column schema v{self.version} ({len(self.columns)} columns): {path}")
+        return path
+
+    def __contains__(self, col: str) -> bool:
+        return col in self.columns
+
+    def __len__(self) -> int:
+        return len(self.columns)
+
+    def role(self, col: str, dtype=None) -> str:
+        """
+        컬럼 역할 조회 (레지스트리에 없으면 컬럼명 규칙으로 분류)
+
+        Args:
+            col: 컬럼명
+            dtype: 레지스트리에 없는 컬럼의 dtype
+
+        Returns:
+            COLUMN_ROLES 중 하나
+        """
+        if col in self.columns:
+            return self.columns[col]['role']
+        return classify_column(col, dtype)
+
+    def is_interval(self, col: str) -> bool:
+        """구간 변수 여부"""
+        return col in self.columns and self.columns[col]['interval']
+
+    def vocabulary(self, col: str) -> Optional[List[str]]:
+        """구간 변수 라벨 (1~6 순서)"""
+        return self.columns[col]['vocabulary'] if col in self.columns else None
+
+    def interval_columns(self) -> List[str]:
+        """구간 변수 컬럼 리스트"""
+        return [col for col, info in self.columns.items() if info['interval']]
+
+    def columns_by_role(self, columns: Optional[List[str]] = None) -> Dict[str, List[str]]:
+        """
+        역할별 컬럼 리스트
+
+        Args:
+            columns: 대상 컬럼 (None이면 레지스트리 전체)
+
+        Returns:
+            {역할: 컬럼 리스트} 딕셔너리 (COLUMN_ROLES 순서)
+        """
+        columns = list(self.columns) if columns is None else columns
+        by_role = {role: [] for role in COLUMN_ROLES}
+        for col in columns:
+            by_role[self.role(col)].append(col)
+        return by_role
+
+    def to_frame(self) -> pd.DataFrame:
+        """레지스트리를 데이터프레임으로 변환 (확인용)"""
+        return pd.DataFrame.from_dict(self.columns, orient='index').rename_axis('column').reset_index()
@@ -7,17 +7,93 @@ Data Loader Module
 - Dataset 3: 월별 고객 정보
 """
 
+import shutil
+import tempfile
+import time
 import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
-from typing import Tuple, Optional
+from typing import Callable, Dict, Iterator, List, Set, Tuple, Optional
+
+from .schema import MERCHANT_ID_COLUMNS, apply_typed_schema, memory_footprint
+from .storage import FRAME_SUFFIX, file_fingerprint, read_frame, write_frame
+
+
+# 병합 키 (컬럼 projection 시에도 항상 로드)
+KEY_COLUMNS = ['ENCODED_MCT', 'TA_YM']
+
+# Raw CSV 컬럼 dtype (캐시 변환 시 추론 결과가 달라지지 않도록 명시)
+# 구간 변수(MCT_OPE_MS_CN, RC_M1_*, APV_CE_RAT)는 '1_10%이하' 형식의 문자열
+DATASET1_DTYPES = {
+    'ENCODED_MCT': 'object',
+    'MCT_BSE_AR': 'object',
+    'MCT_NM': 'object',
+    'MCT_BRD_NUM': 'object',
+    'MCT_SIGUNGU_NM': 'object',
+    'HPSN_MCT_ZCD_NM': 'object',
+    'HPSN_MCT_BZN_CD_NM': 'object',
+    'ARE_D': 'Int64',  # 결측 가능 (nullable 정수, 빈 값 하나로 로드가 실패하지 않도록)
+    'MCT_ME_D': 'float64',
+}
+
+DATASET2_DTYPES = {
+    'ENCODED_MCT': 'object',
+    'TA_YM': 'int64',
+    'MCT_OPE_MS_CN': 'object',
+    'RC_M1_SAA': 'object',
+    'RC_M1_TO_UE_CT': 'object',
+    'RC_M1_UE_CUS_CN': 'object',
+    'RC_M1_AV_NP_AT': 'object',
+    'APV_CE_RAT': 'object',
+    'DLV_SAA_RAT': 'float64',
+    'M1_SME_RY_SAA_RAT': 'float64',
+    'M1_SME_RY_CNT_RAT': 'float64',
+    'M12_SME_RY_SAA_PCE_RT': 'float64',
+    'M12_SME_BZN_SAA_PCE_RT': 'float64',
+    'M12_SME_RY_ME_MCT_RAT': 'float64',
+    'M12_SME_BZN_ME_MCT_RAT': 'float64',
+}
+
+DATASET3_DTYPES = {
+    'ENCODED_MCT': 'object',
+    'TA_YM': 'int64',
+    'M12_MAL_1020_RAT': 'float64',
+    'M12_MAL_30_RAT': 'float64',
+    'M12_MAL_40_RAT': 'float64',
+    'M12_MAL_50_RAT': 'float64',
+    'M12_MAL_60_RAT': 'float64',
+    'M12_FME_1020_RAT': 'float64',
+    'M12_FME_30_RAT': 'float64',
+    'M12_FME_40_RAT': 'float64',
+    'M12_FME_50_RAT': 'float64',
+    'M12_FME_60_RAT': 'float64',
+    'MCT_UE_CLN_REU_RAT': 'float64',
+    'MCT_UE_CLN_NEW_RAT': 'float64',
+    'RC_M1_SHC_RSD_UE_CLN_RAT': 'float64',
+    'RC_M1_SHC_WP_UE_CLN_RAT': 'float64',
+    'RC_M1_SHC_FLP_UE_CLN_RAT': 'float64',
+}
 
 
 class DataLoader:
     """데이터셋 로드 및 병합을 위한 클래스"""
 
-    def __init__(self):
+    def __init__(
+        self,
+        use_cache: bool = False,
+        cache_dir: Optional[Path] = None,
+        typed: bool = False
+    ):
         """
         Raw 데이터 파일은 프로젝트의 data/raw/ 디렉토리에 고정
+
+        Args:
+            use_cache: True면 CSV를 최초 1회 컬럼 포맷(Parquet)으로 변환해 캐시하고
+                이후에는 캐시에서 로드 (CSV 내용이 바뀌면 자동 재생성)
+            cache_dir: 캐시 디렉토리 (None이면 data/cache/)
+            typed: True면 로드 직후 schema 모듈의 타입 적용
+                (ID/상권/업종 category, TA_YM int32, 구간 Int8 코드, 측정값 float32)
         """
         # 프로젝트 루트 디렉토리 (pipeline/preprocessing/data_loader.py 기준)
         project_root = Path(__file__).parent.parent.parent
@@ -27,55 +103,271 @@ class DataLoader:
         self.dataset2_path = raw_data_dir / "big_data_set2_f.csv"
         self.dataset3_path = raw_data_dir / "big_data_set3_f.csv"
 
-    def load_dataset1(self) -> pd.DataFrame:
+        self.use_cache = use_cache
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else project_root / "data" / "cache"
+        self.typed = typed
+
+        # 월 필터 적용 시 CSV를 나눠 읽는 행 수
+        self.chunksize = 200_000
+
+        # load_all 실행 시 파일별 로드 시간 (초)
+        self.load_times = {}
+
+    def _read_raw(
+        self,
+        path: Path,
+        dtypes: Dict[str, str],
+        columns: Optional[List[str]] = None,
+        ta_ym_range: Optional[Tuple[int, int]] = None
+    ) -> pd.DataFrame:
+        """
+        Raw CSV 로드 (캐시 모드면 컬럼 포맷 캐시 사용)
+
+        캐시 파일명에 원본 CSV의 내용 fingerprint를 포함하므로
+        CSV가 변경되면 새 캐시가 생성되고 이전 캐시는 삭제됨
+
+        columns / ta_ym_range는 읽는 시점에 적용:
+        - CSV: usecols로 컬럼 제외, chunk 단위로 읽으며 범위 밖 월 제외
+        - Parquet 캐시: 컬럼 projection 및 TA_YM 필터를 pyarrow에 전달
+
+        Args:
+            path: CSV 파일 경로
+            dtypes: 컬럼별 dtype
+            columns: 읽을 컬럼 (병합 키는 항상 포함, None이면 전체)
+            ta_ym_range: (시작 년월, 종료 년월) 포함 범위 (None이면 전체)
+
+        Returns:
+            데이터프레임
+        """
+        usecols = self._resolve_columns(path, columns)
+        filters = None
+        # Dataset 1처럼 TA_YM이 없는 파일은 월 필터를 적용하지 않음
+        if ta_ym_range is not None and 'TA_YM' in (usecols or self._read_header(path)):
+            filters = [('TA_YM', '>=', ta_ym_range[0]), ('TA_YM', '<=', ta_ym_range[1])]
+
+        if not self.use_cache:
+            return self._read_csv(path, dtypes, usecols, filters)
+
+        fingerprint = file_fingerprint(path)
+        cache_path = self.cache_dir / f"{path.stem}.{fingerprint}{FRAME_SUFFIX}"
+
+        if cache_path.exists():
+            print(f"Cache hit: {cache_path.name}")
+            return read_frame(cache_path, columns=usecols, filters=filters)
+
+        print(f"Cache miss: converting {path.name} -> {cache_path.name}")
+        df = pd.read_csv(path, encoding='cp949', dtype=dtypes)
+
+        # 같은 원본의 오래된 캐시 제거
+        for stale in self.cache_dir.glob(f"{path.stem}.*{FRAME_SUFFIX}"):
+            stale.unlink()
+        write_frame(df, cache_path)
+
+        # 캐시는 전체 데이터로 만들고, 이번 호출에는 요청한 부분만 반환
+        if usecols is not None or filters is not None:
+            return read_frame(cache_path, columns=usecols, filters=filters)
+        return df
+
+    def _read_header(self, path: Path) -> List[str]:
+        """
+        CSV 헤더(컬럼명)만 읽기
+
+        Args:
+            path: CSV 파일 경로
+
+        Returns:
+            컬럼명 리스트
+        """
+        return list(pd.read_csv(path, encoding='cp949', nrows=0).columns)
+
+    def _resolve_columns(self, path: Path, columns: Optional[List[str]]) -> Optional[List[str]]:
+        """
+        파일에 존재하는 요청 컬럼 + 병합 키 (파일 컬럼 순서 유지)
+
+        Args:
+            path: CSV 파일 경로
+            columns: 요청 컬럼 (None이면 전체)
+
+        Returns:
+            읽을 컬럼 리스트 (None이면 전체)
+        """
+        if columns is None:
+            return None
+        wanted = set(columns) | set(KEY_COLUMNS)
+        return [col for col in self._read_header(path) if col in wanted]
+
+    def _read_csv(
+        self,
+        path: Path,
+        dtypes: Dict[str, str],
+        usecols: Optional[List[str]],
+        filters: Optional[List[Tuple]]
+    ) -> pd.DataFrame:
+        """
+        CSV 로드 (월 필터가 있으면 chunk 단위로 읽으며 필터링)
+
+        Args:
+            path: CSV 파일 경로
+            dtypes: 컬럼별 dtype
+            usecols: 읽을 컬럼 (None이면 전체)
+            filters: [('TA_YM', '>=', 시작), ('TA_YM', '<=', 종료)] 또는 None
+
+        Returns:
+            데이터프레임
+        """
+        if filters is None:
+            return pd.read_csv(path, encoding='cp949', dtype=dtypes, usecols=usecols)
+
+        (_, _, start_ym), (_, _, end_ym) = filters
+        chunks = []
+        for chunk in pd.read_csv(path, encoding='cp949', dtype=dtypes, usecols=usecols,
+                                 chunksize=self.chunksize):
+            chunks.append(chunk[chunk['TA_YM'].between(start_ym, end_ym)])
+        # 데이터 행이 없는 파일은 chunk가 하나도 없음
+        if not chunks:
+            return pd.DataFrame(columns=usecols)
+        return pd.concat(chunks, ignore_index=True)
+
+    def _load(
+        self,
+        path: Path,
+        dtypes: Dict[str, str],
+        columns: Optional[List[str]] = None,
+        ta_ym_range: Optional[Tuple[int, int]] = None
+    ) -> pd.DataFrame:
+        """
+        Raw 로드 후 typed 옵션이면 스키마 적용
+
+        Args:
+            path: CSV 파일 경로
+            dtypes: 컬럼별 raw dtype
+            columns: 읽을 컬럼 (None이면 전체)
+            ta_ym_range: (시작 년월, 종료 년월) 포함 범위 (None이면 전체)
+
+        Returns:
+            데이터프레임
+        """
+        df = self._read_raw(path, dtypes, columns, ta_ym_range)
+        if self.typed:
+            df = apply_typed_schema(df)
+        return df
+
+    def load_dataset1(self, columns: Optional[List[str]] = None) -> pd.DataFrame:
         """
         Dataset 1 로드: 가맹점 기본정보
 
+        Args:
+            columns: 읽을 컬럼 (ENCODED_MCT는 항상 포함, None이면 전체)
+
         Returns:
             가맹점 기본정보 데이터프레임
         """
         print(f"Loading Dataset 1: {self.dataset1_path}")
-        df = pd.read_csv(self.dataset1_path, encoding='cp949')
+        df = self._load(self.dataset1_path, DATASET1_DTYPES, columns)
         print(f"Dataset 1 shape: {df.shape}")
         print(f"Dataset 1 columns: {list(df.columns)}")
         return df
 
-    def load_dataset2(self) -> pd.DataFrame:
+    def load_dataset2(
+        self,
+        columns: Optional[List[str]] = None,
+        ta_ym_range: Optional[Tuple[int, int]] = None
+    ) -> pd.DataFrame:
         """
         Dataset 2 로드: 월별 매출/이용 현황
 
+        Args:
+            columns: 읽을 컬럼 (ENCODED_MCT, TA_YM은 항상 포함, None이면 전체)
+            ta_ym_range: (시작 년월, 종료 년월) 포함 범위 (예: (202412, 202412))
+
         Returns:
             월별 매출/이용 데이터프레임
         """
         print(f"Loading Dataset 2: {self.dataset2_path}")
-        df = pd.read_csv(self.dataset2_path, encoding='cp949')
+        df = self._load(self.dataset2_path, DATASET2_DTYPES, columns, ta_ym_range)
         print(f"Dataset 2 shape: {df.shape}")
         print(f"Dataset 2 columns: {list(df.columns)[:10]}...")  # 처음 10개만 출력
         return df
 
-    def load_dataset3(self) -> pd.DataFrame:
+    def load_dataset3(
+        self,
+        columns: Optional[List[str]] = None,
+        ta_ym_range: Optional[Tuple[int, int]] = None
+    ) -> pd.DataFrame:
         """
         Dataset 3 로드: 월별 고객 정보
 
+        Args:
+            columns: 읽을 컬럼 (ENCODED_MCT, TA_YM은 항상 포함, None이면 전체)
+            ta_ym_range: (시작 년월, 종료 년월) 포함 범위 (예: (202412, 202412))
+
         Returns:
             월별 고객 정보 데이터프레임
         """
         print(f"Loading Dataset 3: {self.dataset3_path}")
-        df = pd.read_csv(self.dataset3_path, encoding='cp949')
+        df = self._load(self.dataset3_path, DATASET3_DTYPES, columns, ta_ym_range)
         print(f"Dataset 3 shape: {df.shape}")
         print(f"Dataset 3 columns: {list(df.columns)[:10]}...")  # 처음 10개만 출력
         return df
 
-    def load_all(self) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    def load_all(
+        self,
+        parallel: bool = False,
+        max_workers: int = 3,
+        executor: str = 'thread',
+        columns: Optional[List[str]] = None,
+        ta_ym_range: Optional[Tuple[int, int]] = None
+    ) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
         """
         모든 데이터셋 로드
 
+        parallel=True면 3개 파일을 풀에서 동시에 읽으므로
+        전체 소요 시간이 가장 큰 파일의 로드 시간에 가까워짐
+        파일별 소요 시간은 self.load_times에 저장
+
+        Args:
+            parallel: 병렬 로드 여부
+            max_workers: 병렬 로드 시 worker 수
+            executor: 'thread' (기본, 결과 복사 없음) 또는 'process'
+            columns: 읽을 컬럼 (각 데이터셋에 존재하는 것만 적용, 병합 키는 항상 포함)
+            ta_ym_range: (시작 년월, 종료 년월) 포함 범위 (Dataset 2, 3에만 적용)
+
         Returns:
             (dataset1, dataset2, dataset3) 튜플
         """
-        df1 = self.load_dataset1()
-        df2 = self.load_dataset2()
-        df3 = self.load_dataset3()
+        names = ['dataset1', 'dataset2', 'dataset3']
+        loaders = [
+            partial(self.load_dataset1, columns),
+            partial(self.load_dataset2, columns, ta_ym_range),
+            partial(self.load_dataset3, columns, ta_ym_range),
+        ]
+
+        start = time.perf_counter()
+        if not parallel:
+            timed_results = [_timed_call(loader) for loader in loaders]
+        else:
+            if executor == 'thread':
+                pool_cls = ThreadPoolExecutor
+            elif executor == 'process':
+                pool_cls = ProcessPoolExecutor
+            else:
+                raise ValueError(f"Unknown executor: {executor} (use 'thread' or 'process')")
+
+            with pool_cls(max_workers=max_workers) as pool:
+                futures = [pool.submit(_timed_call, loader) for loader in loaders]
+                timed_results = [future.result() for future in futures]
+        total_time = time.perf_counter() - start
+
+        self.load_times = {name: elapsed for name, (_, elapsed) in zip(names, timed_results)}
+
+        print("\n" + "="*60)
+        print(f"LOAD TIMES ({'parallel, ' + executor if parallel else 'sequential'})")
+        print("="*60)
+        for name, elapsed in self.load_times.items():
+            print(f"{name}: {elapsed:.2f}s")
+        print(f"Total wall time: {total_time:.2f}s")
+
+        df1, df2, df3 = (df for df, _ in timed_results)
         return df1, df2, df3
 
     def merge_datasets(
@@ -83,7 +375,9 @@ class DataLoader:
         df1: Optional[pd.DataFrame] = None,
         df2: Optional[pd.DataFrame] = None,
         df3: Optional[pd.DataFrame] = None,
-        validate_merge: bool = True
+        validate_merge: bool = True,
+        columns: Optional[List[str]] = None,
+        ta_ym_range: Optional[Tuple[int, int]] = None
     ) -> pd.DataFrame:
         """
         3개 데이터셋 병합
@@ -99,6 +393,9 @@ class DataLoader:
             df2: Dataset 2 (None이면 자동 로드)
             df3: Dataset 3 (None이면 자동 로드)
             validate_merge: 병합 결과 검증 여부
+            columns: 자동 로드 시 읽을 컬럼 (병합 키는 항상 포함)
+            ta_ym_range: 자동 로드 시 (시작 년월, 종료 년월) 포함 범위
+                (데이터프레임을 직접 넘기면 columns / ta_ym_range는 적용되지 않음)
 
         Returns:
             병합된 데이터프레임
@@ -106,7 +403,11 @@ class DataLoader:
         # 데이터가 제공되지 않으면 로드
         if df1 is None or df2 is None or df3 is None:
             print("Loading datasets...")
-            df1, df2, df3 = self.load_all()
+            df1, df2, df3 = self.load_all(columns=columns, ta_ym_range=ta_ym_range)
+
+        # typed 로드: 병합 키의 category 집합을 맞춰야 병합 후에도 category 유지
+        if any(isinstance(df['ENCODED_MCT'].dtype, pd.CategoricalDtype) for df in (df1, df2, df3)):
+            df1, df2, df3 = _align_categories([df1, df2, df3], MERCHANT_ID_COLUMNS)
 
         print("\n" + "="*60)
         print("STEP 1: Merging Dataset 2 + Dataset 3")
@@ -126,10 +427,7 @@ class DataLoader:
 
         if validate_merge:
             # 병합 손실 확인
-            original_rows = len(df2)
-            merged_rows = len(df_merged)
-            loss_rate = (original_rows - merged_rows) / original_rows * 100
-            print(f"Merge loss: {original_rows - merged_rows} rows ({loss_rate:.2f}%)")
+            _print_merge_loss(len(df2), len(df_merged))
 
         print("\n" + "="*60)
         print("STEP 2: Merging (2+3) + Dataset 1")
@@ -149,11 +447,7 @@ class DataLoader:
 
         if validate_merge:
             # 가맹점 정보 병합 확인
-            null_counts = df_full.isnull().sum()
-            if null_counts.sum() > 0:
-                print(f"\nWarning: Found {null_counts.sum()} null values after merge")
-                print("Top 5 columns with nulls:")
-                print(null_counts[null_counts > 0].head())
+            _print_null_summary(df_full.isnull().sum())
 
         print("\n" + "="*60)
         print("MERGE SUMMARY")
@@ -165,6 +459,187 @@ class DataLoader:
 
         return df_full
 
+    def iter_merged_partitions(
+        self,
+        n_partitions: int = 16,
+        shard_dir: Optional[Path] = None,
+        validate_merge: bool = True,
+        columns: Optional[List[str]] = None,
+        ta_ym_range: Optional[Tuple[int, int]] = None
+    ) -> Iterator[pd.DataFrame]:
+        """
+        가맹점 단위로 파티션을 나눠 병합 (메모리보다 큰 데이터용)
+
+        처리 순서:
+        1. Dataset 2, 3을 chunk 단위로 읽으며 hash(ENCODED_MCT) % n_partitions 기준으로
+           디스크 shard에 기록 (같은 가맹점은 항상 같은 파티션)
+        2. 파티션마다 Dataset 2 shard + Dataset 3 shard 병합 후 Dataset 1(가맹점 고정 정보) 병합
+        3. 병합된 파티션을 하나씩 반환
+
+        최대 메모리는 Dataset 1 + chunk 1개 + 파티션 1개 수준이며,
+        병합 손실 / 결측 통계는 merge_datasets와 같은 형식으로 마지막에 출력
+        typed 옵션이면 모든 파티션이 같은 dtype을 갖도록 파티션과 무관한 스키마를 적용
+        (category 집합은 전체 Dataset 1 기준, _partition_dtypes 참고)
+        결과 행 순서는 파티션 순서이므로 merge_datasets 결과와 다를 수 있음
+
+        Args:
+            n_partitions: 파티션 수
+            shard_dir: shard 저장 디렉토리 (None이면 임시 디렉토리 사용 후 삭제)
+            validate_merge: 병합 결과 검증 여부
+            columns: 읽을 컬럼 (병합 키는 항상 포함)
+            ta_ym_range: (시작 년월, 종료 년월) 포함 범위
+
+        Yields:
+            병합된 파티션 데이터프레임
+        """
+        df1 = self._read_raw(self.dataset1_path, DATASET1_DTYPES, columns)
+
+        with tempfile.TemporaryDirectory(prefix='merge_shards_') as tmp_dir:
+            shard_root = Path(shard_dir) if shard_dir is not None else Path(tmp_dir)
+
+            print("\n" + "="*60)
+            print(f"STEP 1: Partitioning Dataset 2, 3 into {n_partitions} shards")
+            print("="*60)
+            merchant_ids = self._write_shards(self.dataset2_path, DATASET2_DTYPES, shard_root / 'dataset2',
+                                              n_partitions, columns, ta_ym_range)
+            merchant_ids |= self._write_shards(self.dataset3_path, DATASET3_DTYPES, shard_root / 'dataset3',
+                                               n_partitions, columns, ta_ym_range)
+
+            partition_dtypes = _partition_dtypes(df1, merchant_ids) if self.typed else None
+
+            print("\n" + "="*60)
+            print("STEP 2: Merging partitions")
+            print("="*60)
+
+            original_rows = 0
+            merged_rows = 0
+            total_rows = 0
+            unique_merchants = 0
+            null_counts = None
+            min_ym, max_ym = None, None
+
+            for part in range(n_partitions):
+                df2 = _read_shard(shard_root / 'dataset2' / f"part-{part:03d}")
+                df3 = _read_shard(shard_root / 'dataset3' / f"part-{part:03d}")
+                if df2 is None or df3 is None:
+                    # 한쪽 shard가 비어 있으면 inner 병합 결과도 비어 있음
+                    original_rows += len(df2) if df2 is not None else 0
+                    continue
+
+                df_merged = df2.merge(
+                    df3,
+                    on=['ENCODED_MCT', 'TA_YM'],
+                    how='inner',
+                    suffixes=('_sales', '_customer')
+                )
+                df_full = df_merged.merge(
+                    df1,
+                    on='ENCODED_MCT',
+                    how='left',
+                    suffixes=('', '_info')
+                )
+
+                # 파티션끼리 가맹점이 겹치지 않으므로 통계는 합산 가능
+                # (결측 통계는 merge_datasets와 같이 타입 적용 전 값으로 계산)
+                original_rows += len(df2)
+                merged_rows += len(df_merged)
+                total_rows += len(df_full)
+                unique_merchants += df_full['ENCODED_MCT'].nunique()
+                part_nulls = df_full.isnull().sum()
+                null_counts = part_nulls if null_counts is None else null_counts.add(part_nulls, fill_value=0)
+
+                if self.typed:
+                    df_full = apply_typed_schema(df_full).astype(partition_dtypes)
+                if len(df_full) > 0:
+                    part_min, part_max = df_full['TA_YM'].min(), df_full['TA_YM'].max()
+                    min_ym = part_min if min_ym is None else min(min_ym, part_min)
+                    max_ym = part_max if max_ym is None else max(max_ym, part_max)
+
+                print(f"Partition {part:03d}: {df_full.shape}")
+                yield df_full
+
+        if validate_merge:
+            _print_merge_loss(original_rows, merged_rows)
+            if null_counts is not None:
+                _print_null_summary(null_counts.astype('int64'))
+
+        print("\n" + "="*60)
+        print("MERGE SUMMARY (PARTITIONED)")
+        print("="*60)
+        print(f"Total rows: {total_rows:,}")
+        print(f"Unique merchants: {unique_merchants:,}")
+        print(f"Date range: {min_ym} ~ {max_ym}")
+
+    def write_merged_partitions(
+        self,
+        output_dir: Path,
+        n_partitions: int = 16,
+        **kwargs
+    ) -> List[Path]:
+        """
+        파티션 병합 결과를 파일로 저장 (iter_merged_partitions 결과를 순서대로 기록)
+
+        Args:
+            output_dir: 저장 디렉토리
+            n_partitions: 파티션 수
+            **kwargs: iter_merged_partitions 인자 (shard_dir, validate_merge, columns, ta_ym_range)
+
+        Returns:
+            저장된 파티션 파일 경로 리스트
+        """
+        output_dir = Path(output_dir)
+        paths = []
+        for i, df_part in enumerate(self.iter_merged_partitions(n_partitions, **kwargs)):
+            paths.append(write_frame(df_part, output_dir / f"merged-{i:03d}{FRAME_SUFFIX}"))
+        print(f"Saved {len(paths)} partitions to: {output_dir}")
+        return paths
+
+    def _write_shards(
+        self,
+        path: Path,
+        dtypes: Dict[str, str],
+        shard_root: Path,
+        n_partitions: int,
+        columns: Optional[List[str]] = None,
+        ta_ym_range: Optional[Tuple[int, int]] = None
+    ) -> Set[str]:
+        """
+        CSV를 chunk 단위로 읽어 가맹점 hash 기준 shard로 기록
+
+        shard_root/part-XXX/chunk-YYYYY 파일로 저장하므로 한 번에 chunk 1개만 메모리에 올라감
+
+        Args:
+            path: CSV 파일 경로
+            dtypes: 컬럼별 dtype
+            shard_root: shard 저장 디렉토리
+            n_partitions: 파티션 수
+            columns: 읽을 컬럼 (None이면 전체)
+            ta_ym_range: (시작 년월, 종료 년월) 포함 범위
+
+        Returns:
+            기록된 가맹점 ID 집합 (파티션 공통 category 스키마용)
+        """
+        usecols = self._resolve_columns(path, columns)
+        total_rows = 0
+        merchant_ids = set()
+
+        # 이전 실행의 shard가 남아 있으면 중복 기록되므로 삭제
+        shutil.rmtree(shard_root, ignore_errors=True)
+
+        for i, chunk in enumerate(pd.read_csv(path, encoding='cp949', dtype=dtypes, usecols=usecols,
+                                              chunksize=self.chunksize)):
+            if ta_ym_range is not None:
+                chunk = chunk[chunk['TA_YM'].between(ta_ym_range[0], ta_ym_range[1])]
+
+            part_ids = pd.util.hash_pandas_object(chunk['ENCODED_MCT'], index=False).to_numpy() % n_partitions
+            for part, df_part in chunk.groupby(part_ids):
+                write_frame(df_part, shard_root / f"part-{part:03d}" / f"chunk-{i:05d}{FRAME_SUFFIX}")
+            merchant_ids.update(chunk['ENCODED_MCT'].dropna().unique())
+            total_rows += len(chunk)
+
+        print(f"{path.name}: {total_rows:,} rows -> {shard_root}")
+        return merchant_ids
+
     def get_merge_info(self, df: pd.DataFrame) -> dict:
         """
         병합된 데이터의 정보 요약
@@ -175,17 +650,139 @@ class DataLoader:
         Returns:
             정보 딕셔너리
         """
+        # 스키마 적용 전(pandas 기본 추론)/후(typed) 메모리 비교
+        footprint = memory_footprint(df)
+
         info = {
             'total_rows': len(df),
             'total_columns': len(df.columns),
             'unique_merchants': df['ENCODED_MCT'].nunique(),
             'date_range': (df['TA_YM'].min(), df['TA_YM'].max()),
             'months_count': df['TA_YM'].nunique(),
-            'memory_usage_mb': df.memory_usage(deep=True).sum() / 1024**2
+            'memory_usage_mb': df.memory_usage(deep=True).sum() / 1024**2,
+            'memory_untyped_mb': footprint['untyped_mb'],
+            'memory_typed_mb': footprint['typed_mb'],
+            'memory_reduction_pct': footprint['reduction_pct']
         }
         return info
 
 
+def _print_merge_loss(original_rows: int, merged_rows: int):
+    """
+    Dataset 2 대비 (2+3) 병합 손실 출력
+
+    Args:
+        original_rows: Dataset 2 행 수
+        merged_rows: (2+3) 병합 후 행 수
+    """
+    loss_rate = (original_rows - merged_rows) / original_rows * 100 if original_rows > 0 else 0.0
+    print(f"Merge loss: {original_rows - merged_rows} rows ({loss_rate:.2f}%)")
+
+
+def _print_null_summary(null_counts: pd.Series):
+    """
+    최종 병합 결과의 결측값 요약 출력
+
+    Args:
+        null_counts: 컬럼별 결측값 수
+    """
+    if null_counts.sum() > 0:
+        print(f"\nWarning: Found {null_counts.sum()} null values after merge")
+        print("Top 5 columns with nulls:")
+        print(null_counts[null_counts > 0].head())
+
+
+def _read_shard(part_dir: Path) -> Optional[pd.DataFrame]:
+    """
+    파티션 디렉토리의 chunk 파일들을 읽어 하나로 합침
+
+    Args:
+        part_dir: shard 파티션 디렉토리
+
+    Returns:
+        파티션 데이터프레임 (shard가 없으면 None)
+    """
+    if not part_dir.exists():
+        return None
+    chunks = [read_frame(path) for path in sorted(part_dir.glob(f"chunk-*{FRAME_SUFFIX}"))]
+    if not chunks:
+        return None
+    return pd.concat(chunks, ignore_index=True)
+
+
+def _partition_dtypes(df1: pd.DataFrame, merchant_ids: Set[str]) -> Dict[str, object]:
+    """
+    파티션 병합 결과에 공통으로 적용할 typed 스키마
+
+    typed_column을 파티션마다 적용하면 category 집합이 파티션 값으로 정해지므로
+    전체 데이터 기준으로 한 번만 결정
+    - 가맹점 ID: Dataset 1 + Dataset 2, 3 shard의 전체 ID 집합
+    - 주소/상권/업종 category: 전체 Dataset 1의 category 집합
+    - Dataset 1 정수 컬럼: Dataset 1에 없는 가맹점이 있으면 left 병합 결측이 생기므로 float64
+    나머지 컬럼(TA_YM int32, 구간 코드 Int8, 측정값 float32)은 typed_column 결과가 값과 무관하게 고정
+
+    Args:
+        df1: Dataset 1 (전체, 타입 적용 전)
+        merchant_ids: shard에 기록된 가맹점 ID 집합
+
+    Returns:
+        {컬럼: dtype} 딕셔너리
+    """
+    df1_typed = apply_typed_schema(df1)
+    df1_ids = set(df1['ENCODED_MCT'].dropna())
+    has_unmatched = not merchant_ids <= df1_ids
+
+    dtypes = {}
+    for col in df1_typed.columns:
+        dtype = df1_typed[col].dtype
+        if col in MERCHANT_ID_COLUMNS:
+            dtype = pd.CategoricalDtype(sorted(df1_ids | merchant_ids))
+        elif has_unmatched and pd.api.types.is_integer_dtype(dtype):
+            dtype = 'float64'
+        dtypes[col] = dtype
+    return dtypes
+
+
+def _align_categories(frames: List[pd.DataFrame], columns: List[str]) -> List[pd.DataFrame]:
+    """
+    여러 데이터프레임의 category 컬럼을 같은 category 집합으로 맞춤
+
+    category가 다르면 pandas 병합 결과가 object로 바뀌므로 병합 전에 호출
+
+    Args:
+        frames: 데이터프레임 리스트
+        columns: 맞출 컬럼 리스트
+
+    Returns:
+        category가 정렬된 합집합으로 통일된 데이터프레임 리스트
+    """
+    aligned = [df.copy(deep=False) for df in frames]
+    for col in columns:
+        categories = set()
+        for df in aligned:
+            values = df[col].cat.categories if isinstance(df[col].dtype, pd.CategoricalDtype) else df[col].dropna().unique()
+            categories.update(values)
+        dtype = pd.CategoricalDtype(sorted(categories))
+        for df in aligned:
+            df[col] = df[col].astype(dtype)
+    return aligned
+
+
+def _timed_call(loader: Callable[[], pd.DataFrame]) -> Tuple[pd.DataFrame, float]:
+    """
+    로드 함수 실행 및 소요 시간 측정 (process pool에서 pickle 가능하도록 모듈 레벨에 정의)
+
+    Args:
+        loader: 데이터프레임을 반환하는 로드 함수
+
+    Returns:
+        (데이터프레임, 소요 시간(초))
+    """
+    start = time.perf_counter()
+    df = loader()
+    return df, time.perf_counter() - start
+
+
 def load_and_merge_data() -> pd.DataFrame:
     """
     편의 함수: 데이터 로드 및 병합을 한번에 수행
@@ -8,9 +8,77 @@ Feature Encoder Module
 
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Optional, Tuple
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 from datetime import datetime
 
+if TYPE_CHECKING:
+    from .column_schema import ColumnSchemaRegistry
+
+
+# 6단계 구간 → 숫자 매핑
+# 실제 데이터에 존재하는 패턴만 포함
+INTERVAL_MAPPING = {
+    # 퍼센트 형식 (MCT_OPE_MS_CN, RC_M1_* 컬럼)
+    '1_10%이하': 1,
+    '2_10-25%': 2,
+    '3_25-50%': 3,
+    '4_50-75%': 4,
+    '5_75-90%': 5,
+    '6_90%초과(하위 10% 이하)': 6,
+    # 한글 구간 형식 (APV_CE_RAT 컬럼)
+    '1_상위1구간': 1,
+    '2_상위2구간': 2,
+    '3_상위3구간': 3,
+    '4_상위4구간': 4,
+    '5_상위5구간': 5,
+    '6_상위6구간(하위1구간)': 6,
+}
+
+# 구간 코드 dtype (nullable int8: 결측/매핑되지 않는 값은 <NA>)
+# 결측 유무와 관계없이 배치/파티션마다 같은 dtype, 셀당 1byte (+ 결측 mask 1byte)
+INTERVAL_CODE_DTYPE = 'Int8'
+
+# 월별 일수 (2월 윤년은 _to_month_index에서 보정)
+_DAYS_IN_MONTH = np.array([31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31], dtype=np.int32)
+
+# pd.to_datetime으로 표현 가능한 연도 범위 (범위 밖 값은 기존처럼 결측 처리)
+_MIN_YEAR = pd.Timestamp.min.year + 1
+_MAX_YEAR = pd.Timestamp.max.year - 1
+
+
+def _to_month_index(values: pd.Series, with_day: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    YYYYMM / YYYYMMDD 숫자를 월 인덱스 (yyyy*12 + mm - 1)로 변환
+
+    pd.to_datetime / 문자열 변환 없이 정수 연산만 사용
+
+    Args:
+        values: YYYYMM 또는 YYYYMMDD 값 (int / float / Int64, 결측 허용)
+        with_day: True면 YYYYMMDD 형식 (일자 유효성도 검사)
+
+    Returns:
+        (int32 월 인덱스, 유효 여부 bool 배열) - 결측/잘못된 날짜는 유효하지 않음
+    """
+    raw = pd.to_numeric(values, errors='coerce').to_numpy(dtype='float64', na_value=np.nan)
+    valid = np.isfinite(raw) & (raw == np.floor(raw)) & (raw > 0)
+    number = np.where(valid, raw, 0).astype(np.int64)
+
+    if with_day:
+        day = number % 100
+        number = number // 100
+    year = number // 100
+    month = number % 100
+
+    valid &= (year >= _MIN_YEAR) & (year <= _MAX_YEAR) & (month >= 1) & (month <= 12)
+
+    if with_day:
+        leap = (year % 4 == 0) & ((year % 100 != 0) | (year % 400 == 0))
+        month_days = _DAYS_IN_MONTH[np.clip(month - 1, 0, 11)] + (leap & (month == 2))
+        valid &= (day >= 1) & (day <= month_days)
+
+    month_index = np.where(valid, year * 12 + month - 1, 0).astype(np.int32)
+    return month_index, valid
+
 
 class FeatureEncoder:
     """특성 인코딩 및 타겟 변수 생성을 위한 클래스"""
@@ -18,23 +86,7 @@ class FeatureEncoder:
     def __init__(self):
         """구간 매핑 초기화"""
         # 6단계 구간 → 숫자 매핑
-        # 실제 데이터에 존재하는 패턴만 포함
-        self.interval_mapping = {
-            # 퍼센트 형식 (MCT_OPE_MS_CN, RC_M1_* 컬럼)
-            '1_10%이하': 1,
-            '2_10-25%': 2,
-            '3_25-50%': 3,
-            '4_50-75%': 4,
-            '5_75-90%': 5,
-            '6_90%초과(하위 10% 이하)': 6,
-            # 한글 구간 형식 (APV_CE_RAT 컬럼)
-            '1_상위1구간': 1,
-            '2_상위2구간': 2,
-            '3_상위3구간': 3,
-            '4_상위4구간': 4,
-            '5_상위5구간': 5,
-            '6_상위6구간(하위1구간)': 6,
-        }
+        self.interval_mapping = dict(INTERVAL_MAPPING)
 
         # 역매핑 (디버깅용)
         self.reverse_mapping = {
@@ -46,7 +98,11 @@ class FeatureEncoder:
             6: '6_90%초과(하위 10% 이하)'
         }
 
-    def identify_interval_columns(self, df: pd.DataFrame) -> List[str]:
+    def identify_interval_columns(
+        self,
+        df: pd.DataFrame,
+        registry: Optional['ColumnSchemaRegistry'] = None
+    ) -> List[str]:
         """
         구간 변수 컬럼 식별
 
@@ -54,6 +110,8 @@ class FeatureEncoder:
 
         Args:
             df: 데이터프레임
+            registry: 컬럼 스키마 레지스트리 (있으면 값을 스캔하지 않고 등록된 구간 변수 중
+                아직 인코딩되지 않은(object) 컬럼 반환)
 
         Returns:
             구간 변수 컬럼 리스트
@@ -61,8 +119,11 @@ class FeatureEncoder:
         interval_cols = []
 
         for col in df.columns:
+            if registry is not None:
+                if registry.is_interval(col) and df[col].dtype == 'object':
+                    interval_cols.append(col)
             # object 타입 중에서 구간 패턴을 포함하는 컬럼
-            if df[col].dtype == 'object':
+            elif df[col].dtype == 'object':
                 sample_values = df[col].dropna().unique()[:10]
                 sample_str = ' '.join(str(v) for v in sample_values)
 
@@ -121,7 +182,8 @@ class FeatureEncoder:
         self,
         df: pd.DataFrame,
         columns: Optional[List[str]] = None,
-        keep_original: bool = False
+        keep_original: bool = False,
+        registry: Optional['ColumnSchemaRegistry'] = None
     ) -> Tuple[pd.DataFrame, List[str]]:
         """
         모든 구간 변수 인코딩
@@ -130,6 +192,7 @@ class FeatureEncoder:
             df: 데이터프레임
             columns: 인코딩할 컬럼 리스트 (None이면 자동 식별)
             keep_original: 원본 컬럼 유지 여부
+            registry: 컬럼 스키마 레지스트리 (자동 식별 시 데이터 스캔 대신 사용)
 
         Returns:
             (인코딩된 데이터프레임, 인코딩된 컬럼 리스트)
@@ -138,21 +201,73 @@ class FeatureEncoder:
         print("ENCODING INTERVAL COLUMNS")
         print("="*60)
 
-        df_encoded = df.copy()
-
         # 컬럼 자동 식별
         if columns is None:
-            columns = self.identify_interval_columns(df)
+            columns = self.identify_interval_columns(df, registry)
 
         print(f"\nEncoding {len(columns)} columns...")
 
+        df_encoded, encoded_cols = self.encode_interval_columns_bulk(df, columns, keep_original)
+
+        print(f"\nSuccessfully encoded {len(encoded_cols)} columns")
+
+        return df_encoded, encoded_cols
+
+    def encode_interval_columns_bulk(
+        self,
+        df: pd.DataFrame,
+        columns: List[str],
+        keep_original: bool = False
+    ) -> Tuple[pd.DataFrame, List[str]]:
+        """
+        여러 구간 변수를 한번에 인코딩 (코드 lookup table 사용)
+
+        interval_mapping의 라벨 목록으로 컬럼 값의 위치(get_indexer)를 구한 뒤
+        코드 배열에서 바로 조회하므로 컬럼마다 dict map / 데이터프레임 복사를 하지 않음
+        - 결과: 항상 INTERVAL_CODE_DTYPE(Int8) 코드 (결측/매핑되지 않는 값은 <NA>)
+        - 매핑되지 않는 값은 같은 lookup 결과로 함께 보고
+        - 인코딩하지 않는 컬럼은 복사하지 않음 (shallow copy)
+        - 이미 코드인 컬럼 (typed 로드의 Int8)은 그대로 사용
+
+        Args:
+            df: 데이터프레임
+            columns: 인코딩할 컬럼 리스트
+            keep_original: 원본 컬럼 유지 여부 ('{컬럼}_original')
+
+        Returns:
+            (인코딩된 데이터프레임, 인코딩된 컬럼 리스트)
+        """
+        labels = pd.Index(list(self.interval_mapping))
+        # 마지막 칸은 get_indexer의 -1 (매핑 없음) 위치 (값은 mask로 <NA> 처리)
+        code_table = np.zeros(len(labels) + 1, dtype=np.int8)
+        code_table[:-1] = list(self.interval_mapping.values())
+
+        df_encoded = df.copy(deep=False)
         encoded_cols = []
+
         for col in columns:
-            df_encoded = self.encode_interval_column(df_encoded, col, keep_original)
+            if col not in df.columns:
+                print(f"Warning: Column '{col}' not found")
+                continue
+
+            original = df[col]
+            if original.dtype == INTERVAL_CODE_DTYPE:
+                encoded_cols.append(col)
+                continue
+
+            positions = labels.get_indexer(original)
+            missing = positions == -1
+            if missing.any():
+                unmapped = missing & original.notna().to_numpy()
+                if unmapped.any():
+                    print(f"Warning: {unmapped.sum()} unmapped values in '{col}':")
+                    print(f"  Unique values: {pd.unique(original[unmapped])[:5]}")
+            df_encoded[col] = pd.arrays.IntegerArray(code_table[positions], missing)
+
+            if keep_original:
+                df_encoded[f'{col}_original'] = original
             encoded_cols.append(col)
 
-        print(f"\nSuccessfully encoded {len(encoded_cols)} columns")
-
         return df_encoded, encoded_cols
 
     def create_target_variables(
@@ -161,7 +276,8 @@ class FeatureEncoder:
         close_date_col: str = 'MCT_ME_D',
         date_col: str = 'TA_YM',
         merchant_col: str = 'ENCODED_MCT',
-        prediction_window: int = 3
+        prediction_window: int = 3,
+        horizons: Optional[List[int]] = None
     ) -> pd.DataFrame:
         """
         타겟 변수 생성 (Data Leakage 방지)
@@ -169,6 +285,7 @@ class FeatureEncoder:
         생성 변수:
         - will_close_1m: 1개월 내 폐업 예정 (0/1) - 미래 1개월 예측
         - will_close_3m: 3개월 내 폐업 예정 (0/1) - 미래 3개월 예측 (주 타겟)
+        - will_close_{k}m: horizons 지정 시 k개월 내 폐업 예정 (0/1)
         - months_until_close: 폐업까지 남은 개월 수 (참고용, feature로 사용 금지)
         - is_valid_for_training: 학습에 사용 가능한 데이터인지 여부 (폐업 직전 제외)
 
@@ -182,6 +299,7 @@ class FeatureEncoder:
             date_col: 년월 컬럼명
             merchant_col: 가맹점 ID 컬럼명
             prediction_window: 예측 윈도우 (개월)
+            horizons: 생성할 예측 기간 리스트 (개월, 기본값 [1, 3])
 
         Returns:
             타겟 변수가 추가된 데이터프레임
@@ -190,48 +308,27 @@ class FeatureEncoder:
         print("CREATING TARGET VARIABLES (NO DATA LEAKAGE)")
         print("="*60)
 
-        df_target = df.copy()
+        horizons = [1, 3] if horizons is None else sorted(set(horizons))
+        df_target = df.copy(deep=False)
 
-        # 1. 날짜 변환
-        # TA_YM: YYYYMM 형식 → datetime
-        df_target['date_parsed'] = pd.to_datetime(
-            df_target[date_col].astype(str),
-            format='%Y%m',
-            errors='coerce'
-        )
+        # 1. 월 인덱스 변환 (yyyy*12 + mm, 정수 연산)
+        # TA_YM: YYYYMM, MCT_ME_D: 폐업일 YYYYMMDD
+        has_close_date = df_target[close_date_col].notna().to_numpy()
+        date_index, date_valid = _to_month_index(df_target[date_col])
+        close_index, close_valid = _to_month_index(df_target[close_date_col], with_day=True)
 
-        # MCT_ME_D: 폐업일 → datetime (YYYYMMDD 형식)
-        # float/int → str → datetime 변환
-        has_close_date = df_target[close_date_col].notna()
-        df_target['close_date_parsed'] = pd.to_datetime(
-            df_target[close_date_col].astype('Int64').astype(str),
-            format='%Y%m%d',
-            errors='coerce'
-        )
-
-        # 2. 폐업까지 남은 개월 수 계산
-        df_target['months_until_close'] = np.nan
+        # 2. 폐업까지 남은 개월 수 계산 (폐업 가맹점만)
+        known = date_valid & close_valid
+        months_until_close = np.where(known, close_index - date_index, 0).astype(np.int32)
+        df_target['months_until_close'] = np.where(known, months_until_close, np.nan)
 
-        # 폐업 가맹점만 계산
-        df_target.loc[has_close_date, 'months_until_close'] = (
-            (df_target.loc[has_close_date, 'close_date_parsed'].dt.year -
-             df_target.loc[has_close_date, 'date_parsed'].dt.year) * 12 +
-            (df_target.loc[has_close_date, 'close_date_parsed'].dt.month -
-             df_target.loc[has_close_date, 'date_parsed'].dt.month)
-        )
-
-        # 3. 미래 N개월 내 폐업 예정 (올바른 방법)
+        # 3. 미래 N개월 내 폐업 예정 (모든 horizon을 한번에 계산)
         # months_until_close > 0: 아직 폐업하지 않은 시점
         # months_until_close <= N: N개월 이내에 폐업 예정
-        df_target['will_close_1m'] = (
-            (df_target['months_until_close'] > 0) &
-            (df_target['months_until_close'] <= 1)
-        ).astype(int)
-
-        df_target['will_close_3m'] = (
-            (df_target['months_until_close'] > 0) &
-            (df_target['months_until_close'] <= 3)
-        ).astype(int)
+        not_closed_yet = known & (months_until_close > 0)
+        within = not_closed_yet[:, None] & (months_until_close[:, None] <= np.asarray(horizons, dtype=np.int32))
+        for j, horizon in enumerate(horizons):
+            df_target[f'will_close_{horizon}m'] = within[:, j].astype(int)
 
         # 4. 학습 데이터로 사용 가능한지 여부
         # - 영업 중인 가맹점 (close_date가 없음): 사용 가능
@@ -239,7 +336,7 @@ class FeatureEncoder:
         # - 이미 폐업했거나 폐업 당월 (months_until_close <= 0): 사용 불가 (data leakage)
         df_target['is_valid_for_training'] = (
             (~has_close_date) |  # 영업 중
-            (df_target['months_until_close'] > 0)  # 폐업 전
+            not_closed_yet  # 폐업 전
         ).astype(int)
 
         # 통계 출력
@@ -257,16 +354,14 @@ class FeatureEncoder:
 
         print(f"\nTarget distribution (valid data only):")
         valid_data = df_target[df_target['is_valid_for_training'] == 1]
-        print(f"will_close_1m = 1: {valid_data['will_close_1m'].sum():,} ({valid_data['will_close_1m'].sum()/len(valid_data)*100:.2f}%)")
-        print(f"will_close_3m = 1: {valid_data['will_close_3m'].sum():,} ({valid_data['will_close_3m'].sum()/len(valid_data)*100:.2f}%)")
+        for horizon in horizons:
+            target_col = f'will_close_{horizon}m'
+            print(f"{target_col} = 1: {valid_data[target_col].sum():,} ({valid_data[target_col].sum()/len(valid_data)*100:.2f}%)")
 
         if df_target['months_until_close'].notna().sum() > 0:
             print(f"\nMonths until close (for merchants with close date):")
             print(df_target[df_target['months_until_close'].notna()]['months_until_close'].describe())
 
-        # 임시 컬럼 제거
-        df_target.drop(['date_parsed', 'close_date_parsed'], axis=1, inplace=True)
-
         print("\n" + "="*60)
         print("IMPORTANT: Use only records where is_valid_for_training=1")
         print("="*60)
@@ -0,0 +1,209 @@
+"""
+Merchant Store Module
+
+가맹점 단위 조회용 패널 저장소
+- 가맹점 ID → TA_YM 순으로 정렬된(가맹점별로 연속된) CSV 파일
+- 가맹점별 byte offset 인덱스(JSON)
+
+한 가맹점의 전체 이력(최대 24개월)을 파일 전체 스캔 없이
+seek + 해당 구간만 읽어서 조회 (UI export / API 용)
+"""
+
+import io
+import json
+import os
+import pandas as pd
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+
+
+PANEL_FILE = 'panel.csv'
+INDEX_FILE = 'index.json'
+
+
+class MerchantPanelStore:
+    """가맹점 ID 기준 random access 패널 저장소"""
+
+    def __init__(
+        self,
+        store_dir: Path,
+        merchant_col: str = 'ENCODED_MCT',
+        date_col: str = 'TA_YM'
+    ):
+        """
+        Args:
+            store_dir: 저장소 디렉토리 (panel.csv, index.json)
+            merchant_col: 가맹점 ID 컬럼명
+            date_col: 년월 컬럼명 (가맹점 내 정렬 기준)
+        """
+        self.store_dir = Path(store_dir)
+        self.panel_path = self.store_dir / PANEL_FILE
+        self.index_path = self.store_dir / INDEX_FILE
+        self.merchant_col = merchant_col
+        self.date_col = date_col
+        self._index = None
+
+    def exists(self) -> bool:
+        """저장소 파일 존재 여부"""
+        return self.panel_path.exists() and self.index_path.exists()
+
+    def write(
+        self,
+        frames: Union[pd.DataFrame, Iterable[pd.DataFrame]],
+        sources: Optional[List[Path]] = None
+    ) -> 'MerchantPanelStore':
+        """
+        패널을 가맹점 단위로 정렬하여 저장하고 offset 인덱스 생성
+
+        frames에 DataLoader.iter_merged_partitions 결과를 그대로 넘기면
+        전체 패널을 메모리에 올리지 않고 파티션 단위로 기록
+        (같은 가맹점이 여러 frame에 나뉘어 있으면 안 됨)
+
+        Args:
+            frames: 패널 데이터프레임 또는 가맹점 단위 파티션 iterable
+            sources: 원본 파일 경로 (is_current 확인용 크기/수정시각 기록)
+
+        Returns:
+            self
+        """
+        if isinstance(frames, pd.DataFrame):
+            frames = [frames]
+
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.panel_path.with_name(PANEL_FILE + '.tmp')
+
+        merchants = {}
+        columns = None
+        dtypes = None
+        total_rows = 0
+
+        print(f"\nWriting merchant store: {self.store_dir}")
+
+        with open(tmp_path, 'wb') as f:
+            for df in frames:
+                if columns is None:
+                    columns = list(df.columns)
+                    dtypes = {col: _storage_dtype(df[col]) for col in columns}
+                    f.write(df.head(0).to_csv(index=False, lineterminator='\n').encode('utf-8'))
+                else:
+                    # dtype은 첫 frame 기준으로 기록하므로 파티션마다 다르면 복원이 실패함
+                    frame_dtypes = {col: _storage_dtype(df[col]) for col in columns}
+                    if frame_dtypes != dtypes:
+                        changed = [col for col in columns if frame_dtypes[col] != dtypes[col]]
+                        raise ValueError(f"Partition dtypes differ from the first partition: {changed}")
+
+                df = df[columns].sort_values([self.merchant_col, self.date_col], kind='stable')
+                for merchant, df_merchant in df.groupby(self.merchant_col, sort=False, observed=True):
+                    if merchant in merchants:
+                        raise ValueError(f"Merchant '{merchant}' appears in more than one partition")
+                    block = df_merchant.to_csv(index=False, header=False, lineterminator='\n').encode('utf-8')
+                    merchants[str(merchant)] = [f.tell(), len(block), len(df_merchant)]
+                    f.write(block)
+                total_rows += len(df)
+
+        tmp_path.replace(self.panel_path)
+
+        index = {
+            'merchant_col': self.merchant_col,
+            'date_col': self.date_col,
+            'columns': columns,
+            'dtypes': dtypes,
+            'rows': total_rows,
+            'sources': {str(path): _source_stat(path) for path in (sources or [])},
+            'merchants': merchants,
+        }
+        with open(self.index_path, 'w', encoding='utf-8') as f:
+            json.dump(index, f, ensure_ascii=False)
+        self._index = index
+
+        print(f"Stored {total_rows:,} rows for {len(merchants):,} merchants")
+
+        return self
+
+    def is_current(self, sources: List[Path]) -> bool:
+        """
+        저장소가 원본 파일 기준으로 최신인지 확인 (크기 + 수정시각 비교)
+
+        Args:
+            sources: 원본 파일 경로
+
+        Returns:
+            저장소가 존재하고 원본이 바뀌지 않았으면 True
+        """
+        if not self.exists():
+            return False
+        recorded = self.index.get('sources', {})
+        return all(recorded.get(str(path)) == _source_stat(path) for path in sources)
+
+    @property
+    def index(self) -> Dict:
+        """offset 인덱스 (처음 접근 시 로드)"""
+        if self._index is None:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                self._index = json.load(f)
+        return self._index
+
+    def merchants(self) -> List[str]:
+        """저장된 가맹점 ID 리스트"""
+        return list(self.index['merchants'])
+
+    def __contains__(self, merchant_id: str) -> bool:
+        return merchant_id in self.index['merchants']
+
+    def __len__(self) -> int:
+        return len(self.index['merchants'])
+
+    def get(self, merchant_id: str) -> pd.DataFrame:
+        """
+        가맹점 1개의 전체 이력 조회
+
+        Args:
+            merchant_id: 가맹점 ID
+
+        Returns:
+            TA_YM 순 데이터프레임 (없는 가맹점이면 빈 데이터프레임)
+        """
+        return self.get_many([merchant_id])
+
+    def get_many(self, merchant_ids: List[str]) -> pd.DataFrame:
+        """
+        여러 가맹점 이력 조회 (파일 위치 순으로 읽어 seek 최소화)
+
+        Args:
+            merchant_ids: 가맹점 ID 리스트
+
+        Returns:
+            데이터프레임 (가맹점은 저장 순서, 가맹점 내부는 TA_YM 순)
+        """
+        offsets = self.index['merchants']
+        spans = sorted(offsets[m][:2] for m in set(merchant_ids) if m in offsets)
+
+        buffer = io.BytesIO()
+        with open(self.panel_path, 'rb') as f:
+            buffer.write(f.readline())
+            for offset, length in spans:
+                f.seek(offset)
+                buffer.write(f.read(length))
+        buffer.seek(0)
+
+        return self._parse(buffer)
+
+    def _parse(self, buffer: io.BytesIO) -> pd.DataFrame:
+        """CSV 블록을 저장 시점 dtype으로 복원"""
+        dtypes = self.index['dtypes']
+        object_cols = {col: 'object' for col, dtype in dtypes.items() if dtype == 'object'}
+        df = pd.read_csv(buffer, encoding='utf-8', dtype=object_cols)
+        return df.astype({col: dtype for col, dtype in dtypes.items() if dtype != 'object'})
+
+
+def _storage_dtype(series: pd.Series) -> str:
+    """CSV 복원 시 사용할 dtype (category는 문자열로 저장)"""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return 'object'
+    return str(series.dtype)
+
+
+def _source_stat(path: Path) -> List[int]:
+    """원본 파일 크기 / 수정시각 (ns)"""
+    stat = os.stat(path)
+    return [stat.st_size, stat.st_mtime_ns]
@@ -7,10 +7,20 @@ Missing Value Handler Module
 - 고객 정보: 중앙값 또는 플래그 생성
 """
 
+import json
 import pandas as pd
 import numpy as np
 from typing import List, Dict, Optional, Tuple
 
+from .column_schema import ColumnSchemaRegistry, classify_column
+from .feature_encoder import INTERVAL_CODE_DTYPE
+from .missing_mask import MissingMask
+
+
+# SV 감지/대체 대상 숫자형 dtype (typed 스키마의 float32, int32 포함)
+# 구간 변수 Int8 코드는 제외 (untyped 로드에서 문자열이라 대체 대상이 아닌 것과 동일)
+NUMERIC_DTYPES = ['float64', 'int64', 'float32', 'int32']
+
 
 class MissingValueHandler:
     """결측값 처리를 위한 클래스"""
@@ -22,6 +32,8 @@ class MissingValueHandler:
         """
         self.sv_value = sv_value
         self.imputation_stats = {}  # 대체 통계 저장
+        self.column_types = None    # fit 시 컬럼 타입 분류
+        self.strategy = None        # fit 시 대체 전략
 
     def detect_sv(self, df: pd.DataFrame, threshold: float = -999999.0) -> pd.DataFrame:
         """
@@ -36,28 +48,9 @@ class MissingValueHandler:
         """
         print("Detecting SV (Special Values)...")
 
-        sv_stats = []
-        for col in df.columns:
-            if df[col].dtype in ['float64', 'int64']:
-                sv_count = (df[col] <= threshold).sum()
-                if sv_count > 0:
-                    sv_ratio = sv_count / len(df) * 100
-                    sv_stats.append({
-                        'column': col,
-                        'sv_count': sv_count,
-                        'sv_ratio': sv_ratio,
-                        'total_rows': len(df)
-                    })
-
-        sv_df = pd.DataFrame(sv_stats).sort_values('sv_count', ascending=False)
-
-        if len(sv_df) > 0:
-            print(f"\nFound SV in {len(sv_df)} columns")
-            print(f"Total SV values: {sv_df['sv_count'].sum():,}")
-            print("\nTop 10 columns with SV:")
-            print(sv_df.head(10).to_string(index=False))
-        else:
-            print("No SV values found")
+        columns, sv_mask = _sv_mask(df, threshold)
+        sv_df = _sv_stats(columns, sv_mask.sum(axis=0), len(df))
+        _print_sv_stats(sv_df)
 
         return sv_df
 
@@ -72,28 +65,66 @@ class MissingValueHandler:
         Returns:
             SV가 NaN으로 변환된 데이터프레임
         """
-        print(f"\nReplacing SV (values <= {threshold}) with NaN...")
+        df_clean, _ = self.clean_sv(df, threshold, report=False)
+        return df_clean
 
-        df_clean = df.copy()
-        replaced_count = 0
+    def clean_sv(
+        self,
+        df: pd.DataFrame,
+        threshold: float = -999999.0,
+        inplace: bool = False,
+        report: bool = True
+    ) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        SV 감지 + NaN 변환을 한번에 수행
 
-        for col in df_clean.columns:
-            if df_clean[col].dtype in ['float64', 'int64']:
-                sv_mask = df_clean[col] <= threshold
-                count = sv_mask.sum()
-                if count > 0:
-                    df_clean.loc[sv_mask, col] = np.nan
-                    replaced_count += count
+        숫자형 컬럼 전체를 (행 x 컬럼) bool mask 하나로 한 번만 비교하고,
+        SV가 있는 컬럼만 새 배열로 교체 (나머지 컬럼은 원본 배열 공유)
+        → 최대 메모리: 원본 + bool mask + SV가 있는 컬럼
 
-        print(f"Replaced {replaced_count:,} SV values with NaN")
-        return df_clean
+        Args:
+            df: 데이터프레임
+            threshold: SV 판단 기준값
+            inplace: True면 df를 직접 수정
+            report: SV 통계 출력 여부
 
-    def identify_column_types(self, df: pd.DataFrame) -> Dict[str, List[str]]:
+        Returns:
+            (SV가 NaN으로 변환된 데이터프레임, SV 통계 데이터프레임)
+        """
+        if report:
+            print("Detecting SV (Special Values)...")
+
+        columns, sv_mask = _sv_mask(df, threshold)
+        sv_counts = sv_mask.sum(axis=0)
+        sv_df = _sv_stats(columns, sv_counts, len(df))
+        if report:
+            _print_sv_stats(sv_df)
+            print(f"\nReplacing SV (values <= {threshold}) with NaN...")
+
+        df_clean = df if inplace else df.copy(deep=False)
+        for j in np.flatnonzero(sv_counts):
+            col = columns[j]
+            # 정수형은 NaN 표현을 위해 float64로 변환 (기존 loc 대입과 동일한 결과 타입)
+            values = df_clean[col].to_numpy()
+            if values.dtype.kind == 'i':
+                values = values.astype('float64')
+            df_clean[col] = np.where(sv_mask[:, j], np.nan, values)
+
+        if report:
+            print(f"Replaced {int(sv_counts.sum()):,} SV values with NaN")
+        return df_clean, sv_df
+
+    def identify_column_types(
+        self,
+        df: pd.DataFrame,
+        registry: Optional[ColumnSchemaRegistry] = None
+    ) -> Dict[str, List[str]]:
         """
         컬럼을 카테고리별로 분류
 
         Args:
             df: 데이터프레임
+            registry: 컬럼 스키마 레지스트리 (있으면 등록된 컬럼은 규칙 검사 없이 조회)
 
         Returns:
             카테고리별 컬럼 리스트 딕셔너리
@@ -110,32 +141,10 @@ class MissingValueHandler:
         }
 
         for col in df.columns:
-            col_lower = col.lower()
-
-            # 배달 관련
-            if 'dlv' in col_lower or 'delivery' in col_lower or '배달' in col_lower:
-                column_types['delivery'].append(col)
-            # 매출 관련
-            elif 'saa' in col_lower or 'sales' in col_lower or '매출' in col_lower:
-                column_types['sales'].append(col)
-            # 고객 관련
-            elif 'cus' in col_lower or 'customer' in col_lower or '고객' in col_lower:
-                column_types['customer'].append(col)
-            # 비율/순위
-            elif 'rat' in col_lower or 'pce' in col_lower or 'ratio' in col_lower or 'rank' in col_lower:
-                column_types['ratio'].append(col)
-            # 날짜
-            elif 'ym' in col_lower or 'date' in col_lower or '_d' in col_lower:
-                column_types['date'].append(col)
-            # ID
-            elif 'mct' in col_lower or 'id' in col_lower or 'encoded' in col_lower:
-                column_types['id'].append(col)
-            # 범주형 (object 타입)
-            elif df[col].dtype == 'object':
-                column_types['category'].append(col)
-            # 기타
+            if registry is not None and col in registry:
+                column_types[registry.role(col)].append(col)
             else:
-                column_types['other'].append(col)
+                column_types[classify_column(col, df[col].dtype)].append(col)
 
         # 결과 출력
         print("\n" + "="*60)
@@ -163,9 +172,13 @@ class MissingValueHandler:
         - 비율 관련: 중앙값
         - 범주형: 최빈값
 
+        'group' 전략은 중앙값 대상 컬럼을 가맹점의 이전 월 중앙값 → 상권(HPSN_MCT_BZN_CD_NM) x 월
+        중앙값 → 전체 중앙값 순으로 대체 (impute_group_medians 참고)
+
         Args:
             df: 데이터프레임
-            strategy: 대체 전략 ('auto', 'median', 'mean', 'zero')
+            strategy: 대체 전략 ('auto', 'group', 'median', 'mean', 'zero')
+                'auto', 'group' 외에는 숫자형 컬럼 전체(날짜/ID 포함)에 해당 통계값 사용
             column_types: 컬럼 타입 분류 (None이면 자동 분류)
 
         Returns:
@@ -183,79 +196,29 @@ class MissingValueHandler:
 
         imputation_log = []
 
-        # 1. 배달 관련: 0으로 대체
-        for col in column_types['delivery']:
-            if df_imputed[col].isnull().sum() > 0:
-                null_count = df_imputed[col].isnull().sum()
-                df_imputed[col] = df_imputed[col].fillna(0)
-                imputation_log.append({
-                    'column': col,
-                    'type': 'delivery',
-                    'method': 'zero',
-                    'null_count': null_count
-                })
-                self.imputation_stats[col] = {'method': 'zero', 'value': 0}
-
-        # 2. 매출/고객/비율 관련: 중앙값 (숫자형만)
-        for col_type in ['sales', 'customer', 'ratio']:
-            for col in column_types[col_type]:
-                if df_imputed[col].isnull().sum() > 0:
-                    # 숫자형만 처리 (구간 변수 제외)
-                    if df_imputed[col].dtype in ['float64', 'int64']:
-                        null_count = df_imputed[col].isnull().sum()
-                        median_val = df_imputed[col].median()
-                        df_imputed[col] = df_imputed[col].fillna(median_val)
-                        imputation_log.append({
-                            'column': col,
-                            'type': col_type,
-                            'method': 'median',
-                            'null_count': null_count
-                        })
-                        self.imputation_stats[col] = {'method': 'median', 'value': median_val}
-
-        # 3. 범주형: 최빈값 또는 'Unknown'
-        for col in column_types['category']:
-            if df_imputed[col].isnull().sum() > 0:
-                null_count = df_imputed[col].isnull().sum()
-                if len(df_imputed[col].mode()) > 0:
-                    mode_val = df_imputed[col].mode()[0]
-                    df_imputed[col] = df_imputed[col].fillna(mode_val)
-                    method = 'mode'
-                    fill_val = mode_val
-                else:
-                    df_imputed[col] = df_imputed[col].fillna('Unknown')
-                    method = 'constant'
-                    fill_val = 'Unknown'
-
-                imputation_log.append({
-                    'column': col,
-                    'type': 'category',
-                    'method': method,
-                    'null_count': null_count
-                })
-                self.imputation_stats[col] = {'method': method, 'value': fill_val}
-
-        # 4. 기타: 중앙값 (숫자형) 또는 'Unknown' (문자형)
-        for col in column_types['other']:
-            if df_imputed[col].isnull().sum() > 0:
-                null_count = df_imputed[col].isnull().sum()
-                if df_imputed[col].dtype in ['float64', 'int64']:
-                    median_val = df_imputed[col].median()
-                    df_imputed[col] = df_imputed[col].fillna(median_val)
-                    method = 'median'
-                    fill_val = median_val
-                else:
-                    df_imputed[col] = df_imputed[col].fillna('Unknown')
-                    method = 'constant'
-                    fill_val = 'Unknown'
-
-                imputation_log.append({
-                    'column': col,
-                    'type': 'other',
-                    'method': method,
-                    'null_count': null_count
-                })
-                self.imputation_stats[col] = {'method': method, 'value': fill_val}
+        # 결측값이 있는 컬럼만 대체 통계 계산 (결측 개수는 한 번만 계산)
+        null_counts = df.isnull().sum()
+        null_columns = null_counts.index[null_counts > 0]
+        fill_stats = self._fit_stats(df[null_columns], column_types, strategy)
+
+        # 'group': 중앙값 대상 컬럼을 가맹점 이력 / 상권 x 월 중앙값으로 먼저 대체
+        if strategy == 'group':
+            group_columns = [col for col, stats in fill_stats.items() if stats['method'] == 'median']
+            self.impute_group_medians(df_imputed, group_columns, inplace=True)
+            for col in group_columns:
+                fill_stats[col]['method'] = 'group'
+
+        # 나머지(전체 통계값) 대체는 컬럼별 대체값 딕셔너리로 한번에 수행
+        df_imputed = df_imputed.fillna({col: stats['value'] for col, stats in fill_stats.items()})
+
+        for col, stats in fill_stats.items():
+            imputation_log.append({
+                'column': col,
+                'type': stats['type'],
+                'method': stats['method'],
+                'null_count': null_counts[col]
+            })
+            self.imputation_stats[col] = {'method': stats['method'], 'value': stats['value']}
 
         # 로그 출력
         if imputation_log:
@@ -273,6 +236,266 @@ class MissingValueHandler:
 
         return df_imputed
 
+    def impute_group_medians(
+        self,
+        df: pd.DataFrame,
+        columns: List[str],
+        merchant_col: str = 'ENCODED_MCT',
+        zone_col: str = 'HPSN_MCT_BZN_CD_NM',
+        date_col: str = 'TA_YM',
+        inplace: bool = False
+    ) -> pd.DataFrame:
+        """
+        계층별 그룹 중앙값으로 결측값 대체
+
+        1. 같은 가맹점의 이전 월까지 중앙값 (TA_YM 순 expanding 중앙값을 1행 shift)
+        2. 이력이 없으면 같은 상권 x 같은 월 중앙값
+        3. (남은 결측은 impute_missing_values에서 전체 중앙값으로 대체)
+
+        가맹점 단계는 해당 월 이후 값을 사용하지 않으므로 시계열 학습/검증 분할에서
+        미래 정보가 대체값으로 새지 않음
+        컬럼별 루프 대신 숫자형 컬럼 블록 전체에 대해 단계별 groupby 한 번씩 계산
+
+        Args:
+            df: 데이터프레임
+            columns: 대체할 숫자형 컬럼
+            merchant_col: 가맹점 ID 컬럼명 (필수)
+            zone_col: 상권 컬럼명 (없으면 해당 단계 생략)
+            date_col: 년월 컬럼명 (필수)
+            inplace: True면 df를 직접 수정
+
+        Returns:
+            결측값이 대체된 데이터프레임
+        """
+        for key in (merchant_col, date_col):
+            if key not in df.columns:
+                raise ValueError(f"Group median imputation requires column '{key}'")
+
+        df_imputed = df if inplace else df.copy()
+        columns = [col for col in columns if col in df.columns]
+        if not columns:
+            return df_imputed
+
+        # 그룹 중앙값은 단계마다 원본 관측값으로 계산 (앞 단계에서 대체된 값은 사용하지 않음)
+        observed = df_imputed[columns]
+        block = observed
+        before = int(block.isnull().sum().sum())
+
+        levels = [('merchant history', _merchant_history_medians, [merchant_col, date_col])]
+        if zone_col in df.columns:
+            levels.append(('zone x month', _group_medians, [zone_col, date_col]))
+
+        print(f"\nGroup median imputation: {len(columns)} columns, {before:,} nulls")
+        for name, medians, keys in levels:
+            if not block.isnull().values.any():
+                break
+            filled = block.fillna(medians(observed, *(df_imputed[key] for key in keys)))
+            remaining = int(filled.isnull().sum().sum())
+            print(f"  {name}: filled {before - remaining:,}")
+            block, before = filled, remaining
+
+        df_imputed[columns] = block
+        return df_imputed
+
+    def fit(
+        self,
+        df: pd.DataFrame,
+        strategy: str = 'auto',
+        column_types: Optional[Dict[str, List[str]]] = None
+    ) -> 'MissingValueHandler':
+        """
+        학습 데이터에서 컬럼별 대체값(중앙값/최빈값 등) 계산
+
+        impute_missing_values와 같은 규칙이지만, 학습 데이터에 결측이 없던 컬럼도
+        대체값을 저장하므로 서빙 시 어떤 컬럼에 결측이 생겨도 transform으로 대체 가능
+
+        Args:
+            df: 학습 데이터프레임 (SV는 NaN으로 변환된 상태)
+            strategy: 대체 전략 ('auto', 'median', 'mean', 'zero')
+            column_types: 컬럼 타입 분류 (None이면 자동 분류)
+
+        Returns:
+            self
+        """
+        if strategy == 'group':
+            raise ValueError("'group' strategy depends on each row's merchant/zone; use impute_missing_values")
+
+        if column_types is None:
+            column_types = self.identify_column_types(df)
+
+        self.column_types = column_types
+        self.strategy = strategy
+        self.imputation_stats = {
+            col: {'method': stats['method'], 'value': stats['value']}
+            for col, stats in self._fit_stats(df, column_types, strategy).items()
+        }
+
+        print(f"\nFitted imputation values for {len(self.imputation_stats)} columns (strategy: {strategy})")
+        return self
+
+    def transform(self, df: pd.DataFrame, inplace: bool = False) -> pd.DataFrame:
+        """
+        fit/load 로 저장된 대체값으로 결측값 대체
+
+        대체값을 다시 계산하지 않으므로 가맹점 1개 / 월 1개 단위 입력도
+        배치 구성과 무관하게 학습 시와 같은 값으로 대체됨
+        (결측이 있지만 fit 된 대체값이 없는 컬럼은 대체하지 않고 경고 출력
+        - 다른 모델의 대체값 파일을 로드한 경우 등)
+
+        Args:
+            df: 데이터프레임
+            inplace: True면 df를 직접 수정
+
+        Returns:
+            결측값이 대체된 데이터프레임
+        """
+        if not self.imputation_stats:
+            raise ValueError("No imputation values. Call fit() or load() first.")
+
+        fill_values = {
+            col: stats['value'] for col, stats in self.imputation_stats.items()
+            if col in df.columns
+        }
+        unfitted = [col for col in df.columns if col not in fill_values and df[col].isnull().any()]
+        if unfitted:
+            print(f"Warning: {len(unfitted)} columns have missing values but no fitted imputation value "
+                  f"(left as NaN): {unfitted[:5]}{'...' if len(unfitted) > 5 else ''}")
+
+        if inplace:
+            df.fillna(fill_values, inplace=True)
+            return df
+        return df.fillna(fill_values)
+
+    def fit_transform(
+        self,
+        df: pd.DataFrame,
+        strategy: str = 'auto',
+        column_types: Optional[Dict[str, List[str]]] = None
+    ) -> pd.DataFrame:
+        """
+        fit 후 같은 데이터에 transform 적용
+
+        Args:
+            df: 학습 데이터프레임
+            strategy: 대체 전략 ('auto', 'median', 'mean', 'zero')
+            column_types: 컬럼 타입 분류 (None이면 자동 분류)
+
+        Returns:
+            결측값이 대체된 데이터프레임
+        """
+        return self.fit(df, strategy, column_types).transform(df)
+
+    def save(self, filepath: str):
+        """
+        대체값 / 컬럼 타입 분류를 JSON으로 저장 (모델 파일과 같은 디렉토리에 저장)
+
+        Args:
+            filepath: 저장 경로 (예: models/xgboost_best_imputation.json)
+        """
+        if not self.imputation_stats:
+            raise ValueError("No imputation values. Call fit() first.")
+
+        state = {
+            'sv_value': self.sv_value,
+            'strategy': self.strategy,
+            'column_types': self.column_types,
+            'imputation_stats': {
+                col: {'method': stats['method'], 'value': _to_json_value(stats['value'])}
+                for col, stats in self.imputation_stats.items()
+            },
+        }
+        with open(filepath, 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False, indent=2)
+
+        print(f"Saved imputation values: {filepath}")
+
+    def load(self, filepath: str) -> 'MissingValueHandler':
+        """
+        save로 저장한 대체값 로드
+
+        Args:
+            filepath: 저장 경로
+
+        Returns:
+            self
+        """
+        with open(filepath, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+
+        self.sv_value = state['sv_value']
+        self.strategy = state['strategy']
+        self.column_types = state['column_types']
+        self.imputation_stats = state['imputation_stats']
+
+        print(f"Loaded imputation values for {len(self.imputation_stats)} columns: {filepath}")
+        return self
+
+    def _fit_stats(
+        self,
+        df: pd.DataFrame,
+        column_types: Dict[str, List[str]],
+        strategy: str = 'auto'
+    ) -> Dict[str, Dict]:
+        """
+        컬럼 타입별 대체값 계산 (impute_missing_values, fit 공통)
+
+        - 배달 관련: 0 ('auto', 'group') / 숫자형 통계값
+        - 매출/고객/비율 관련: 숫자형만 중앙값 (구간 변수 제외)
+        - 범주형: 최빈값 또는 'Unknown'
+        - 기타: 숫자형은 중앙값, 문자형은 'Unknown'
+        - 'auto', 'group' 외 전략: 날짜/ID 포함 모든 숫자형 컬럼에 같은 통계값
+        - 구간 코드(Int8): 전략과 무관하게 대체하지 않음 (결측은 <NA>로 유지)
+
+        Returns:
+            {컬럼: {'type', 'method', 'value'}} 딕셔너리 (df에 있는 컬럼만)
+        """
+        if strategy not in ('auto', 'group', 'median', 'mean', 'zero'):
+            raise ValueError(f"Unknown strategy: {strategy}")
+
+        # 'group'의 그룹 대체 이후 남은 결측은 'auto'와 같은 규칙으로 대체
+        auto = strategy in ('auto', 'group')
+        numeric_method = 'median' if auto else strategy
+        col_types = ['delivery', 'sales', 'customer', 'ratio', 'category', 'other']
+        if not auto:
+            # 숫자형 날짜/ID 컬럼까지 포함 (X.fillna(X.median())와 같은 결과)
+            col_types += ['date', 'id']
+        fill_stats = {}
+
+        for col_type in col_types:
+            for col in column_types.get(col_type, []):
+                if col not in df.columns:
+                    continue
+                series = df[col]
+                if series.dtype == INTERVAL_CODE_DTYPE:
+                    continue
+                is_numeric = series.dtype in NUMERIC_DTYPES
+
+                if col_type == 'delivery' and (auto or not is_numeric):
+                    method, value = 'zero', 0
+                elif is_numeric and col_type != 'category':
+                    method = numeric_method
+                    if method == 'zero':
+                        value = 0
+                    elif method == 'mean':
+                        value = series.mean()
+                    else:
+                        value = series.median()
+                elif col_type == 'category':
+                    mode = series.mode()
+                    if len(mode) > 0:
+                        method, value = 'mode', mode[0]
+                    else:
+                        method, value = 'constant', 'Unknown'
+                elif col_type == 'other':
+                    method, value = 'constant', 'Unknown'
+                else:
+                    # 매출/고객/비율 관련 문자형 (구간 변수), 문자형 날짜/ID: 대체하지 않음
+                    continue
+
+                fill_stats[col] = {'type': col_type, 'method': method, 'value': value}
+
+        return fill_stats
+
     def create_missing_flags(
         self,
         df: pd.DataFrame,
@@ -308,6 +531,30 @@ class MissingValueHandler:
         print(f"Created {len(flag_columns)} flag columns")
         return df_flagged, flag_columns
 
+    def create_missing_mask(
+        self,
+        df: pd.DataFrame,
+        columns: Optional[List[str]] = None,
+        prefix: str = 'is_missing_'
+    ) -> MissingMask:
+        """
+        결측값 플래그를 bit-packed 마스크로 생성
+
+        create_missing_flags와 같은 플래그를 셀당 1 bit로 저장하고 데이터프레임은 복사하지 않음
+        (mask.append_to(df)로 uint8 플래그 컬럼 추가, mask.to_sparse()로 sparse 행렬 변환)
+
+        Args:
+            df: 데이터프레임
+            columns: 플래그를 생성할 컬럼 리스트 (None이면 모든 결측값 있는 컬럼)
+            prefix: 플래그 컬럼명 접두사
+
+        Returns:
+            MissingMask 인스턴스
+        """
+        mask = MissingMask.from_frame(df, columns, prefix)
+        print(f"\nCreated missing mask for {len(mask.columns)} columns ({mask.nbytes / 1024**2:.2f} MB)")
+        return mask
+
     def get_imputation_report(self) -> pd.DataFrame:
         """
         대체 통계 리포트 생성
@@ -348,11 +595,8 @@ def process_missing_values(
     """
     handler = MissingValueHandler(sv_value)
 
-    # SV 감지
-    sv_stats = handler.detect_sv(df)
-
-    # SV를 NaN으로 변환
-    df_clean = handler.replace_sv_with_nan(df)
+    # SV 감지 + NaN 변환
+    df_clean, sv_stats = handler.clean_sv(df)
 
     # 결측값 플래그 생성 (옵션)
     if create_flags:
@@ -373,6 +617,83 @@ def process_missing_values(
     return df_imputed
 
 
+def _merchant_history_medians(observed: pd.DataFrame, merchants: pd.Series, dates: pd.Series) -> pd.DataFrame:
+    """
+    행마다 같은 가맹점의 이전 월까지 관측값 중앙값 (해당 월 이후 값은 사용하지 않음)
+
+    가맹점 → 년월 순으로 정렬해 가맹점별 expanding 중앙값을 구한 뒤 1행 shift
+    (첫 월 또는 가맹점 ID가 없는 행은 NaN)
+
+    Returns:
+        observed와 같은 index / 컬럼의 데이터프레임
+    """
+    codes = pd.factorize(merchants)[0]
+    order = np.lexsort((dates.to_numpy(), codes))
+    sorted_codes = codes[order]
+
+    sorted_block = observed.iloc[order].reset_index(drop=True)
+    history = sorted_block.groupby(sorted_codes, sort=False).expanding().median()
+    history = history.droplevel(0).sort_index()
+    history = history.groupby(sorted_codes, sort=False).shift(1)
+    history[sorted_codes == -1] = np.nan
+
+    # 정렬 전 행 순서로 복원
+    inverse = np.empty_like(order)
+    inverse[order] = np.arange(len(order))
+    return history.iloc[inverse].set_axis(observed.index)
+
+
+def _group_medians(observed: pd.DataFrame, *keys: pd.Series) -> pd.DataFrame:
+    """같은 그룹(예: 상권 x 월) 관측값 중앙값 (observed와 같은 index)"""
+    return observed.groupby(list(keys), observed=True).transform('median')
+
+
+def _sv_mask(df: pd.DataFrame, threshold: float) -> Tuple[List[str], np.ndarray]:
+    """
+    숫자형 컬럼의 SV 위치를 (행 x 컬럼) bool 배열 하나로 계산
+
+    컬럼 값은 복사하지 않고 원본 배열에서 바로 mask 열에 비교 결과를 기록
+
+    Returns:
+        (숫자형 컬럼 리스트, SV mask)
+    """
+    columns = [col for col in df.columns if df[col].dtype in NUMERIC_DTYPES]
+    sv_mask = np.empty((len(df), len(columns)), dtype=bool)
+    for j, col in enumerate(columns):
+        np.less_equal(df[col].to_numpy(), threshold, out=sv_mask[:, j])
+    return columns, sv_mask
+
+
+def _sv_stats(columns: List[str], sv_counts: np.ndarray, total_rows: int) -> pd.DataFrame:
+    """컬럼별 SV 개수 → SV 통계 데이터프레임 (SV가 있는 컬럼만, 개수 내림차순)"""
+    sv_df = pd.DataFrame({
+        'column': columns,
+        'sv_count': sv_counts,
+        'sv_ratio': sv_counts / total_rows * 100 if total_rows > 0 else 0.0,
+        'total_rows': total_rows
+    })
+    sv_df = sv_df[sv_df['sv_count'] > 0]
+    return sv_df.sort_values('sv_count', ascending=False, kind='stable').reset_index(drop=True)
+
+
+def _print_sv_stats(sv_df: pd.DataFrame):
+    """SV 통계 출력"""
+    if len(sv_df) > 0:
+        print(f"\nFound SV in {len(sv_df)} columns")
+        print(f"Total SV values: {sv_df['sv_count'].sum():,}")
+        print("\nTop 10 columns with SV:")
+        print(sv_df.head(10).to_string(index=False))
+    else:
+        print("No SV values found")
+
+
+def _to_json_value(value):
+    """numpy 스칼라 → JSON 저장 가능한 파이썬 값"""
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
 if __name__ == "__main__":
     # 테스트 실행
     print("Testing MissingValueHandler...")
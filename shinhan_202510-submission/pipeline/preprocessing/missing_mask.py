@@ -0,0 +1,193 @@
+"""
+Missing Mask Module
+
+결측 여부 플래그의 압축 저장
+- 컬럼별 결측 여부를 행 방향 bit-packing (셀당 1 bit, int64 플래그 대비 1/64)
+- 플래그 컬럼은 필요할 때만 uint8로 생성 (lazy)
+- XGBoost / LightGBM 입력용 scipy sparse 행렬 변환
+"""
+
+import numpy as np
+import pandas as pd
+from typing import List, Optional
+
+
+class MissingMask:
+    """bit-packed 결측 플래그 저장 클래스"""
+
+    def __init__(
+        self,
+        packed: np.ndarray,
+        columns: List[str],
+        n_rows: int,
+        index: Optional[pd.Index] = None,
+        prefix: str = 'is_missing_'
+    ):
+        """
+        Args:
+            packed: (ceil(n_rows / 8), n_columns) uint8 배열 (np.packbits, axis=0)
+            columns: 원본 컬럼명
+            n_rows: 행 수
+            index: 원본 데이터프레임 index (플래그 컬럼 생성 시 사용)
+            prefix: 플래그 컬럼명 접두사
+        """
+        self.packed = packed
+        self.columns = list(columns)
+        self.n_rows = n_rows
+        self.index = index if index is not None else pd.RangeIndex(n_rows)
+        self.prefix = prefix
+        self._column_index = {col: j for j, col in enumerate(self.columns)}
+
+    @classmethod
+    def from_frame(
+        cls,
+        df: pd.DataFrame,
+        columns: Optional[List[str]] = None,
+        prefix: str = 'is_missing_',
+        block_rows: int = 65536
+    ) -> 'MissingMask':
+        """
+        데이터프레임의 결측 여부를 행 블록 단위로 bit-packing
+
+        블록마다 bool 배열 (block_rows x 컬럼 수)만 만들고 바로 압축하므로
+        전체 크기의 bool / int 플래그 배열을 만들지 않음
+        (columns=None이면 결측 컬럼 판별도 같은 블록 루프에서 수행)
+
+        Args:
+            df: 데이터프레임
+            columns: 대상 컬럼 (None이면 결측값이 있는 모든 컬럼)
+            prefix: 플래그 컬럼명 접두사
+            block_rows: 한번에 처리할 행 수 (8의 배수로 올림)
+
+        Returns:
+            MissingMask 인스턴스
+        """
+        detect = columns is None
+        if detect:
+            columns = df.columns.tolist()
+        columns = [col for col in columns if col in df.columns]
+
+        block_rows = max(8, (block_rows + 7) // 8 * 8)
+        n_rows = len(df)
+        positions = df.columns.get_indexer(columns)
+        packed = np.empty(((n_rows + 7) // 8, len(columns)), dtype=np.uint8)
+        has_missing = np.zeros(len(columns), dtype=bool)
+
+        for start in range(0, n_rows, block_rows):
+            block = df.iloc[start:start + block_rows, positions].isnull().to_numpy()
+            packed[start // 8:(start + len(block) + 7) // 8] = np.packbits(block, axis=0)
+            if detect:
+                has_missing |= block.any(axis=0)
+
+        # 결측값이 없는 컬럼은 압축 결과에서 제외
+        if detect and not has_missing.all():
+            packed = np.ascontiguousarray(packed[:, has_missing])
+            columns = [col for col, keep in zip(columns, has_missing) if keep]
+
+        return cls(packed, columns, n_rows, df.index, prefix)
+
+    @property
+    def flag_names(self) -> List[str]:
+        """플래그 컬럼명 리스트"""
+        return [f"{self.prefix}{col}" for col in self.columns]
+
+    @property
+    def nbytes(self) -> int:
+        """압축 저장 크기 (bytes)"""
+        return self.packed.nbytes
+
+    def flag(self, column: str) -> np.ndarray:
+        """
+        컬럼 1개의 결측 여부를 bool 배열로 복원
+
+        Args:
+            column: 원본 컬럼명 또는 플래그 컬럼명
+
+        Returns:
+            (n_rows,) bool 배열
+        """
+        if column not in self._column_index and column.startswith(self.prefix):
+            column = column[len(self.prefix):]
+        j = self._column_index[column]
+        return np.unpackbits(self.packed[:, j], count=self.n_rows).astype(bool)
+
+    def __getitem__(self, column: str) -> pd.Series:
+        return pd.Series(
+            self.flag(column).view(np.uint8),
+            index=self.index,
+            name=column if column.startswith(self.prefix) else f"{self.prefix}{column}"
+        )
+
+    def __len__(self) -> int:
+        return self.n_rows
+
+    def to_frame(self, columns: Optional[List[str]] = None, dtype: str = 'uint8') -> pd.DataFrame:
+        """
+        플래그 컬럼 생성
+
+        Args:
+            columns: 원본 컬럼명 (None이면 전체)
+            dtype: 플래그 dtype ('uint8', 'bool', 'int64' 등)
+
+        Returns:
+            플래그 데이터프레임 (원본 index)
+        """
+        columns = self.columns if columns is None else columns
+        col_index = [self._column_index[col] for col in columns]
+        flags = np.unpackbits(self.packed[:, col_index], axis=0, count=self.n_rows)
+        return pd.DataFrame(
+            flags.astype(dtype, copy=False),
+            index=self.index,
+            columns=[f"{self.prefix}{col}" for col in columns]
+        )
+
+    def append_to(
+        self,
+        df: pd.DataFrame,
+        columns: Optional[List[str]] = None,
+        dtype: str = 'uint8'
+    ) -> pd.DataFrame:
+        """
+        데이터프레임에 플래그 컬럼 추가 (원본 컬럼은 복사하지 않음)
+
+        Args:
+            df: 대상 데이터프레임 (마스크를 만든 데이터프레임과 같은 행 순서)
+            columns: 원본 컬럼명 (None이면 전체)
+            dtype: 플래그 dtype
+
+        Returns:
+            플래그가 추가된 데이터프레임
+        """
+        if len(df) != self.n_rows:
+            raise ValueError(f"Row count mismatch: {len(df)} != {self.n_rows}")
+
+        df_flagged = df.copy(deep=False)
+        flags = self.to_frame(columns, dtype)
+        for col in flags.columns:
+            df_flagged[col] = flags[col].to_numpy()
+        return df_flagged
+
+    def to_sparse(self, columns: Optional[List[str]] = None, dtype: str = 'float32'):
+        """
+        플래그를 scipy CSR 행렬로 변환 (결측 셀만 저장)
+
+        XGBoost / LightGBM 래퍼의 train / predict에 그대로 전달하거나
+        scipy.sparse.hstack으로 다른 sparse 피처와 결합해 사용
+
+        Args:
+            columns: 원본 컬럼명 (None이면 전체)
+            dtype: 값 dtype
+
+        Returns:
+            (n_rows, n_flags) scipy.sparse.csr_matrix
+        """
+        from scipy import sparse
+
+        columns = self.columns if columns is None else columns
+        row_indices = [np.flatnonzero(self.flag(col)) for col in columns]
+        indptr = np.zeros(len(columns) + 1, dtype=np.int64)
+        indptr[1:] = np.cumsum([len(rows) for rows in row_indices])
+        indices = np.concatenate(row_indices) if row_indices else np.empty(0, dtype=np.int64)
+        data = np.ones(len(indices), dtype=dtype)
+
+        return sparse.csc_matrix((data, indices, indptr), shape=(self.n_rows, len(columns))).tocsr()
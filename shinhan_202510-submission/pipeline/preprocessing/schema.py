@@ -0,0 +1,179 @@
+"""
+Schema Module
+
+병합 데이터(가맹점 x 월)의 컬럼 타입 선언
+- 가맹점 ID, 주소/상권/업종명: category
+- 년월 키: int32
+- 6단계 구간 변수: Int8 코드 (1~6, 결측은 <NA>)
+- 비율/측정값: float32
+
+pandas 기본 추론(object / int64 / float64) 대비 메모리를 크게 줄이기 위한 선택적 스키마
+"""
+
+import pandas as pd
+from typing import Dict
+
+from .feature_encoder import INTERVAL_CODE_DTYPE, INTERVAL_MAPPING
+
+
+# 가맹점 ID (병합 키)
+MERCHANT_ID_COLUMNS = ['ENCODED_MCT']
+
+# 년월 키 (YYYYMM)
+MONTH_KEY_COLUMNS = ['TA_YM']
+
+# 반복되는 문자열 (주소, 브랜드, 시군구, 업종, 상권)
+CATEGORY_COLUMNS = [
+    'MCT_BSE_AR',
+    'MCT_BRD_NUM',
+    'MCT_SIGUNGU_NM',
+    'HPSN_MCT_ZCD_NM',
+    'HPSN_MCT_BZN_CD_NM',
+]
+
+# 6단계 구간 변수 ('1_10%이하' 등 → 1~6)
+INTERVAL_COLUMNS = [
+    'MCT_OPE_MS_CN',
+    'RC_M1_SAA',
+    'RC_M1_TO_UE_CT',
+    'RC_M1_UE_CUS_CN',
+    'RC_M1_AV_NP_AT',
+    'APV_CE_RAT',
+]
+
+# 날짜 컬럼 (YYYYMMDD)
+# MCT_ME_D는 결측이 있어 float 이지만 YYYYMMDD는 float32 정밀도(2^24)를 넘으므로 float64 유지
+DATE_COLUMNS = {
+    'ARE_D': 'int32',
+    'MCT_ME_D': 'float64',
+}
+
+# 그 외 float64 측정값은 모두 float32로 변환
+MEASURE_DTYPE = 'float32'
+
+# 구간 코드 → 원본 문자열 (메모리 비교용 역변환, APV_CE_RAT만 한글 구간 형식)
+_PERCENT_LABELS = {v: k for k, v in INTERVAL_MAPPING.items() if '%' in k}
+_RANK_LABELS = {v: k for k, v in INTERVAL_MAPPING.items() if '구간' in k}
+INTERVAL_LABELS = {col: _PERCENT_LABELS for col in INTERVAL_COLUMNS}
+INTERVAL_LABELS['APV_CE_RAT'] = _RANK_LABELS
+
+
+def typed_column(series: pd.Series) -> pd.Series:
+    """
+    단일 컬럼을 선언된 타입으로 변환
+
+    구간 변수는 결측 유무와 관계없이 항상 INTERVAL_CODE_DTYPE(Int8) 코드로 변환
+    (FeatureEncoder와 같은 dtype, 배치/파티션마다 dtype이 달라지지 않음)
+
+    Args:
+        series: 원본 컬럼 (컬럼명으로 타입 결정)
+
+    Returns:
+        변환된 컬럼 (선언되지 않은 컬럼은 그대로 반환)
+    """
+    name = series.name
+
+    if name in MERCHANT_ID_COLUMNS or name in CATEGORY_COLUMNS:
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            return series
+        return series.astype('category')
+
+    if name in MONTH_KEY_COLUMNS:
+        return series.astype('int32')
+
+    if name in DATE_COLUMNS:
+        if series.isna().any():
+            return series.astype('float64')
+        return series.astype(DATE_COLUMNS[name])
+
+    if name in INTERVAL_COLUMNS:
+        if series.dtype == 'object':
+            codes = series.map(INTERVAL_MAPPING)
+            unmapped = codes.isna() & series.notna()
+            if unmapped.any():
+                print(f"Warning: {unmapped.sum()} unmapped values in '{name}'")
+        else:
+            codes = series
+        return codes.astype(INTERVAL_CODE_DTYPE)
+
+    if series.dtype == 'float64':
+        return series.astype(MEASURE_DTYPE)
+
+    return series
+
+
+def untyped_column(series: pd.Series) -> pd.Series:
+    """
+    선언된 타입의 컬럼을 pandas 기본 추론 타입으로 되돌림 (typed_column의 역변환)
+
+    Args:
+        series: typed 컬럼
+
+    Returns:
+        object / int64 / float64 컬럼
+    """
+    name = series.name
+
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.astype('object')
+
+    if name in INTERVAL_COLUMNS and series.dtype != 'object':
+        return series.map(INTERVAL_LABELS[name])
+
+    if series.dtype in ['int8', 'int16', 'int32']:
+        return series.astype('int64')
+
+    if series.dtype == 'float32':
+        return series.astype('float64')
+
+    return series
+
+
+def apply_typed_schema(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    데이터프레임 전체에 선언된 스키마 적용
+
+    컬럼 단위로 변환하여 변환 중 최대 메모리가 원본 + 1개 컬럼을 넘지 않도록 함
+
+    Args:
+        df: 데이터프레임 (로드 직후 또는 병합 결과)
+
+    Returns:
+        타입이 최적화된 데이터프레임
+    """
+    df_typed = df.copy(deep=False)
+    for col in df_typed.columns:
+        df_typed[col] = typed_column(df_typed[col])
+    return df_typed
+
+
+def memory_footprint(df: pd.DataFrame) -> Dict[str, float]:
+    """
+    스키마 적용 전/후 메모리 사용량 비교
+
+    df가 typed/untyped 어느 쪽이든 한 컬럼씩 상대 타입으로 변환해 측정하므로
+    전체 프레임을 복제하지 않음
+
+    Args:
+        df: 데이터프레임
+
+    Returns:
+        {'untyped_mb', 'typed_mb', 'reduction_pct'} 딕셔너리
+    """
+    untyped_bytes = 0
+    typed_bytes = 0
+
+    for col in df.columns:
+        series = df[col]
+        untyped_bytes += untyped_column(series).memory_usage(index=False, deep=True)
+        typed_bytes += typed_column(series).memory_usage(index=False, deep=True)
+
+    untyped_mb = untyped_bytes / 1024**2
+    typed_mb = typed_bytes / 1024**2
+    reduction_pct = (1 - typed_mb / untyped_mb) * 100 if untyped_mb > 0 else 0.0
+
+    return {
+        'untyped_mb': untyped_mb,
+        'typed_mb': typed_mb,
+        'reduction_pct': reduction_pct,
+    }
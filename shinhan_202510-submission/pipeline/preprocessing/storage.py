@@ -0,0 +1,115 @@
+"""
+Storage Module
+
+전처리 단계에서 사용하는 컬럼 저장 포맷 유틸리티
+- Parquet 저장/로드 (pyarrow는 pyproject.toml 의존성; 설치되지 않은 환경에서만 pickle로 대체)
+- 파일 내용 기반 fingerprint 계산
+"""
+
+import hashlib
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+try:
+    import pyarrow  # noqa: F401
+    COLUMNAR_AVAILABLE = True
+except ImportError:
+    COLUMNAR_AVAILABLE = False
+
+# 저장 파일 확장자 (기본 Parquet, pyarrow가 없는 환경에서만 pickle)
+FRAME_SUFFIX = '.parquet' if COLUMNAR_AVAILABLE else '.pkl'
+
+
+def file_fingerprint(path: Path, chunk_size: int = 1 << 20) -> str:
+    """
+    파일 내용 기반 fingerprint 계산
+
+    수정 시각이 아닌 내용을 해시하므로, 같은 파일을 다시 복사해도
+    캐시가 유지되고 내용이 바뀌면 자동으로 무효화됨
+
+    Args:
+        path: 파일 경로
+        chunk_size: 한번에 읽을 바이트 수
+
+    Returns:
+        16자리 hex 문자열
+    """
+    digest = hashlib.blake2b(digest_size=8)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def write_frame(df: pd.DataFrame, path: Path) -> Path:
+    """
+    데이터프레임을 컬럼 포맷으로 저장
+
+    Args:
+        df: 저장할 데이터프레임
+        path: 저장 경로 (확장자로 포맷 결정)
+
+    Returns:
+        저장된 파일 경로
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    # 임시 파일에 쓴 뒤 교체 (중간에 실패해도 깨진 캐시가 남지 않도록)
+    tmp_path = path.with_name(path.name + '.tmp')
+    if path.suffix == '.parquet':
+        df.to_parquet(tmp_path, index=False)
+    else:
+        df.to_pickle(tmp_path)
+    tmp_path.replace(path)
+    return path
+
+
+# pickle fallback 에서 사용하는 필터 연산자
+_FILTER_OPS = {
+    '==': lambda s, v: s == v,
+    '>': lambda s, v: s > v,
+    '>=': lambda s, v: s >= v,
+    '<': lambda s, v: s < v,
+    '<=': lambda s, v: s <= v,
+}
+
+
+def read_frame(
+    path: Path,
+    columns: Optional[List[str]] = None,
+    filters: Optional[List[Tuple]] = None
+) -> pd.DataFrame:
+    """
+    컬럼 포맷 파일 로드
+
+    Args:
+        path: 파일 경로
+        columns: 읽을 컬럼 (None이면 전체)
+        filters: 행 필터 (예: [('TA_YM', '>=', 202401)])
+            Parquet은 읽는 시점에 row group 단위로 건너뛰고,
+            pickle은 전체 로드 후 필터링
+
+    Returns:
+        데이터프레임
+    """
+    path = Path(path)
+    if path.suffix == '.parquet':
+        df = pd.read_parquet(path, columns=columns, filters=filters)
+        # Parquet은 문자열 컬럼의 결측을 None으로 복원하므로 CSV 로드와 같은 NaN으로 통일
+        object_cols = df.columns[df.dtypes == 'object']
+        if len(object_cols) > 0:
+            df[object_cols] = df[object_cols].fillna(np.nan)
+        return df
+
+    df = pd.read_pickle(path)
+    if filters:
+        mask = pd.Series(True, index=df.index)
+        for col, op, value in filters:
+            mask &= _FILTER_OPS[op](df[col], value)
+        df = df[mask].reset_index(drop=True)
+    if columns is not None:
+        df = df[columns]
+    return df